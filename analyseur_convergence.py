@@ -1,4 +1,4 @@
-from sympy import symbols, diff, solve, lambdify, parse_expr, sin, cos, oo, tan, log, sqrt, exp, Integral, limit, pi, E, I
+from sympy import symbols, diff, solve, parse_expr, sin, cos, oo, tan, log, sqrt, exp, Integral, pi, E, I
 import numpy as np
 import datetime
 from sympy.parsing.sympy_parser import (
@@ -7,7 +7,22 @@ from sympy.parsing.sympy_parser import (
     convert_xor,
     function_exponentiation,
 )
-
+from expression_analysee import ExpressionAnalysee
+from recherche_racines import AnalyseCaracteristiques, logarithmes_naturels
+from quadrature import integrer, integrer_multiple
+from budget_calcul import BudgetCalcul, IGNORE, NUMERIQUE, SYMBOLIQUE, palier_global
+from calcul_symbolique import developpement, limite, terme_dominant
+from decroissance import MARGE_ORDRE, estimer_decroissance
+from echantillonnage import RESOLUTION_GRILLE, echantillonner_1d, evaluer, evaluer_grille, statistiques_grille
+from evaluateurs import compiler
+from metriques import APPELS_SYMBOLIQUES, ETAPES, mesurer
+
+# Appels symboliques coûteux : chaque appel est mesuré (limit et series sont
+# en plus mémoïsés, voir calcul_symbolique.py)
+solve = mesurer(APPELS_SYMBOLIQUES, appel='solve')(solve)
+
+
+@mesurer(ETAPES, etape='parse_latex')
 def parse_latex_fallback(latex_expr):
     """Fonction de repli pour parser les expressions LaTeX."""
     try:
@@ -32,27 +47,53 @@ def parse_latex_fallback(latex_expr):
         transformations = standard_transformations + (implicit_multiplication, convert_xor, function_exponentiation)
         return parse_expr(latex_expr, transformations=transformations)
 
+# Intervalle de recherche des points d'intérêt quand aucun domaine n'est encore fixé
+INTERVALLE_RECHERCHE = (-100, 100)
+
+# Points d'échantillonnage du repli numérique de la détection des singularités
+POINTS_SINGULARITES = 2001
+
+
 class FonctionAnalyzer:
-    def __init__(self):
-        pass
+    def __init__(self, raffinement_symbolique=False, budget=None):
+        """
+        Args:
+            raffinement_symbolique: Résoudre exactement (solve) les racines, extrema et
+                                    pôles des fractions rationnelles au lieu de la
+                                    recherche numérique
+            budget: Temps alloué à chaque analyse (secondes, None : illimité). Les étapes
+                    symboliques ne sont lancées que s'il en reste (voir budget_calcul.py)
+        """
+        self.raffinement_symbolique = raffinement_symbolique
+        self.budget = budget
+
+    def _budget(self, budget):
+        """Budget d'une analyse : celui passé par l'appelant, sinon celui de l'analyseur."""
+        return BudgetCalcul.depuis(self.budget if budget is None else budget)
+
+    def _caracteristiques_1d(self, expr, x):
+        """Caractéristiques (calculées à la demande) de expr, fonction de x."""
+        return AnalyseCaracteristiques(expr, x, symbolique=self.raffinement_symbolique)
 
     def _detecter_variables(self, fonction_latex):
         """Détecte les variables dans une fonction LaTeX."""
         try:
-            x, y, z, t = symbols('x y z t')
             expr = parse_latex_fallback(fonction_latex)
-            variables_brutes = expr.free_symbols
-            variables_valides = {'x', 'y', 'z', 't'}
-            variables = [str(var) for var in variables_brutes if str(var) in variables_valides]
-            
-            if not variables:
-                return ['x']
-            
-            return sorted(variables)
+            return self._variables_de(expr)
         except Exception as e:
             print(f"Erreur lors de la détection des variables: {e}")
             return ['x']
 
+    def _variables_de(self, expr):
+        """Variables (parmi x, y, z, t) d'une expression déjà parsée."""
+        variables_valides = {'x', 'y', 'z', 't'}
+        variables = [str(var) for var in expr.free_symbols if str(var) in variables_valides]
+
+        if not variables:
+            return ['x']
+
+        return sorted(variables)
+
     def _extract_integrals(self, expr):
         """Extrait récursivement toutes les intégrales d'une expression."""
         integrals = []
@@ -213,56 +254,62 @@ class FonctionAnalyzer:
         except:
             return False
 
-    def _asymptotic_behavior(self, integrand, var, point):
+    def _asymptotic_behavior(self, integrand, var, point, direction='+'):
         """Analyse le comportement asymptotique de l'intégrande près d'un point."""
-        from sympy import series, Order
-
         try:
-            # Développement en série autour du point
-            if point == oo:
-                # Substitution x = 1/t pour analyser en +∞
-                t = symbols('t')
-                substituted = integrand.subs(var, 1/t)
-                behavior = series(substituted, t, 0, n=3)
-            elif point == -oo:
-                # Substitution x = -1/t pour analyser en -∞
-                t = symbols('t')
-                substituted = integrand.subs(var, -1/t)
-                behavior = series(substituted, t, 0, n=3)
-            else:
-                behavior = series(integrand, var, point, n=3)
-
-            # Extraire le terme dominant
-            behavior_str = str(behavior.removeO())
-
-            return {
-                'series': behavior_str,
-                'order': behavior
-            }
+            # Développement en série autour du point (x = ±1/t en ±∞), mémoïsé
+            behavior = developpement(integrand, var, point, n=3, direction=direction)
         except:
             return None
 
-    def _check_convergence(self, integrand, var, lower, upper):
-        """Vérifie la convergence d'une intégrale avec analyse complète."""
+        try:
+            leading_term = terme_dominant(integrand, var, point, direction)
+        except:
+            leading_term = None
+
+        return {
+            'series': str(behavior.removeO()),
+            'order': behavior,
+            'leading_term': leading_term
+        }
+
+    @mesurer(ETAPES, etape='verification_convergence')
+    def _check_convergence(self, integrand, var, lower, upper, budget=None):
+        """
+        Vérifie la convergence d'une intégrale avec analyse complète.
+
+        Les tests numériques (estimation de décroissance) passent d'abord ; les tests
+        symboliques ne sont faits que si le budget n'est pas épuisé, sinon les singularités
+        et les bornes finies sont vérifiées numériquement. Le palier de chaque étape est
+        noté dans convergence_info['tiers'] ('bounds' : palier de chaque borne).
+        """
+        budget = self._budget(budget)
         convergence_info = {
             'status': 'convergent',  # 'convergent', 'divergent', 'conditional', 'unknown'
             'type': 'proper',  # 'proper', 'improper_infinite', 'improper_singularity', 'improper_both'
             'issues': [],
             'warnings': [],
             'singularities': {},
-            'domain_info': {}
+            'domain_info': {},
+            'decroissance': {},  # borne -> estimation numérique (voir decroissance.py)
+            'tiers': {'status': SYMBOLIQUE, 'decroissance': NUMERIQUE, 'bounds': {}}
         }
+        tiers = convergence_info['tiers']
 
         try:
-            # 1. CALCUL DU DOMAINE DE DÉFINITION
-            domain_info = self._compute_domain(integrand, var)
-            convergence_info['domain_info'] = domain_info
-
-            # 2. DÉTECTION DES SINGULARITÉS
-            singularities = self._detect_singularities(integrand, var, lower, upper)
+            # 1. DÉTECTION DES SINGULARITÉS (repli numérique si le budget est épuisé)
+            singularities = budget.calculer(tiers, 'singularities', SYMBOLIQUE,
+                                            lambda: self._detect_singularities(integrand, var, lower, upper))
+            if singularities is None:
+                singularities = self._singularites_numeriques(integrand, var, lower, upper)
+                if singularities is not None:
+                    tiers['singularities'] = NUMERIQUE
+                else:
+                    singularities = {'poles': [], 'log_singularities': [], 'sqrt_singularities': [],
+                                     'discontinuities': [], 'all': []}
             convergence_info['singularities'] = singularities
 
-            # 3. CLASSIFICATION DE L'INTÉGRALE
+            # 2. CLASSIFICATION DE L'INTÉGRALE
             has_infinite_bounds = (lower == -oo or upper == oo)
             has_singularities = len(singularities['all']) > 0
 
@@ -275,10 +322,22 @@ class FonctionAnalyzer:
             else:
                 convergence_info['type'] = 'proper'
 
-            # 4. VÉRIFICATION DES BORNES INFINIES avec tests de convergence
+            # 3. VÉRIFICATION DES BORNES INFINIES avec tests de convergence
+            # Pré-test numérique (ordre de décroissance) ; les tests symboliques (limit)
+            # ne sont faits que si son verdict est ambigu
+            estimation_inf = estimation_sup = None
             if lower == -oo:
-                behavior = self._asymptotic_behavior(integrand, var, -oo)
-                lim = limit(integrand, var, -oo)
+                estimation_inf = self._estimer_decroissance(integrand, var, -oo)
+                convergence_info['decroissance']['-∞'] = estimation_inf
+                if estimation_inf and estimation_inf['statut']:
+                    tiers['bounds']['-∞'] = NUMERIQUE
+                if estimation_inf and estimation_inf['statut'] == 'divergent':
+                    convergence_info['status'] = 'divergent'
+                    convergence_info['issues'].append("Divergence en -∞: décroissance trop lente")
+
+            if (lower == -oo and not (estimation_inf and estimation_inf['statut'])
+                    and self._tests_symboliques(budget, convergence_info, '-∞')):
+                lim = limite(integrand, var, -oo)
 
                 if lim != 0:
                     # Test de comparaison pour 1/x^p
@@ -289,7 +348,7 @@ class FonctionAnalyzer:
                     try:
                         # Test si l'intégrande ~ 1/|x|^p avec p > 1
                         test_expr = integrand * var**2
-                        test_lim = limit(test_expr, var, -oo)
+                        test_lim = limite(test_expr, var, -oo)
                         if test_lim == 0:
                             convergence_info['warnings'].append(
                                 "Mais décroissance assez rapide détectée (type 1/x^p, p>1)"
@@ -303,12 +362,28 @@ class FonctionAnalyzer:
                         convergence_info['status'] = 'unknown'
 
             if upper == oo:
-                behavior = self._asymptotic_behavior(integrand, var, oo)
+                estimation_sup = self._estimer_decroissance(integrand, var, oo)
+                convergence_info['decroissance']['+∞'] = estimation_sup
+                if estimation_sup and estimation_sup['statut']:
+                    tiers['bounds']['+∞'] = NUMERIQUE
+                if estimation_sup and estimation_sup['statut'] == 'convergent':
+                    convergence_info['status'] = 'convergent'
+                elif estimation_sup and estimation_sup['statut'] == 'divergent':
+                    convergence_info['status'] = 'divergent'
+                    if estimation_sup['modele'] == 'croissance' or (estimation_sup['ordre'] or 0) > MARGE_ORDRE:
+                        convergence_info['issues'].append("Divergence en +∞: l'intégrande croît vers l'infini")
+                    elif abs(estimation_sup['ordre'] + 1) < MARGE_ORDRE:
+                        convergence_info['issues'].append("Divergence en +∞: 1/x (cas limite p=1)")
+                    else:
+                        convergence_info['issues'].append("Divergence en +∞: décroissance trop lente (p < 1)")
+
+            if (upper == oo and not (estimation_sup and estimation_sup['statut'])
+                    and self._tests_symboliques(budget, convergence_info, '+∞')):
                 try:
                     from sympy import E
                     # Remplacer e par E (la constante de SymPy)
                     integrand_simplified = integrand.subs(symbols('e'), E)
-                    lim = limit(integrand_simplified, var, oo)
+                    lim = limite(integrand_simplified, var, oo)
 
                     # Essayer d'évaluer numériquement si la limite est symbolique
                     if lim.has(oo) or lim.has(-oo):
@@ -336,7 +411,7 @@ class FonctionAnalyzer:
                             if integrand.has(exp):
                                 # Test si décroissance exponentielle
                                 test_expr = integrand * exp(var)
-                                test_lim = limit(test_expr, var, oo)
+                                test_lim = limite(test_expr, var, oo)
 
                                 # Si test_lim est fini et non infini, c'est une décroissance exponentielle
                                 try:
@@ -347,7 +422,7 @@ class FonctionAnalyzer:
                                     else:
                                         # Test algébrique
                                         test_expr2 = integrand * var**2
-                                        test_lim2 = limit(test_expr2, var, oo)
+                                        test_lim2 = limite(test_expr2, var, oo)
                                         if test_lim2 == 0:
                                             convergence_info['status'] = 'convergent'
                                         else:
@@ -358,7 +433,7 @@ class FonctionAnalyzer:
                                 except:
                                     # En cas d'erreur, tester de manière algébrique
                                     test_expr2 = integrand * var**2
-                                    test_lim2 = limit(test_expr2, var, oo)
+                                    test_lim2 = limite(test_expr2, var, oo)
                                     if test_lim2 == 0:
                                         convergence_info['status'] = 'convergent'
                             else:
@@ -397,7 +472,7 @@ class FonctionAnalyzer:
 
                                 # Stratégie: tester avec x * f(x) pour déterminer l'exposant p
                                 test_1x = integrand_for_test * var
-                                test_1x_lim = limit(test_1x, var, oo)
+                                test_1x_lim = limite(test_1x, var, oo)
 
                                 # Évaluer numériquement pour éviter les problèmes symboliques
                                 try:
@@ -421,7 +496,7 @@ class FonctionAnalyzer:
                                         # Si x^2 * f(x) → constante, alors p = 2 (convergent)
                                         # Si x^2 * f(x) → ∞, alors p < 2
                                         test_expr = integrand_for_test * var**2
-                                        test_lim = limit(test_expr, var, oo)
+                                        test_lim = limite(test_expr, var, oo)
                                         test_lim_val = test_lim.evalf() if hasattr(test_lim, 'evalf') else test_lim
 
                                         if test_lim == 0 or (hasattr(test_lim_val, 'is_finite') and test_lim_val.is_finite):
@@ -431,7 +506,7 @@ class FonctionAnalyzer:
                                             # Tester x^1.5 pour raffiner (entre p=1 et p=2)
                                             from sympy import Rational
                                             test_15 = integrand_for_test * var**Rational(3, 2)
-                                            lim_15 = limit(test_15, var, oo)
+                                            lim_15 = limite(test_15, var, oo)
                                             try:
                                                 lim_15_val = lim_15.evalf()
                                                 # Si x^1.5 * f → constante, alors p = 1.5 (convergent car > 1)
@@ -455,7 +530,7 @@ class FonctionAnalyzer:
                                 except:
                                     # En cas d'erreur, utiliser le test x^2
                                     test_expr = integrand_for_test * var**2
-                                    test_lim = limit(test_expr, var, oo)
+                                    test_lim = limite(test_expr, var, oo)
                                     if test_lim == 0:
                                         convergence_info['status'] = 'convergent'
                                     else:
@@ -469,15 +544,15 @@ class FonctionAnalyzer:
                                 f"Impossible de déterminer la convergence en +∞"
                             )
 
-            # 5. VÉRIFICATION DES SINGULARITÉS AUX BORNES avec tests de convergence
+            # 4. VÉRIFICATION DES SINGULARITÉS AUX BORNES avec tests de convergence
             # Ne vérifier que si les bornes sont des valeurs numériques (pas des constantes comme pi, e)
             # NOTE: Pour les bornes finies, utiliser integrand complet, pas integrand_for_test
-            if lower != -oo:
+            if lower != -oo and self._tests_symboliques(budget, convergence_info, str(lower)):
                 try:
                     # Évaluer numériquement la borne pour vérifier si c'est un nombre
                     lower_numeric = lower.evalf()
                     if lower_numeric.is_real and lower_numeric.is_finite:
-                        val_lower = limit(integrand, var, lower, '+')
+                        val_lower = limite(integrand, var, lower, '+')
                         if val_lower.has(oo) or val_lower.has(-oo) or not val_lower.is_finite:
                             convergence_info['issues'].append(
                                 f"Singularité à la borne inférieure {lower}"
@@ -485,8 +560,14 @@ class FonctionAnalyzer:
 
                             # Test de convergence pour singularité à la borne inférieure
                             # Règle: ∫ₐᵇ (x-a)^α dx converge ssi α > -1
+                            # Pré-test numérique : α estimé par régression log-log
+                            estimation = self._estimer_decroissance(integrand, var, lower, cote=1)
+                            convergence_info['decroissance'][str(lower)] = estimation
                             try:
-                                if lower.is_number:
+                                if estimation and estimation['statut']:
+                                    if estimation['statut'] == 'divergent':
+                                        convergence_info['status'] = 'divergent'
+                                elif lower.is_number:
                                     from sympy import Rational
 
                                     # CAS SPÉCIAL: logarithme
@@ -507,7 +588,7 @@ class FonctionAnalyzer:
                                                         # Il y a d'autres termes en x, potentiellement divergent
                                                         # Tester la convergence
                                                         test_conv_log = integrand * (var - lower)
-                                                        lim_conv_log = limit(test_conv_log, var, lower, '+')
+                                                        lim_conv_log = limite(test_conv_log, var, lower, '+')
                                                         if lim_conv_log != 0 and lim_conv_log.is_finite:
                                                             convergence_info['status'] = 'divergent'
                                                     # Sinon, log(x-a) seul converge
@@ -518,11 +599,11 @@ class FonctionAnalyzer:
 
                                     # Test 1: (x-a)^(1/2) * f(x)
                                     test_half = integrand * (var - lower)**Rational(1, 2)
-                                    lim_half = limit(test_half, var, lower, '+')
+                                    lim_half = limite(test_half, var, lower, '+')
 
                                     # Test 2: (x-a) * f(x)
                                     test_one = integrand * (var - lower)
-                                    lim_one = limit(test_one, var, lower, '+')
+                                    lim_one = limite(test_one, var, lower, '+')
 
                                     # Déterminer α et la convergence
                                     # Si (x-a) * f → constante ≠ 0, alors α = -1 (diverge)
@@ -550,17 +631,24 @@ class FonctionAnalyzer:
                                 pass
                 except Exception as e:
                     pass  # Ignorer les erreurs d'évaluation
+            elif lower != -oo:
+                self._verifier_borne_numeriquement(integrand, var, lower, 1, convergence_info)
 
-            if upper != oo and upper != -oo:
+            if upper != oo and upper != -oo and self._tests_symboliques(budget, convergence_info, str(upper)):
                 try:
                     # Évaluer numériquement la borne pour vérifier si c'est un nombre
                     upper_numeric = upper.evalf()
                     if upper_numeric.is_real and upper_numeric.is_finite:
-                        val_upper = limit(integrand, var, upper, '-')
+                        val_upper = limite(integrand, var, upper, '-')
                         if val_upper.has(oo) or val_upper.has(-oo) or not val_upper.is_finite:
                             convergence_info['issues'].append(
                                 f"Singularité à la borne supérieure {upper}"
                             )
+                            # Même règle qu'en borne inférieure : (b-x)^α intégrable ssi α > -1
+                            estimation = self._estimer_decroissance(integrand, var, upper, cote=-1)
+                            convergence_info['decroissance'][str(upper)] = estimation
+                            if estimation and estimation['statut'] == 'divergent':
+                                convergence_info['status'] = 'divergent'
                             behavior = self._asymptotic_behavior(integrand, var, upper)
                             if behavior:
                                 convergence_info['warnings'].append(
@@ -568,10 +656,12 @@ class FonctionAnalyzer:
                                 )
                 except Exception as e:
                     pass  # Ignorer les erreurs d'évaluation
+            elif upper != oo and upper != -oo:
+                self._verifier_borne_numeriquement(integrand, var, upper, -1, convergence_info)
 
-            # 6. ANALYSE DES SINGULARITÉS INTERNES
+            # 5. ANALYSE DES SINGULARITÉS INTERNES
             # IMPORTANT: Ne pas forcer divergent pour les singularités aux bornes
-            # car le test de convergence (section 5) a déjà déterminé le statut
+            # car le test de convergence (section 4) a déjà déterminé le statut
             for sing_type, sing_val in singularities['all']:
                 # Vérifier si à l'intérieur strict de l'intervalle (pas sur les bornes)
                 is_interior = False
@@ -612,7 +702,7 @@ class FonctionAnalyzer:
                         f"Singularité {sing_type} sur la borne: {var} = {sing_val:.6f}"
                     )
 
-            # 7. DÉCISION FINALE
+            # 6. DÉCISION FINALE
             # Ne marquer comme divergent que si on a des vraies singularités ou problèmes de convergence
             # Ignorer les fausses alertes sur les bornes symboliques
             real_issues = [issue for issue in convergence_info['issues']
@@ -635,6 +725,21 @@ class FonctionAnalyzer:
                 # Garder le statut convergent (le test de convergence a conclu que α > -1)
                 pass
 
+            # 7. PALIER DU STATUT : une borne ou des singularités non vérifiées (budget épuisé)
+            # laissent la convergence indéterminée, sauf divergence déjà établie
+            paliers = list(tiers['bounds'].values()) + [tiers['singularities']]
+            if convergence_info['status'] == 'divergent':
+                tiers['status'] = palier_global(palier for palier in paliers if palier != IGNORE)
+            else:
+                if IGNORE in paliers:
+                    convergence_info['status'] = 'unknown'
+                    convergence_info['warnings'].append("Budget de calcul épuisé : convergence non établie")
+                tiers['status'] = palier_global(paliers)
+
+            # 8. DOMAINE DE DÉFINITION (informatif, calculé en dernier)
+            convergence_info['domain_info'] = budget.calculer(
+                tiers, 'domain_info', SYMBOLIQUE, lambda: self._compute_domain(integrand, var), {})
+
         except Exception as e:
             convergence_info['issues'].append(f"Erreur lors de la vérification: {str(e)}")
             convergence_info['status'] = 'unknown'
@@ -701,28 +806,40 @@ class FonctionAnalyzer:
             print(f"Erreur lors de l'analyse de l'intégrale: {e}")
             return None
 
-    def analyser_fonction(self, fonction_latex):
-        """Analyse une fonction mathématique ou une intégrale."""
+    def analyser_fonction(self, fonction_latex, budget=None):
+        """
+        Analyse une fonction mathématique ou une intégrale (LaTeX ou ExpressionAnalysee).
+
+        Args:
+            fonction_latex: Expression LaTeX ou ExpressionAnalysee
+            budget: Temps alloué (secondes) ou BudgetCalcul, remplace celui de l'analyseur
+        """
+        budget = self._budget(budget)
         try:
-            expr = parse_latex_fallback(fonction_latex)
+            # Parser une seule fois (ou réutiliser l'expression déjà analysée)
+            if isinstance(fonction_latex, ExpressionAnalysee):
+                expression = fonction_latex
+            else:
+                expression = ExpressionAnalysee(fonction_latex, expr=parse_latex_fallback(fonction_latex))
+            expr = expression.expr
             
             # Vérifier si l'expression contient des intégrales
-            integrals = self._extract_integrals(expr)
+            integrals = expression.integrales
             
             if integrals:
                 return self._analyser_integrales(integrals, expr)
             
             # Sinon, analyser comme une fonction normale
-            variables = self._detecter_variables(fonction_latex)
+            variables = self._variables_de(expr)
             n = len(variables)
             
-            var_symbols = [symbols(var) for var in variables]
-            f_num = lambdify(var_symbols, expr, modules=['numpy', 'math'])
+            f_num = expression.evaluateur(variables)
             
             if n == 1:
-                return self._analyser_fonction_1d(f_num, expr, variables, None)
+                caracteristiques = expression.caracteristiques(variables[0], self.raffinement_symbolique)
+                return self._analyser_fonction_1d(f_num, expr, variables, None, caracteristiques, budget)
             elif n == 2:
-                return self._analyser_fonction_2d(f_num, expr, variables, None)
+                return self._analyser_fonction_2d(f_num, expr, variables, None, budget)
             elif n == 3:
                 return self._analyser_fonction_3d(f_num, expr, variables, None)
             else:
@@ -794,8 +911,15 @@ class FonctionAnalyzer:
 
         return validation
 
-    def _analyze_integral(self, integral_expr):
-        """Analyse une intégrale SymPy avec ses particularités."""
+    def _analyze_integral(self, integral_expr, budget=None):
+        """
+        Analyse une intégrale SymPy avec ses particularités.
+
+        Args:
+            integral_expr: Intégrale SymPy (éventuellement imbriquée)
+            budget: Temps alloué (secondes) ou BudgetCalcul, remplace celui de l'analyseur
+        """
+        budget = self._budget(budget)
         try:
             # --- 1. Aplatir les intégrales imbriquées ---
             def flatten_integral(integral):
@@ -851,7 +975,7 @@ class FonctionAnalyzer:
 
                     # Vérification de convergence AMÉLIORÉE
                     convergence = self._check_convergence(
-                        integrand, var, lower, upper
+                        integrand, var, lower, upper, budget
                     )
                 else:
                     convergence = {
@@ -896,14 +1020,29 @@ class FonctionAnalyzer:
                     all_issues.extend(bounds_val.get('issues', []))
                     overall_status = 'invalid'
 
+            # Palier du statut global : celui des variables qui le déterminent
+            paliers_statut = [info['convergence'].get('tiers', {}).get('status', SYMBOLIQUE)
+                              for info in integral_info
+                              if overall_status != 'divergent' or info['convergence'].get('status') == 'divergent']
+            tiers = {"overall_status": palier_global(paliers_statut)}
+
+            # --- 4. Valeur numérique (intégrales convergentes seulement) ---
+            numerical_value = None
+            if overall_status == 'convergent':
+                numerical_value = budget.calculer(
+                    tiers, "numerical_value", NUMERIQUE,
+                    lambda: self._evaluer_numeriquement(integrand, limits, integral_info))
+
             return {
                 "integrand": integrand,
                 "integral_info": integral_info,
                 "expr": integral_expr,
                 "dimension": len(limits),
                 "overall_status": overall_status,
+                "numerical_value": numerical_value,
                 "all_issues": all_issues,
-                "all_warnings": all_warnings
+                "all_warnings": all_warnings,
+                "tiers": tiers
             }
 
         except Exception as e:
@@ -914,6 +1053,148 @@ class FonctionAnalyzer:
 
 
 
+    @mesurer(ETAPES, etape='integration_numerique')
+    def _evaluer_numeriquement(self, integrand, limits, integral_info):
+        """
+        Valeur numérique d'une intégrale définie de dimension 1 à 3 : quadrature de
+        Gauss–Kronrod en 1D (coupée aux singularités déjà détectées), cubature
+        adaptative en 2D/3D (bornes dépendantes des variables extérieures).
+
+        Args:
+            integrand: Intégrande aplatie
+            limits: Limites aplaties (de l'intégrale intérieure à l'extérieure)
+            integral_info: Informations par variable (de l'extérieure à l'intérieure)
+
+        Returns:
+            dict avec 'value', 'error', 'evaluations', 'intervals', 'converged', ou None
+            si l'intégrale n'est pas définie ou dépend de paramètres libres
+        """
+        # De la variable la plus extérieure à la plus intérieure
+        ordre = list(reversed(limits))
+        if not 1 <= len(ordre) <= 3 or any(len(limite) != 3 for limite in ordre):
+            return None
+
+        variables = [limite[0] for limite in ordre]
+        constantes = self._constantes_latex(variables)
+        integrand = logarithmes_naturels(integrand.subs(constantes))
+        if integrand.free_symbols - set(variables):
+            return None
+
+        try:
+            f = compiler(variables, integrand)
+            if len(variables) == 1:
+                _, lower, upper = ordre[0]
+                singularities = integral_info[0]['convergence'].get('singularities', {}).get('all', [])
+                return integrer(f, float(lower.subs(constantes)), float(upper.subs(constantes)),
+                                points_singuliers=[valeur for _, valeur in singularities])
+
+            bornes = [(self._borne_numerique(lower.subs(constantes), variables[:i]),
+                       self._borne_numerique(upper.subs(constantes), variables[:i]))
+                      for i, (_, lower, upper) in enumerate(ordre)]
+            return integrer_multiple(f, bornes)
+        except Exception as e:
+            print(f"Erreur lors de l'intégration numérique: {e}")
+            return None
+
+    def _constantes_latex(self, variables):
+        """parse_latex lit e et pi comme des symboles (voir _validate_dependent_bounds) : substitutions vers E et pi."""
+        return {symbole: valeur for symbole, valeur in ((symbols('e'), E), (symbols('pi'), pi))
+                if symbole not in variables}
+
+    def _integrande_numerique(self, integrand, var):
+        """Intégrande lambdifiée en var, None si elle dépend d'autres variables."""
+        integrand = logarithmes_naturels(integrand.subs(self._constantes_latex([var])))
+        if integrand.free_symbols - {var}:
+            return None
+        return compiler(var, integrand)
+
+    def _estimer_decroissance(self, integrand, var, point, cote=1):
+        """
+        Estimation numérique de la décroissance de l'intégrande vers `point` (voir
+        decroissance.estimer_decroissance), None si l'intégrande dépend d'autres variables.
+        """
+        try:
+            f = self._integrande_numerique(integrand, var)
+            return estimer_decroissance(f, float(point), cote) if f else None
+        except Exception:
+            return None
+
+    def _tests_symboliques(self, budget, convergence_info, borne):
+        """
+        Vrai si le budget permet les tests symboliques (limit) en `borne` ; le palier
+        de la borne est noté dans convergence_info['tiers']['bounds'].
+        """
+        palier = IGNORE if budget.epuise() else SYMBOLIQUE
+        convergence_info['tiers']['bounds'][borne] = palier
+        return palier == SYMBOLIQUE
+
+    def _verifier_borne_numeriquement(self, integrand, var, borne, cote, convergence_info):
+        """
+        Repli des tests symboliques en une borne finie (budget épuisé) : une intégrande
+        finie en la borne est régulière ; sinon l'estimation de décroissance tranche si
+        son verdict est fiable, et la borne reste non vérifiée dans le cas contraire.
+        """
+        estimation = None
+        valeur = borne.subs(self._constantes_latex([var]))
+        try:
+            f = self._integrande_numerique(integrand, var) if valeur.is_number else None
+            if f:
+                if evaluer(f, np.array([float(valeur)]))[1][0]:
+                    convergence_info['tiers']['bounds'][str(borne)] = NUMERIQUE
+                    return
+                estimation = estimer_decroissance(f, float(valeur), cote)
+        except Exception:
+            pass
+        if not (estimation and estimation['statut']):
+            convergence_info['tiers']['bounds'][str(borne)] = IGNORE
+            return
+
+        convergence_info['tiers']['bounds'][str(borne)] = NUMERIQUE
+        convergence_info['decroissance'][str(borne)] = estimation
+        if estimation['statut'] == 'divergent':
+            convergence_info['issues'].append(
+                f"Singularité à la borne {'inférieure' if cote > 0 else 'supérieure'} {borne}"
+            )
+            convergence_info['status'] = 'divergent'
+
+    def _singularites_numeriques(self, integrand, var, lower, upper):
+        """
+        Repli numérique de _detect_singularities (budget épuisé) : zéros du dénominateur
+        par recherche numérique dans [lower, upper] ∩ INTERVALLE_RECHERCHE. None si
+        l'intégrande dépend d'autres variables, si une borne n'est pas numérique ou si
+        l'intégrande n'est pas définie partout sur l'intervalle (log, racine).
+        """
+        try:
+            f = self._integrande_numerique(integrand, var)
+            if f is None:
+                return None
+            constantes = self._constantes_latex([var])
+            a = max(float(lower.subs(constantes)), INTERVALLE_RECHERCHE[0])
+            b = min(float(upper.subs(constantes)), INTERVALLE_RECHERCHE[1])
+            integrand = logarithmes_naturels(integrand.subs(constantes))
+            poles = AnalyseCaracteristiques(integrand, var).asymptotes_verticales(a, b)
+            if not poles:
+                _, _, valides = echantillonner_1d(f, a, b, POINTS_SINGULARITES)
+                if not valides[1:-1].all():  # les bornes relèvent des tests aux bornes
+                    return None
+        except Exception:
+            return None
+
+        return {
+            'poles': poles,
+            'log_singularities': [],
+            'sqrt_singularities': [],
+            'discontinuities': [],
+            'all': [('pole', pole) for pole in poles]
+        }
+
+    def _borne_numerique(self, borne, variables_exterieures):
+        """Borne d'intégration : nombre (±inf accepté) ou fonction des variables extérieures."""
+        if borne.free_symbols:
+            return compiler(variables_exterieures, borne)
+        return float(borne)
+
+    @mesurer(ETAPES, etape='echantillonnage')
     def _analyser_integrand_1d(self, f_num, expr, variables, domain, integral_info):
         """Analyse l'intégrande 1D en tenant compte des limites d'intégration."""
         x = symbols(variables[0])
@@ -923,60 +1204,22 @@ class FonctionAnalyzer:
         x_min, x_max = domain.get(var_name, (-8, 8))
         bounds = {"y": (-4, 4)}
         
-        # Points critiques de l'intégrande sur [a, b]
-        critical_points = []
-        try:
-            f_prime = diff(expr, x)
-            critical_candidates = solve(f_prime, x)
-            for cp in critical_candidates:
-                if cp.is_real:
-                    cp_val = float(cp.evalf())
-                    # PARTICULARITÉ: Ne garder que les points dans [a, b]
-                    if x_min <= cp_val <= x_max:
-                        critical_points.append(cp_val)
-        except:
-            pass
+        # PARTICULARITÉ: Points critiques, racines et singularités dans [a, b] seulement
+        a, b = (max(INTERVALLE_RECHERCHE[0], float(x_min)), min(INTERVALLE_RECHERCHE[1], float(x_max)))
+        caracteristiques = self._caracteristiques_1d(expr, x)
+        critical_points = caracteristiques.points_critiques(a, b)
+        roots = caracteristiques.racines(a, b)
         
-        # Racines dans [a, b]
-        roots = []
-        try:
-            root_candidates = solve(expr, x)
-            for root in root_candidates:
-                if root.is_real:
-                    root_val = float(root.evalf())
-                    if x_min <= root_val <= x_max:
-                        roots.append(root_val)
-        except:
-            pass
-        
-        # Singularités dans [a, b]
-        singularities = []
+        # Singularités strictement à l'intérieur de [a, b]
+        singularities = [s for s in caracteristiques.asymptotes_verticales(a, b) if x_min < s < x_max]
         convergence_issues = integral_info.get('convergence', {}).get('issues', [])
         
-        try:
-            denominators = expr.as_numer_denom()[1]
-            sing_candidates = solve(denominators, x)
-            for sing in sing_candidates:
-                if sing.is_real:
-                    sing_val = float(sing.evalf())
-                    if x_min < sing_val < x_max:
-                        singularities.append(sing_val)
-        except:
-            pass
-        
         # Échantillonnage sur [a, b]
-        xs = np.linspace(x_min, x_max, 600)
-        ys = []
-        for xi in xs:
-            try:
-                yi = f_num(xi)
-                if np.isfinite(yi):
-                    ys.append(yi)
-            except:
-                pass
+        _, ys, valides = echantillonner_1d(f_num, x_min, x_max, 600)
+        ys = ys[valides]
         
         # Calcul des bornes y adaptatives
-        if ys:
+        if ys.size:
             y_min, y_max = np.min(ys), np.max(ys)
             y_span = y_max - y_min
             y_margin = max(0.5, 0.1 * y_span)
@@ -999,6 +1242,7 @@ class FonctionAnalyzer:
             "convergence_issues": convergence_issues
         }
 
+    @mesurer(ETAPES, etape='echantillonnage')
     def _analyser_integrand_2d(self, f_num, expr, variables, domain):
         """Analyse l'intégrande 2D sur le domaine d'intégration."""
         x, y = symbols(variables[0]), symbols(variables[1])
@@ -1009,21 +1253,11 @@ class FonctionAnalyzer:
         y_min, y_max = domain.get(variables[1], (-8, 8))
         
         # Échantillonnage sur le domaine d'intégration
-        base_xs = np.linspace(x_min, x_max, 30)
-        base_ys = np.linspace(y_min, y_max, 30)
-        zs = []
-        
-        for xi in base_xs:
-            for yi in base_ys:
-                try:
-                    zi = f_num(xi, yi)
-                    if np.isfinite(zi):
-                        zs.append(zi)
-                except:
-                    pass
+        _, _, zs, valides = evaluer_grille(f_num, (x_min, x_max), (y_min, y_max), RESOLUTION_GRILLE)
+        zs = zs[valides]
         
         # Calcul des bornes z
-        if zs:
+        if zs.size:
             z_min, z_max = np.min(zs), np.max(zs)
             z_span = z_max - z_min
             z_margin = max(0.5, 0.1 * z_span)
@@ -1039,9 +1273,10 @@ class FonctionAnalyzer:
             "domain": {variables[0]: (x_min, x_max), variables[1]: (y_min, y_max)},
             "bounds": bounds,
             "samples": 50,
-            "z_range": z_span if zs else None
+            "z_range": z_span if zs.size else None
         }
 
+    @mesurer(ETAPES, etape='echantillonnage')
     def _analyser_integrand_3d(self, f_num, expr, variables, domain):
         """Analyse l'intégrande 3D sur le domaine d'intégration."""
         bounds = {"w": (-4, 4)}
@@ -1051,25 +1286,11 @@ class FonctionAnalyzer:
         z_min, z_max = domain.get(variables[2], (-8, 8))
         
         samples = 15
-        xs = np.linspace(x_min, x_max, samples)
-        ys = np.linspace(y_min, y_max, samples)
-        zs = np.linspace(z_min, z_max, samples)
-        ws = []
+        stats = statistiques_grille(f_num, [(x_min, x_max), (y_min, y_max), (z_min, z_max)], samples)
         
-        for xi in xs:
-            for yi in ys:
-                for zi in zs:
-                    try:
-                        wi = f_num(xi, yi, zi)
-                        if np.isfinite(wi):
-                            ws.append(wi)
-                    except:
-                        pass
-        
-        if ws:
-            ws_array = np.array(ws)
-            w_min = float(np.min(ws_array))
-            w_max = float(np.max(ws_array))
+        if stats.valides:
+            w_min = float(stats.minimum)
+            w_max = float(stats.maximum)
             w_span = w_max - w_min
             w_margin = max(0.5, 0.1 * w_span)
             bounds["w"] = (w_min - w_margin, w_max + w_margin)
@@ -1084,48 +1305,47 @@ class FonctionAnalyzer:
             },
             "bounds": bounds,
             "samples": 15,
-            "w_range": w_span if ws else None
+            "w_range": w_span if stats.valides else None
         }
 
-    def _evaluate_integral(self, integral_expr, var, lower, upper, samples=100):
-        """Évalue numériquement une intégrale."""
+    @mesurer(ETAPES, etape='integration_numerique')
+    def _evaluate_integral(self, integral_expr, var, lower, upper, tolerance=None):
+        """
+        Évalue numériquement une intégrale par quadrature adaptative de Gauss–Kronrod,
+        en coupant aux singularités détectées (bornes infinies acceptées).
+
+        Returns:
+            dict avec 'value', 'error', 'evaluations', 'intervals', 'converged' et 'x_range'
+        """
         try:
-            f = lambdify(var, integral_expr.function, modules=['numpy', 'math'])
-            x_vals = np.linspace(float(lower), float(upper), samples)
-            y_vals = [f(x) for x in x_vals]
-            integral_value = np.trapz(y_vals, x_vals)
+            integrand = integral_expr.function
+            f = compiler(var, logarithmes_naturels(integrand))
+            singularities = self._detect_singularities(integrand, var, lower, upper)
+            points = [valeur for _, valeur in singularities['all']]
 
-            return {
-                "value": float(integral_value),
-                "samples": samples,
-                "x_range": (float(lower), float(upper)),
-                "y_values": y_vals
-            }
+            options = {} if tolerance is None else {"tolerance": tolerance, "tolerance_relative": tolerance}
+            resultat = integrer(f, float(lower), float(upper), points_singuliers=points, **options)
+            resultat["x_range"] = (float(lower), float(upper))
+            return resultat
         except Exception as e:
             print(f"Erreur lors de l'évaluation de l'intégrale: {e}")
             return None
 
-    def _compute_adaptive_domain_1d(self, f_num, expr, x, initial_domain=(-8, 8)):
+    @mesurer(ETAPES, etape='choix_domaine')
+    def _compute_adaptive_domain_1d(self, f_num, expr, x, initial_domain=(-8, 8), caracteristiques=None):
         """Calcule un domaine adaptatif pour une fonction 1D en tenant compte de sa croissance."""
+        caracteristiques = caracteristiques or self._caracteristiques_1d(expr, x)
         
         # 1. Détecter le type de fonction
         is_exponential = expr.has(exp) or any(term.func.__name__ == 'Pow' and term.exp.is_number and abs(float(term.exp)) > 2 for term in expr.atoms() if hasattr(term, 'exp'))
-        is_periodic = expr.has(sin, cos, tan)
+        is_periodic = caracteristiques.periodique
         has_log = expr.has(log)
         
         # 2. Échantillonnage initial pour détecter la croissance
-        test_points = np.linspace(initial_domain[0], initial_domain[1], 50)
-        y_values = []
-        valid_x = []
-        
-        for xi in test_points:
-            try:
-                yi = f_num(xi)
-                if np.isfinite(yi) and abs(yi) < 1e10:
-                    y_values.append(yi)
-                    valid_x.append(xi)
-            except:
-                pass
+        test_points, y_values, valides = echantillonner_1d(f_num, initial_domain[0], initial_domain[1], 50)
+        valides &= np.abs(y_values) < 1e10
+        y_values = y_values[valides]
+        valid_x = test_points[valides]
         
         # 3. Analyser la croissance de la fonction
         growth_rate = 0
@@ -1138,55 +1358,8 @@ class FonctionAnalyzer:
                 gradients = np.abs(np.gradient(y_array))
                 growth_rate = np.max(gradients) / (y_range + 1)
         
-        # 4. Trouver tous les points d'intérêt
-        interesting_points = []
-        
-        # Points critiques (extrema)
-        try:
-            f_prime = diff(expr, x)
-            critical_points = solve(f_prime, x)
-            for cp in critical_points:
-                if cp.is_real:
-                    cp_val = float(cp.evalf())
-                    if abs(cp_val) < 100:
-                        interesting_points.append(cp_val)
-        except:
-            pass
-        
-        # Racines
-        try:
-            roots = solve(expr, x)
-            for root in roots:
-                if root.is_real:
-                    root_val = float(root.evalf())
-                    if abs(root_val) < 100:
-                        interesting_points.append(root_val)
-        except:
-            pass
-        
-        # Points d'inflexion
-        try:
-            f_double_prime = diff(expr, x, 2)
-            inflection_points = solve(f_double_prime, x)
-            for ip in inflection_points:
-                if ip.is_real:
-                    ip_val = float(ip.evalf())
-                    if abs(ip_val) < 100:
-                        interesting_points.append(ip_val)
-        except:
-            pass
-        
-        # Asymptotes verticales
-        try:
-            denominators = expr.as_numer_denom()[1]
-            asymptotes = solve(denominators, x)
-            for va in asymptotes:
-                if va.is_real:
-                    va_val = float(va.evalf())
-                    if abs(va_val) < 100:
-                        interesting_points.append(va_val)
-        except:
-            pass
+        # 4. Trouver tous les points d'intérêt (extrema, racines, inflexions, asymptotes verticales)
+        interesting_points = caracteristiques.points_interessants(*INTERVALLE_RECHERCHE)
         
         # 5. STRATÉGIE ADAPTATIVE selon le type de fonction
         domain = {"x": initial_domain}
@@ -1204,17 +1377,11 @@ class FonctionAnalyzer:
             x_min, x_max = x_center - 5, x_center + 5
             
             # Affiner par échantillonnage
-            test_range = np.linspace(x_min, x_max, 100)
-            valid_range = []
-            for xi in test_range:
-                try:
-                    yi = abs(f_num(xi))
-                    if 1e-3 < yi < 1e3 and np.isfinite(yi):
-                        valid_range.append(xi)
-                except:
-                    pass
+            test_range, y_range, valides = echantillonner_1d(f_num, x_min, x_max, 100)
+            y_range = np.abs(y_range)
+            valid_range = test_range[valides & (y_range > 1e-3) & (y_range < 1e3)]
             
-            if valid_range:
+            if valid_range.size:
                 domain["x"] = (min(valid_range), max(valid_range))
                 # Ajouter une petite marge
                 span = domain["x"][1] - domain["x"][0]
@@ -1237,14 +1404,7 @@ class FonctionAnalyzer:
         
         # CAS 3: Fonction périodique
         elif is_periodic:
-            period = 2 * np.pi
-            
-            for term in expr.atoms(sin, cos, tan):
-                arg = term.args[0]
-                if arg.has(x):
-                    coeff = arg.coeff(x)
-                    if coeff is not None and coeff != 0:
-                        period = min(period, 2 * np.pi / abs(float(coeff)))
+            period = caracteristiques.periode
             
             # Afficher 2-3 périodes complètes
             if interesting_points:
@@ -1291,79 +1451,51 @@ class FonctionAnalyzer:
         
         return domain, interesting_points
 
-    def _analyser_fonction_1d(self, f_num, expr, variables, custom_domain=None):
+    @mesurer(ETAPES, etape='echantillonnage')
+    def _analyser_fonction_1d(self, f_num, expr, variables, custom_domain=None, caracteristiques=None, budget=None):
         x = symbols(variables[0])
+        budget = self._budget(budget)
+        tiers = {"domain": NUMERIQUE, "bounds": NUMERIQUE, "periodic": NUMERIQUE, "period": NUMERIQUE}
+        # Dérivées, racines, asymptotes : calculées une fois, partagées avec le choix du domaine
+        caracteristiques = caracteristiques or self._caracteristiques_1d(expr, x)
+        # Racines et extrema : recherche numérique, sauf résolution exacte (solve)
+        palier = SYMBOLIQUE if caracteristiques.exacte else NUMERIQUE
         
         # Utiliser un domaine personnalisé ou calculer un domaine adaptatif
         if custom_domain:
             domain = custom_domain
             interesting_points = []
         else:
-            domain, interesting_points = self._compute_adaptive_domain_1d(f_num, expr, x)
+            domain, interesting_points = budget.calculer(
+                tiers, "domain", palier,
+                lambda: self._compute_adaptive_domain_1d(f_num, expr, x, caracteristiques=caracteristiques),
+                defaut=({"x": (-8, 8)}, []))
         
         bounds = {"y": (-4, 4)}
 
-        # Extraire les points d'intérêt (déjà calculés ou recalculer)
-        critical_points = [p for p in interesting_points]
-        roots = []
-        inflection_points = []
-        vertical_asymptotes = []
-        horizontal_asymptotes = []
-        
-        # Calculer les caractéristiques détaillées si nécessaire
-        try:
-            f_prime = diff(expr, x)
-            crit_pts = solve(f_prime, x)
-            critical_points = [float(cp.evalf()) for cp in crit_pts if cp.is_real]
-        except:
-            pass
-
-        try:
-            root_pts = solve(expr, x)
-            roots = [float(root.evalf()) for root in root_pts if root.is_real]
-        except:
-            pass
-
-        try:
-            f_double_prime = diff(expr, x, 2)
-            infl_pts = solve(f_double_prime, x)
-            inflection_points = [float(ip.evalf()) for ip in infl_pts if ip.is_real]
-        except:
-            pass
-
-        try:
-            if expr.has(x):
-                denominators = expr.as_numer_denom()[1]
-                asympt_pts = solve(denominators, x)
-                vertical_asymptotes = [float(va.evalf()) for va in asympt_pts if va.is_real]
-        except:
-            pass
-
-        try:
-            limit_pos = expr.limit(x, oo)
-            limit_neg = expr.limit(x, -oo)
-            if limit_pos.is_finite:
-                horizontal_asymptotes.append(float(limit_pos.evalf()))
-            if limit_neg.is_finite:
-                horizontal_asymptotes.append(float(limit_neg.evalf()))
-        except:
-            pass
+        # Caractéristiques détaillées sur le domaine affiché (numériques d'abord, limites ensuite)
+        x_min, x_max = float(domain["x"][0]), float(domain["x"][1])
+        critical_points = budget.calculer(tiers, "critical_points", palier,
+                                          lambda: caracteristiques.points_critiques(x_min, x_max), [])
+        roots = budget.calculer(tiers, "roots", palier, lambda: caracteristiques.racines(x_min, x_max), [])
+        inflection_points = budget.calculer(tiers, "inflection_points", palier,
+                                            lambda: caracteristiques.points_inflexion(x_min, x_max), [])
+        asymptotes = {}
+        vertical_asymptotes = budget.calculer(asymptotes, "vertical", palier,
+                                              lambda: caracteristiques.asymptotes_verticales(x_min, x_max), [])
+        horizontal_asymptotes = budget.calculer(asymptotes, "horizontal", SYMBOLIQUE,
+                                                lambda: list(caracteristiques.asymptotes_horizontales), [])
+        tiers["asymptotes"] = asymptotes
+        tiers["discontinuities"] = asymptotes["vertical"]
 
         discontinuities = vertical_asymptotes
-        is_periodic = expr.has(sin, cos)
-        period = None
+        is_periodic = caracteristiques.periodique
+        period = caracteristiques.periode
 
-        xs = np.linspace(domain["x"][0], domain["x"][1], 600)
-        ys = []
-        for xi in xs:
-            try:
-                yi = f_num(xi)
-                if np.isfinite(yi):
-                    ys.append(yi)
-            except:
-                pass
+        _, ys, valides = echantillonner_1d(f_num, domain["x"][0], domain["x"][1], 600)
+        ys = ys[valides]
 
-        if ys:
+        if ys.size:
             y_min, y_max = np.min(ys), np.max(ys)
             y_span = y_max - y_min
             y_margin = max(0.5, 0.1 * y_span)
@@ -1392,11 +1524,16 @@ class FonctionAnalyzer:
             "period": period,
             "critical_points": critical_points,
             "roots": roots,
-            "inflection_points": inflection_points
+            "inflection_points": inflection_points,
+            "tiers": tiers
         }
 
-    def _compute_adaptive_domain_2d(self, f_num, expr, variables, initial_domain=None):
-        """Calcule un domaine adaptatif pour une fonction 2D en tenant compte de sa croissance."""
+    @mesurer(ETAPES, etape='choix_domaine')
+    def _compute_adaptive_domain_2d(self, f_num, expr, variables, initial_domain=None, critical_points=None):
+        """
+        Calcule un domaine adaptatif pour une fonction 2D en tenant compte de sa croissance.
+        critical_points : solutions de grad f = 0 déjà calculées (None : résoudre ici).
+        """
         x, y = symbols(variables[0]), symbols(variables[1])
         
         if initial_domain is None:
@@ -1409,29 +1546,19 @@ class FonctionAnalyzer:
         
         # 2. Échantillonnage pour analyser la croissance
         test_samples = 20
-        x_test = np.linspace(domain[variables[0]][0], domain[variables[0]][1], test_samples)
-        y_test = np.linspace(domain[variables[1]][0], domain[variables[1]][1], test_samples)
-        
-        z_values = []
-        valid_points = []
-        
-        for xi in x_test:
-            for yi in y_test:
-                try:
-                    zi = f_num(xi, yi)
-                    if np.isfinite(zi) and abs(zi) < 1e8:
-                        z_values.append(zi)
-                        valid_points.append((xi, yi))
-                except:
-                    pass
+        x_grid, y_grid, z_grid, valides = evaluer_grille(f_num, domain[variables[0]], domain[variables[1]],
+                                                         test_samples)
+        valides &= np.abs(z_grid) < 1e8
+        z_values = z_grid[valides]
         
         # 3. Trouver les points critiques
         interesting_points_x = []
         interesting_points_y = []
         
         try:
-            f_grad = [diff(expr, x), diff(expr, y)]
-            critical_points = solve(f_grad, (x, y), dict=True)
+            if critical_points is None:
+                f_grad = [diff(expr, x), diff(expr, y)]
+                critical_points = solve(f_grad, (x, y), dict=True)
             
             for cp in critical_points:
                 try:
@@ -1447,20 +1574,17 @@ class FonctionAnalyzer:
             pass
         
         # 4. STRATÉGIE ADAPTATIVE
-        if is_exponential and z_values:
+        if is_exponential and z_values.size:
             # Pour les exponentielles, trouver la zone où z est "raisonnable"
-            z_array = np.array(z_values)
-            
             # Garder seulement les points où |z| est entre 1e-2 et 1e2
-            good_indices = [i for i, z in enumerate(z_values) if 1e-2 < abs(z) < 1e2]
+            good = valides & (np.abs(z_grid) > 1e-2) & (np.abs(z_grid) < 1e2)
             
-            if good_indices:
-                good_points = [valid_points[i] for i in good_indices]
-                xs = [p[0] for p in good_points]
-                ys = [p[1] for p in good_points]
+            if good.any():
+                xs = x_grid[good]
+                ys = y_grid[good]
                 
-                x_min, x_max = min(xs), max(xs)
-                y_min, y_max = min(ys), max(ys)
+                x_min, x_max = xs.min(), xs.max()
+                y_min, y_max = ys.min(), ys.max()
                 
                 # Marge réduite pour exponentielles
                 x_margin = 0.1 * max(x_max - x_min, 1)
@@ -1514,26 +1638,29 @@ class FonctionAnalyzer:
         
         return domain
 
-    def _analyser_fonction_2d(self, f_num, expr, variables, custom_domain=None):
+    @mesurer(ETAPES, etape='echantillonnage')
+    def _analyser_fonction_2d(self, f_num, expr, variables, custom_domain=None, budget=None):
         x, y = symbols(variables[0]), symbols(variables[1])
+        budget = self._budget(budget)
+        tiers = {"domain": NUMERIQUE, "bounds": NUMERIQUE, "z_range": NUMERIQUE}
+
+        # Points critiques (solve) : calculés une fois, partagés avec le choix du domaine
+        def points_critiques():
+            try:
+                return solve([diff(expr, x), diff(expr, y)], (x, y), dict=True)
+            except:
+                return []
+
+        critical_points = budget.calculer(tiers, "critical_points", SYMBOLIQUE, points_critiques, [])
         
         # Calculer le domaine adaptatif
         if custom_domain:
             domain = custom_domain
         else:
-            domain = self._compute_adaptive_domain_2d(f_num, expr, variables)
+            domain = self._compute_adaptive_domain_2d(f_num, expr, variables, critical_points=critical_points)
         
         bounds = {"z": (-4, 4)}
 
-        # Recalculer les points critiques pour info détaillée
-        critical_points_detail = []
-        
-        try:
-            f_grad = [diff(expr, x), diff(expr, y)]
-            critical_points = solve(f_grad, (x, y), dict=True)
-        except:
-            critical_points = []
-
         hessian_points = []
         for cp in critical_points:
             try:
@@ -1551,20 +1678,10 @@ class FonctionAnalyzer:
             except:
                 continue
 
-        base_xs = np.linspace(domain[variables[0]][0], domain[variables[0]][1], 30)
-        base_ys = np.linspace(domain[variables[1]][0], domain[variables[1]][1], 30)
-        zs = []
-
-        for xi in base_xs:
-            for yi in base_ys:
-                try:
-                    zi = f_num(xi, yi)
-                    if np.isfinite(zi):
-                        zs.append(zi)
-                except:
-                    pass
+        _, _, zs, valides = evaluer_grille(f_num, domain[variables[0]], domain[variables[1]], RESOLUTION_GRILLE)
+        zs = zs[valides]
 
-        if zs:
+        if zs.size:
             z_min, z_max = np.min(zs), np.max(zs)
             z_span = z_max - z_min
             z_margin = max(0.5, 0.1 * z_span)
@@ -1584,9 +1701,11 @@ class FonctionAnalyzer:
             "bounds": bounds,
             "samples": 50,
             "critical_points": hessian_points,
-            "z_range": z_span if zs else None
+            "z_range": z_span if zs.size else None,
+            "tiers": tiers
         }
 
+    @mesurer(ETAPES, etape='choix_domaine')
     def _compute_adaptive_domain_3d(self, f_num, expr, variables, initial_domain=None):
         """Calcule un domaine adaptatif pour une fonction 3D en tenant compte de sa croissance."""
         if initial_domain is None:
@@ -1599,34 +1718,20 @@ class FonctionAnalyzer:
         
         # Échantillonnage grossier pour analyser
         samples = 8 if is_exponential else 10
-        ranges = [np.linspace(domain[var][0], domain[var][1], samples) for var in variables[:3]]
         
-        w_values = []
-        interesting_values = {var: [] for var in variables[:3]}
+        def interessants(w_vals, valides):
+            # Pour les exponentielles, garder seulement les valeurs raisonnables
+            if is_exponential:
+                return valides & (np.abs(w_vals) > 1e-2) & (np.abs(w_vals) < 1e2)
+            return valides & (np.abs(w_vals) > 0.01)  # Seuil pour filtrer le bruit
         
-        for point in np.array(np.meshgrid(*ranges)).T.reshape(-1, 3):
-            try:
-                w_val = f_num(*point)
-                if np.isfinite(w_val):
-                    w_values.append(w_val)
-                    
-                    # Pour les exponentielles, garder seulement les valeurs raisonnables
-                    if is_exponential:
-                        if 1e-2 < abs(w_val) < 1e2:
-                            for i, var in enumerate(variables[:3]):
-                                interesting_values[var].append(point[i])
-                    else:
-                        if abs(w_val) > 0.01:  # Seuil pour filtrer le bruit
-                            for i, var in enumerate(variables[:3]):
-                                interesting_values[var].append(point[i])
-            except:
-                pass
+        stats = statistiques_grille(f_num, [domain[var] for var in variables[:3]], samples,
+                                    selection=interessants)
         
         # Ajuster le domaine
-        for var in variables[:3]:
-            if interesting_values[var]:
-                vals = interesting_values[var]
-                v_min, v_max = min(vals), max(vals)
+        for i, var in enumerate(variables[:3]):
+            if stats.selectionnes:
+                v_min, v_max = stats.min_selection[i], stats.max_selection[i]
                 v_span = max(v_max - v_min, 1)
                 
                 # Marge adaptative
@@ -1656,6 +1761,7 @@ class FonctionAnalyzer:
         
         return domain
 
+    @mesurer(ETAPES, etape='echantillonnage')
     def _analyser_fonction_3d(self, f_num, expr, variables, custom_domain=None):
         x, y, z = symbols(variables[0]), symbols(variables[1]), symbols(variables[2])
         
@@ -1668,27 +1774,11 @@ class FonctionAnalyzer:
         bounds = {"w": (-4, 4)}
         
         samples = 15
-        xs = np.linspace(domain[variables[0]][0], domain[variables[0]][1], samples)
-        ys = np.linspace(domain[variables[1]][0], domain[variables[1]][1], samples)
-        zs = np.linspace(domain[variables[2]][0], domain[variables[2]][1], samples)
-        ws = []
-        points = []
+        stats = statistiques_grille(f_num, [domain[var] for var in variables[:3]], samples)
         
-        for xi in xs:
-            for yi in ys:
-                for zi in zs:
-                    try:
-                        wi = f_num(xi, yi, zi)
-                        if np.isfinite(wi):
-                            ws.append(wi)
-                            points.append((xi, yi, zi))
-                    except:
-                        pass
-        
-        if ws:
-            ws_array = np.array(ws)
-            w_min = float(np.min(ws_array))
-            w_max = float(np.max(ws_array))
+        if stats.valides:
+            w_min = float(stats.minimum)
+            w_max = float(stats.maximum)
             w_span = w_max - w_min
             
             if w_span > 1e3:
@@ -1709,10 +1799,11 @@ class FonctionAnalyzer:
                 "render_type": "VOLUME" if bounds.get("echelle") == "log" else "SURFACE_COLOR",
                 "domain": domain,
                 "bounds": bounds,
-                "samples": min(20, 15 + len(ws)//100),
+                "samples": min(20, 15 + stats.valides//100),
                 "echelle": bounds.get("echelle", "lin"),
                 "isosurfaces": isosurfaces,
-                "w_range": w_span
+                "w_range": w_span,
+                "tiers": {champ: NUMERIQUE for champ in ("domain", "bounds", "isosurfaces", "w_range")}
             }
         else:
             return {
@@ -1723,31 +1814,22 @@ class FonctionAnalyzer:
                 "samples": 15,
                 "echelle": "lin",
                 "isosurfaces": [],
-                "w_range": None
+                "w_range": None,
+                "tiers": {champ: NUMERIQUE for champ in ("domain", "bounds", "isosurfaces", "w_range")}
             }
 
-    def _analyser_fonction_nd(self, f_num, expr, variables):
+    @mesurer(ETAPES, etape='echantillonnage')
+    def _analyser_fonction_nd(self, f_num, expr, variables, custom_domain=None):
         n_dim = len(variables)
-        domain = {var: (-8, 8) for var in variables}
+        domain = custom_domain or {var: (-8, 8) for var in variables}
         bounds = {"w": (-4, 4)}
 
+        # Grille parcourue par blocs : mémoire bornée quelle que soit la dimension
         samples = max(10, min(20, 2 ** (n_dim - 1)))
-        ranges = [np.linspace(domain[var][0], domain[var][1], samples) for var in variables]
-        ws = []
-        points = []
-
-        for point in np.array(np.meshgrid(*ranges)).T.reshape(-1, n_dim):
-            try:
-                wi = f_num(*point)
-                if np.isfinite(wi):
-                    ws.append(wi)
-                    points.append(point)
-            except:
-                pass
+        stats = statistiques_grille(f_num, [domain[var] for var in variables], samples)
 
-        if ws:
-            ws_array = np.array(ws)
-            w_min, w_max = np.min(ws_array), np.max(ws_array)
+        if stats.valides:
+            w_min, w_max = stats.minimum, stats.maximum
             w_span = w_max - w_min
 
             if w_span > 1e3:
@@ -1768,184 +1850,6 @@ class FonctionAnalyzer:
             "bounds": bounds,
             "samples": samples,
             "echelle": bounds.get("echelle", "lin"),
-            "dimension": n_dim
+            "dimension": n_dim,
+            "tiers": {"domain": NUMERIQUE, "bounds": NUMERIQUE}
         }
-
-# Test
-from sympy import sin, cos, exp, log, sqrt, oo
-from sympy.parsing.latex import parse_latex
-import sys
-
-# Forcer l'encodage UTF-8 pour la sortie
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-
-
-# ===============================
-# HARNAIS DE TEST GLOBAL
-# ===============================
-
-def run_integral_test(analyzer, latex_expr, description):
-    print("\n" + "=" * 80)
-    print(f"🧪 TEST : {description}")
-    print(f"LaTeX : {latex_expr}")
-
-    try:
-        expr = parse_latex_fallback(latex_expr)
-        integrals = analyzer._extract_integrals(expr)
-
-        if not integrals:
-            print("❌ Aucune intégrale détectée")
-            return
-
-        for idx, integral in enumerate(integrals, 1):
-            print(f"\n🔍 Intégrale #{idx}")
-            result = analyzer._analyze_integral(integral)
-
-            if result is None:
-                print("❌ Analyse échouée")
-                continue
-
-            # ---- Assertions structurelles ----
-            assert isinstance(result, dict)
-            assert "integrand" in result
-            assert "integral_info" in result
-            assert "dimension" in result
-            assert "overall_status" in result
-            assert isinstance(result["integral_info"], list)
-            assert result["dimension"] == len(result["integral_info"])
-
-            print(f"✅ Analyse réussie")
-            print(f"   Dimension : {result['dimension']}")
-            print(f"   Intégrande : {result['integrand']}")
-            print(f"   Statut global : {result['overall_status']}")
-
-            # Afficher les problèmes globaux
-            if result.get('all_issues'):
-                print(f"   ⚠️  PROBLÈMES ({len(result['all_issues'])}):")
-                for issue in result['all_issues']:
-                    print(f"      - {issue}")
-
-            if result.get('all_warnings'):
-                print(f"   ℹ️  AVERTISSEMENTS ({len(result['all_warnings'])}):")
-                for warning in result['all_warnings']:
-                    print(f"      - {warning}")
-
-            # Détails par variable
-            for info in result["integral_info"]:
-                assert "integration_variable" in info
-                assert "convergence" in info
-                assert "bounds_validation" in info
-
-                var = info['integration_variable']
-                conv = info['convergence']
-                bounds_val = info['bounds_validation']
-
-                print(f"\n   📊 Variable d{var} [{info['lower_limit']}, {info['upper_limit']}]:")
-                print(f"      • Type: {conv.get('type', 'N/A')}")
-                print(f"      • Statut: {conv.get('status', 'N/A')}")
-
-                # Domaine de définition
-                domain_info = conv.get('domain_info', {})
-                if not domain_info.get('is_all_reals', True):
-                    print(f"      • Domaine: {domain_info.get('domain', 'N/A')}")
-                    if domain_info.get('restrictions'):
-                        print(f"      • Restrictions:")
-                        for restriction in domain_info['restrictions']:
-                            print(f"         - {restriction}")
-
-                # Singularités
-                singularities = conv.get('singularities', {})
-                if singularities.get('all'):
-                    print(f"      • Singularités détectées:")
-                    for sing_type, sing_val in singularities['all']:
-                        print(f"         - {sing_type}: {var} = {sing_val:.6f}")
-
-                # Validation des bornes
-                if bounds_val.get('dependencies'):
-                    print(f"      • Bornes dépendantes de: {', '.join(bounds_val['dependencies'])}")
-                if not bounds_val.get('valid', True):
-                    print(f"      • ⚠️  Bornes invalides!")
-
-    except AssertionError as ae:
-        print(f"💥 Assertion échouée : {ae}")
-        import traceback
-        traceback.print_exc()
-    except Exception as e:
-        print(f"💥 Crash total : {e}")
-        import traceback
-        traceback.print_exc()
-
-
-# ===============================
-# BATTERIE DE TESTS COMPLÈTE
-# ===============================
-
-TESTS = [
-
-    # --- Intégrales simples ---
-    (r"\int_0^1 x \, dx", "Polynôme degré 1 (convergent)"),
-    (r"\int_0^1 x^7 \, dx", "Polynôme degré élevé (convergent)"),
-    (r"\int_{-1}^1 x^3 \, dx", "Polynôme impair (convergent)"),
-
-    # --- Fonctions classiques ---
-    (r"\int_0^{\pi} \sin(x)\,dx", "Trigonométrique (convergent)"),
-    (r"\int_0^{\pi/2} \cos(x)\,dx", "Trigonométrique cos (convergent)"),
-    (r"\int_1^{e} \ln(x)\,dx", "Logarithme (convergent)"),
-    (r"\int_0^{\infty} e^{-x}\,dx", "Exponentielle convergente (test décroissance exp)"),
-
-    # --- Intégrales impropres DIVERGENTES ---
-    (r"\int_0^{\infty} x\,dx", "Divergente simple (croissance linéaire)"),
-    (r"\int_1^{\infty} \frac{1}{x}\,dx", "Divergente 1/x (cas limite p=1)"),
-    (r"\int_1^{\infty} \frac{1}{x^{0.5}}\,dx", "Divergente 1/x^(1/2) (p<1)"),
-
-    # --- Intégrales impropres CONVERGENTES ---
-    (r"\int_1^{\infty} \frac{1}{x^2}\,dx", "Convergente 1/x^2 (p>1)"),
-    (r"\int_1^{\infty} \frac{1}{x^3}\,dx", "Convergente 1/x^3 (p>1)"),
-    (r"\int_{-\infty}^{\infty} e^{-x^2}\,dx", "Gaussienne (convergente)"),
-
-    # --- Singularités en bornes ---
-    (r"\int_0^1 \frac{1}{\sqrt{x}}\,dx", "Singularité en x=0 (borne inf)"),
-    (r"\int_0^1 \frac{1}{x}\,dx", "Singularité log en x=0 (divergente)"),
-    (r"\int_0^1 \ln(x)\,dx", "log(x) avec singularité en x=0 (convergente)"),
-
-    # --- Singularités INTERNES (doivent être détectées) ---
-    (r"\int_0^2 \frac{1}{x-1}\,dx", "Pôle INTERNE en x=1 (DIVERGENTE)"),
-    (r"\int_{-1}^1 \frac{1}{x}\,dx", "Pôle INTERNE en x=0 (DIVERGENTE)"),
-    (r"\int_0^2 \ln(x-1)\,dx", "Singularité log INTERNE en x=1 (DIVERGENTE)"),
-
-    # --- Domaines de définition ---
-    (r"\int_{-1}^1 \ln(x)\,dx", "ln(x) hors domaine (x>0) - INVALIDE"),
-    (r"\int_{-2}^{-1} \frac{1}{\sqrt{x}}\,dx", "sqrt(x) hors domaine (x>=0) - INVALIDE"),
-
-    # --- Intégrales imbriquées ---
-    (r"\int_0^1 \int_0^1 x y \, dx \, dy", "Intégrale double imbriquée (convergente)"),
-    (r"\int_0^1 \left( \int_0^x y\,dy \right) dx", "Bornes dépendantes VALIDES"),
-    (r"\int_0^1 \left( \int_y^1 x\,dx \right) dy", "Bornes dépendantes (y intégré après)"),
-
-    # --- Dimension élevée ---
-    (
-        r"\int_0^1 \int_0^1 \int_0^1 \int_0^1 x y z t \, dx\,dy\,dz\,dt",
-        "Intégrale 4D (convergente)"
-    ),
-
-    # --- Fonctions pathologiques ---
-    (r"\int_0^1 \sin\left(\frac{1}{x}\right)\,dx", "Oscillation forte (singularité essentielle)"),
-    (r"\int_1^{\infty} \frac{\sin(x)}{x}\,dx", "Convergence conditionnelle"),
-    (r"\int_0^1 \ln(\ln(\frac{1}{x}))\,dx", "Logarithme composé"),
-
-    # --- Tests de décroissance exponentielle vs algébrique ---
-    (r"\int_0^{\infty} x^2 e^{-x}\,dx", "x^2 * e^(-x) : exponentielle domine"),
-    (r"\int_1^{\infty} \frac{e^{-x}}{x}\,dx", "e^(-x)/x : convergente"),
-    (r"\int_1^{\infty} \frac{1}{x \ln(x)}\,dx", "1/(x*ln(x)) : divergente"),
-]
-
-
-# ===============================
-# LANCEMENT DES TESTS
-# ===============================
-if __name__ == "__main__":
-    analyzer = FonctionAnalyzer()
-    for latex, desc in TESTS:
-        run_integral_test(analyzer, latex, desc)
@@ -0,0 +1,390 @@
+"""
+Exécution des lignes d'une requête : séquentielle ou répartie sur un pool de processus.
+Les résultats sont servis depuis le cache quand c'est possible.
+Avec un budget de temps par ligne, chaque ligne tourne dans un processus qui peut être tué.
+Les processus de travail renvoient leurs métriques avec chaque résultat.
+"""
+
+import os
+import math
+import time
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import metriques
+from app.generation import generer_resultat, normaliser_ligne, prechauffer
+
+MODES_EXECUTION = ('sequentiel', 'processus')
+
+# Délai maximal accordé à un processus neuf pour se préchauffer avant sa première ligne
+DELAI_DEMARRAGE_S = 120
+
+# Message envoyé par un travailleur quand il commence réellement une ligne
+DEBUT_LIGNE = 'debut'
+
+
+def _initialiser_processus():
+    """Prépare un processus de travail : préchauffage, métriques héritées du parent oubliées."""
+    prechauffer()
+    metriques.REGISTRE.extraire()
+
+
+def _generer_avec_metriques(ligne, sortie=None):
+    """generer_resultat exécuté dans un processus de travail, avec le delta de ses métriques."""
+    res = generer_resultat(ligne, sortie)
+    res['metriques'] = metriques.REGISTRE.extraire()
+    return res
+
+
+def _boucle_travailleur(connexion):
+    """Boucle d'un processus de travail : reçoit des (ligne, budget de sortie) et renvoie leurs résultats."""
+    _initialiser_processus()
+    while True:
+        try:
+            tache = connexion.recv()
+        except (EOFError, OSError):
+            break
+        if tache is None:
+            break
+        connexion.send(DEBUT_LIGNE)
+        connexion.send(_generer_avec_metriques(*tache))
+
+
+class _Travailleur:
+    """Processus de travail dédié, joignable par un Pipe, qui peut être tué à tout moment."""
+
+    def __init__(self):
+        self.connexion, connexion_enfant = multiprocessing.Pipe()
+        self.processus = multiprocessing.Process(target=_boucle_travailleur,
+                                                 args=(connexion_enfant,), daemon=True)
+        self.processus.start()
+        connexion_enfant.close()
+
+    def arreter(self):
+        """Demande l'arrêt propre du processus."""
+        try:
+            self.connexion.send(None)
+        except (OSError, ValueError):
+            pass
+        self.connexion.close()
+
+    def tuer(self):
+        """Tue le processus immédiatement (calcul en cours abandonné)."""
+        self.processus.terminate()
+        self.processus.join(1)
+        if self.processus.is_alive():
+            self.processus.kill()
+            self.processus.join()
+        self.connexion.close()
+
+
+def resultat_erreur(ligne, erreur):
+    """Résultat structuré d'une ligne qui n'a pas pu être générée."""
+    return {
+        'ligne': ligne,
+        'statut': 'erreur',
+        'resultat': None,
+        'erreur': erreur,
+        'duree_ms': 0.0
+    }
+
+
+def resultat_timeout(ligne, budget, duree_ms):
+    """Résultat structuré d'une ligne dont le budget de temps est dépassé (duree_ms mesurée)."""
+    return {
+        'ligne': ligne,
+        'statut': 'timeout',
+        'resultat': None,
+        'erreur': f"Temps dépassé (budget de {budget:g} s)",
+        'duree_ms': duree_ms
+    }
+
+
+class PoolTuable:
+    """
+    Pool de processus persistants dont chaque tâche a une échéance.
+
+    Contrairement à ProcessPoolExecutor, un processus qui dépasse son échéance
+    est tué puis remplacé, sans affecter les autres tâches du lot.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._libres = []
+        self._verrou = threading.Lock()
+
+    def _emprunter(self, n):
+        """Réserve n travailleurs (réutilise les libres, crée les manquants)."""
+        with self._verrou:
+            pris = self._libres[:n]
+            del self._libres[:n]
+        return pris + [_Travailleur() for _ in range(n - len(pris))]
+
+    def _rendre(self, travailleurs):
+        """Remet des travailleurs disponibles au pool (les surnuméraires sont arrêtés)."""
+        with self._verrou:
+            place = max(0, self.workers - len(self._libres))
+            self._libres.extend(travailleurs[:place])
+        for travailleur in travailleurs[place:]:
+            travailleur.arreter()
+
+    def arreter(self):
+        """Arrête tous les travailleurs libres."""
+        with self._verrou:
+            libres, self._libres = self._libres, []
+        for travailleur in libres:
+            travailleur.arreter()
+
+    def iterer(self, taches):
+        """
+        Exécute des tâches (index, ligne, budget, sortie) et produit (index, résultat) dès qu'ils sont prêts.
+
+        Le budget d'une ligne court à partir du moment où le travailleur la commence,
+        pour ne pas lui imputer le préchauffage d'un processus neuf.
+
+        Args:
+            taches: Liste de (index, ligne, budget, sortie), budget en secondes (None: illimité),
+                    sortie: budget de sortie (voir generer_resultat)
+        """
+        en_attente = list(reversed(taches))
+        libres = self._emprunter(min(self.workers, len(taches)))
+        occupes = {}  # connexion -> (travailleur, index, ligne, budget, début, échéance)
+
+        def echeance(budget, delai=0.0):
+            return time.monotonic() + budget + delai if budget else math.inf
+
+        try:
+            while en_attente or occupes:
+                # Distribuer les tâches aux travailleurs libres
+                while en_attente and libres:
+                    index, ligne, budget, sortie = en_attente.pop()
+                    travailleur = libres.pop()
+                    travailleur.connexion.send((ligne, sortie))
+                    occupes[travailleur.connexion] = (travailleur, index, ligne, budget, time.monotonic(),
+                                                      echeance(budget, DELAI_DEMARRAGE_S))
+
+                prochaine = min(e for *_, e in occupes.values())
+                attente = None if prochaine == math.inf else max(0.0, prochaine - time.monotonic())
+                prets = wait(list(occupes), timeout=attente)
+
+                for connexion in prets:
+                    travailleur, index, ligne, budget, _, _ = occupes.pop(connexion)
+                    try:
+                        res = connexion.recv()
+                        if res == DEBUT_LIGNE:
+                            # La ligne commence : son budget court à partir de maintenant
+                            occupes[connexion] = (travailleur, index, ligne, budget, time.monotonic(),
+                                                  echeance(budget))
+                            continue
+                        libres.append(travailleur)
+                    except (EOFError, OSError):
+                        # Le processus est mort (crash, mémoire...) : le remplacer
+                        travailleur.tuer()
+                        libres.append(_Travailleur())
+                        res = resultat_erreur(ligne, "Processus de travail interrompu")
+                    yield index, res
+
+                # Tuer les travailleurs dont l'échéance est dépassée
+                maintenant = time.monotonic()
+                for connexion in [c for c, (*_, e) in occupes.items() if e <= maintenant]:
+                    travailleur, index, ligne, budget, debut, _ = occupes.pop(connexion)
+                    travailleur.tuer()
+                    libres.append(_Travailleur())
+                    yield index, resultat_timeout(ligne, budget, (maintenant - debut) * 1000)
+        finally:
+            # Lot abandonné en cours de route : les calculs restants sont tués
+            for travailleur, *_ in occupes.values():
+                travailleur.tuer()
+            self._rendre(libres)
+
+
+class ExecuteurLignes:
+    """Exécute des lignes indépendantes et restitue les résultats dans l'ordre d'entrée."""
+
+    def __init__(self, mode='sequentiel', workers=None, cache=None, budget=None):
+        """
+        Args:
+            mode: 'sequentiel' (thread de la requête) ou 'processus' (ProcessPoolExecutor)
+            workers: Nombre de processus du pool (défaut: nombre de cœurs)
+            cache: CacheLRU optionnel, indexé par ligne normalisée (et par budget de
+                   sortie, pour les requêtes qui en imposent un)
+            budget: Temps maximal par ligne en secondes (None ou 0: illimité)
+        """
+        if mode not in MODES_EXECUTION:
+            raise ValueError(f"Mode d'exécution inconnu: {mode} (attendu: {', '.join(MODES_EXECUTION)})")
+
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.budget = budget
+
+        self._pool = None
+        self._pool_tuable = None
+        self._verrou = threading.Lock()
+
+    def _get_pool(self):
+        """Crée le pool de processus à la première utilisation."""
+        with self._verrou:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=_initialiser_processus)
+            return self._pool
+
+    def _abandonner_pool(self, pool):
+        """Oublie un pool cassé (processus de travail mort) : la requête suivante en crée un neuf."""
+        with self._verrou:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_pool_tuable(self):
+        """Crée le pool de processus tuables à la première utilisation."""
+        with self._verrou:
+            if self._pool_tuable is None:
+                # En mode séquentiel, les lignes passent une par une dans un seul processus
+                self._pool_tuable = PoolTuable(self.workers if self.mode == 'processus' else 1)
+            return self._pool_tuable
+
+    def arreter(self):
+        """Arrête les pools de processus s'ils ont été créés."""
+        with self._verrou:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._pool_tuable is not None:
+                self._pool_tuable.arreter()
+                self._pool_tuable = None
+
+    @staticmethod
+    def _cle_cache(cle, sortie):
+        # Budget de sortie du serveur : clé historique (ligne seule)
+        return cle if sortie is None else (cle, sortie)
+
+    def _depuis_cache(self, cle, sortie=None):
+        if self.cache is None:
+            return None
+        resultat = self.cache.get(self._cle_cache(cle, sortie))
+        if resultat is None:
+            metriques.CACHE_MISSES.incrementer()
+            return None
+        metriques.CACHE_HITS.incrementer()
+        return {
+            'ligne': cle,
+            'statut': 'ok',
+            'resultat': resultat,
+            'erreur': None,
+            'duree_ms': 0.0
+        }
+
+    def _memoriser(self, cle, sortie, res):
+        if self.cache is not None and res['statut'] == 'ok' and res['resultat'] is not None:
+            self.cache.put(self._cle_cache(cle, sortie), res['resultat'])
+
+    def iterer(self, lignes, budget=None, budgets=None, sortie=None, sorties=None):
+        """
+        Génère les lignes et produit (index, résultat) au fur et à mesure qu'ils sont prêts.
+
+        L'ordre de production n'est pas l'ordre d'entrée : les résultats en cache
+        sortent d'abord, puis les autres dans l'ordre où ils se terminent.
+        Une ligne répétée dans le lot n'est calculée qu'une fois.
+        Chaque résultat est un dict (voir generer_resultat) complété de 'cache'.
+
+        Args:
+            lignes: Lignes à générer
+            budget: Temps maximal par ligne (secondes), remplace celui de l'exécuteur
+            budgets: Budgets propres à chaque ligne (liste alignée sur lignes,
+                     None dans la liste: budget commun)
+            sortie: Budget de sortie (max_octets, max_primitives) des lignes, None :
+                    celui du serveur
+            sorties: Budgets de sortie propres à chaque ligne (comme budgets)
+        """
+        if budget is None:
+            budget = self.budget
+
+        # (ligne normalisée, budget, budget de sortie) -> index des lignes identiques du lot
+        a_calculer = {}
+        for index, ligne in enumerate(lignes):
+            cle = normaliser_ligne(ligne)
+            sortie_ligne = sorties[index] if sorties and sorties[index] is not None else sortie
+            res = self._depuis_cache(cle, sortie_ligne)
+            if res is not None:
+                res['cache'] = True
+                metriques.LIGNES_TOTAL.incrementer(statut='ok')
+                yield index, res
+                continue
+            budget_ligne = budgets[index] if budgets and budgets[index] is not None else budget
+            a_calculer.setdefault((cle, budget_ligne, sortie_ligne), []).append(index)
+
+        for (cle, _, sortie_ligne), indices, res in self._calculer(list(a_calculer.items())):
+            metriques.REGISTRE.fusionner(res.pop('metriques', None))
+            self._compter(res, len(indices))
+            self._memoriser(cle, sortie_ligne, res)
+            res['cache'] = False
+            yield indices[0], res
+            # Doublons du lot : même résultat, sans nouveau calcul
+            for index in indices[1:]:
+                yield index, dict(res, cache=True)
+
+    @staticmethod
+    def _compter(res, occurrences):
+        """
+        Met à jour les métriques pour un résultat calculé (présent `occurrences` fois dans le lot).
+        Seul endroit où les lignes en erreur sont comptées (statut de generer_resultat).
+        """
+        metriques.LIGNES.observer(res['duree_ms'] / 1000)
+        metriques.LIGNES_TOTAL.incrementer(occurrences, statut=res['statut'])
+        if res['statut'] == 'timeout':
+            metriques.TIMEOUTS.incrementer(occurrences)
+        elif res['statut'] == 'erreur':
+            metriques.ERREURS.incrementer(occurrences)
+
+    def _calculer(self, groupes):
+        """
+        Calcule des groupes ((ligne, budget, sortie), indices) et produit (clé, indices,
+        résultat) dans l'ordre où ils se terminent.
+        """
+        if not groupes:
+            return
+
+        # Budget de temps : chaque ligne tourne dans un processus tuable
+        if any(budget for (_, budget, _), _ in groupes):
+            taches = [(i, cle, budget, sortie) for i, ((cle, budget, sortie), _) in enumerate(groupes)]
+            for i, res in self._get_pool_tuable().iterer(taches):
+                yield groupes[i][0], groupes[i][1], res
+            return
+
+        # Une seule ligne à calculer : inutile de passer par le pool
+        if self.mode == 'sequentiel' or len(groupes) <= 1:
+            for (cle, budget, sortie), indices in groupes:
+                yield (cle, budget, sortie), indices, generer_resultat(cle, sortie)
+            return
+
+        pool = self._get_pool()
+        futures = {}
+        for (cle, budget, sortie), indices in groupes:
+            try:
+                futures[pool.submit(_generer_avec_metriques, cle, sortie)] = ((cle, budget, sortie), indices)
+            except BrokenProcessPool as e:
+                self._abandonner_pool(pool)
+                yield (cle, budget, sortie), indices, resultat_erreur(cle, f"Processus de travail interrompu ({e})")
+        for future in as_completed(futures):
+            (cle, budget, sortie), indices = futures[future]
+            try:
+                res = future.result()
+            except BrokenProcessPool as e:
+                # Un processus est mort (mémoire, signal...) : le pool ne sert plus
+                self._abandonner_pool(pool)
+                res = resultat_erreur(cle, f"Processus de travail interrompu ({e})")
+            except Exception as e:
+                res = resultat_erreur(cle, str(e))
+            yield (cle, budget, sortie), indices, res
+
+    def executer(self, lignes, budget=None, budgets=None, sortie=None, sorties=None):
+        """Génère toutes les lignes et retourne la liste des résultats dans l'ordre d'entrée."""
+        resultats = [None] * len(lignes)
+        for index, res in self.iterer(lignes, budget=budget, budgets=budgets, sortie=sortie, sorties=sorties):
+            resultats[index] = res
+        return resultats
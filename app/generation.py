@@ -0,0 +1,351 @@
+"""
+Génération TikZ ligne par ligne, indépendante de Flask.
+Ce module est importé par le serveur et par les processus de travail.
+"""
+
+import sys
+import os
+import re
+import time
+
+# Ajouter le dossier parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importer les générateurs
+# generateur_graphiques (et donc SymPy) n'est importé qu'à la première fonction
+# mathématique : les formes géométriques ne paient jamais cet import.
+from generateur_formes_geometriques import GenerateurFormesGeometriques
+import budget_sortie
+from budget_sortie import BudgetSortie
+import metriques
+
+# Taille maximale par défaut de la sortie TikZ d'une ligne (voir budget_sortie.py ; une
+# requête peut la remplacer) : au-delà, la résolution est dégradée par paliers et
+# signalée en commentaire
+MAX_OCTETS_SORTIE = int(os.environ.get('TIKZ_MAX_OCTETS', 64 * 1024))
+MAX_PRIMITIVES_SORTIE = int(os.environ.get('TIKZ_MAX_PRIMITIVES', 2500))
+BUDGET_SORTIE = BudgetSortie(MAX_OCTETS_SORTIE, MAX_PRIMITIVES_SORTIE)
+
+# Initialiser les générateurs
+forme_generator = GenerateurFormesGeometriques(budget_sortie=BUDGET_SORTIE)
+_graph_generator = None
+
+# Expressions représentatives exécutées au préchauffage d'un processus
+EXPRESSIONS_PRECHAUFFAGE = [
+    r"x^2",
+    r"\sin(x)",
+    r"\frac{1}{x}",
+    r"x^2 + y^2",
+    r"\int_0^1 x^2 \, dx",
+    r"cercle_trigo(45)",
+]
+
+_prechauffe = False
+
+# Temps alloué à l'analyse d'une expression (secondes, 0 : illimité) : au-delà, les
+# étapes symboliques restantes sont sautées (voir budget_calcul.py)
+BUDGET_ANALYSE_S = float(os.environ.get('TIKZ_BUDGET_ANALYSE_S', 0)) or None
+
+# Mode de sortie des courbes 1D et des surfaces : 'expression' (pgfplots évalue la formule) ou
+# 'coordonnees' (points calculés côté serveur, voir trace_adaptatif.py et maillage_adaptatif.py)
+MODE_SORTIE = os.environ.get('TIKZ_MODE_SORTIE', 'expression')
+
+# Sommets au plus d'une surface maillée côté serveur (mode 'coordonnees')
+MAX_SOMMETS_SURFACE = int(os.environ.get('TIKZ_MAX_SOMMETS', 400))
+
+
+def get_graph_generator():
+    """Retourne le générateur de graphiques, créé (avec ses imports SymPy) au premier appel."""
+    global _graph_generator
+    if _graph_generator is None:
+        from generateur_graphiques import TikzGraphGenerator
+        _graph_generator = TikzGraphGenerator(budget_analyse=BUDGET_ANALYSE_S, mode_sortie=MODE_SORTIE,
+                                              max_sommets=MAX_SOMMETS_SURFACE, budget_sortie=BUDGET_SORTIE)
+    return _graph_generator
+
+
+def __getattr__(name):
+    # Compatibilité : 'graph_generator' reste accessible comme attribut du module
+    if name == 'graph_generator':
+        return get_graph_generator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Registre des commandes de formes géométriques : nom -> (fonction, arguments)
+# arguments: tuple de (convertisseur, défaut), convertisseur de tout le texte entre parenthèses,
+#            ou None (arguments ignorés, parenthèses facultatives)
+FORMES = {}
+
+# Valeur par défaut signalant un argument obligatoire
+REQUIS = object()
+
+# Nom de commande en début de ligne, suivi éventuellement de ses arguments entre parenthèses
+RE_COMMANDE = re.compile(r'([a-z_][a-z0-9_]*)\s*(?:\(([^)]*)\))?')
+
+_RE_ENTIER = re.compile(r'\d+')
+_RE_REEL = re.compile(r'\d+(?:\.\d+)?')
+_RE_REEL_SIGNE = re.compile(r'-?\d+(?:\.\d+)?')
+_RE_MOT = re.compile(r'\w+')
+
+
+def entier(texte):
+    """Entier positif ou nul."""
+    if not _RE_ENTIER.fullmatch(texte):
+        raise ValueError(f"Entier attendu: {texte!r}")
+    return int(texte)
+
+
+def reel(texte):
+    """Réel positif ou nul."""
+    if not _RE_REEL.fullmatch(texte):
+        raise ValueError(f"Réel positif attendu: {texte!r}")
+    return float(texte)
+
+
+def reel_signe(texte):
+    """Réel éventuellement négatif."""
+    if not _RE_REEL_SIGNE.fullmatch(texte):
+        raise ValueError(f"Réel attendu: {texte!r}")
+    return float(texte)
+
+
+def mot(texte):
+    """Identifiant (lettres, chiffres, _)."""
+    if not _RE_MOT.fullmatch(texte):
+        raise ValueError(f"Mot attendu: {texte!r}")
+    return texte
+
+
+def liste_entiers(texte):
+    """Liste d'entiers séparés par des virgules (tous les arguments de la commande)."""
+    return [entier(a.strip()) for a in texte.split(',')]
+
+
+def enregistrer_forme(*noms, arguments=None):
+    """
+    Décorateur : enregistre une commande de forme géométrique sous un ou plusieurs noms.
+
+    Args:
+        noms: Nom(s) de la commande (en minuscules)
+        arguments: Tuple de (convertisseur, défaut), défaut=REQUIS si obligatoire ;
+                   ou un convertisseur unique qui reçoit tout le texte entre parenthèses ;
+                   ou None : la commande ne prend pas d'arguments (ils sont ignorés).
+                   Un convertisseur lève ValueError si le texte est invalide.
+    """
+    def decorateur(fonction):
+        for nom in noms:
+            FORMES[nom] = (fonction, arguments)
+        return fonction
+    return decorateur
+
+
+def _convertir_arguments(texte, arguments):
+    """Convertit le texte entre parenthèses selon la spécification (ValueError si invalide)."""
+    if callable(arguments):
+        return [arguments(texte)]
+
+    valeurs = [a.strip() for a in texte.split(',')] if texte.strip() else []
+    if len(valeurs) > len(arguments):
+        raise ValueError("Trop d'arguments")
+
+    convertis = []
+    for i, (convertisseur, defaut) in enumerate(arguments):
+        if i < len(valeurs):
+            convertis.append(convertisseur(valeurs[i]))
+        elif defaut is REQUIS:
+            raise ValueError("Argument manquant")
+        else:
+            convertis.append(defaut)
+    return convertis
+
+
+@enregistrer_forme('cercle_trigo', arguments=((entier, REQUIS),))
+def _cercle_trigo(angle):
+    return forme_generator.cercle_trigonometrique(angle_deg=angle)
+
+
+@enregistrer_forme('cercle_trigo_complet')
+def _cercle_trigo_complet():
+    return forme_generator.cercle_trigo_complet_valeurs()
+
+
+@enregistrer_forme('cercle_trigo_angle', arguments=((entier, REQUIS),))
+def _cercle_trigo_angle(angle):
+    return forme_generator.cercle_trigo_angle_specifique(angle_deg=angle)
+
+
+@enregistrer_forme('cercle_trigo_multiple', arguments=liste_entiers)
+def _cercle_trigo_multiple(angles):
+    return forme_generator.cercle_trigo_multiple_angles(angles_deg=angles)
+
+
+@enregistrer_forme('triangle_rectangle', arguments=((entier, REQUIS), (mot, 'sin')))
+def _triangle_rectangle(angle, formule):
+    return forme_generator.triangle_rectangle(angle_deg=angle, type_formule=formule)
+
+
+@enregistrer_forme('triangle', arguments=((reel, REQUIS), (reel, REQUIS), (reel, REQUIS)))
+def _triangle(a, b, c):
+    return forme_generator.triangle_quelconque(a=a, b=b, c=c)
+
+
+@enregistrer_forme('polygone', arguments=((entier, REQUIS),))
+def _polygone(n):
+    return forme_generator.polygone_regulier(n_cotes=n)
+
+
+@enregistrer_forme('cube', arguments=((reel, 2),))
+def _cube(taille):
+    return forme_generator.cube_3d(taille=taille)
+
+
+@enregistrer_forme('pyramide', arguments=((reel, 2), (reel, 3)))
+def _pyramide(base, hauteur):
+    return forme_generator.pyramide_3d(base=base, hauteur=hauteur)
+
+
+@enregistrer_forme('vecteur', arguments=((reel_signe, REQUIS), (reel_signe, REQUIS)))
+def _vecteur(vx, vy):
+    return forme_generator.vecteur_2d(vecteurs=[(vx, vy, r"\vec{u}")])
+
+
+@enregistrer_forme('addition_vecteurs', arguments=((reel_signe, REQUIS),) * 4)
+def _addition_vecteurs(ux, uy, vx, vy):
+    return forme_generator.addition_vecteurs(u=(ux, uy), v=(vx, vy))
+
+
+@enregistrer_forme('repere_2d', 'repere2d')
+def _repere_2d():
+    return forme_generator.repere_2d()
+
+
+@enregistrer_forme('repere_3d', 'repere3d')
+def _repere_3d():
+    return forme_generator.repere_3d()
+
+
+def parse_forme_geometrique(ligne):
+    """
+    Parse une commande de forme géométrique et retourne le code TikZ.
+
+    Le nom de la commande est extrait une seule fois puis cherché dans FORMES ;
+    une ligne qui n'est pas une commande connue (fonction LaTeX) retourne None
+    immédiatement.
+
+    Formats supportés:
+    - cercle_trigo(angle) ou cercle_trigo(45)
+    - cercle_trigo_complet()
+    - cercle_trigo_multiple(30,45,60,90)
+    - cercle_trigo_angle(30)
+    - triangle_rectangle(angle, formule) ou triangle_rectangle(30, sin)
+    - triangle(a, b, c) ou triangle(3, 4, 5)
+    - polygone(n) ou polygone(6)
+    - cube() ou cube(taille)
+    - pyramide() ou pyramide(base, hauteur)
+    - vecteur(x, y) ou vecteur(2, 3)
+    - addition_vecteurs(ux, uy, vx, vy)
+    - repere_2d() ou repere_3d()
+    """
+    match = RE_COMMANDE.match(ligne.strip().lower())
+    if not match:
+        return None
+
+    forme = FORMES.get(match.group(1))
+    if forme is None:
+        return None
+
+    fonction, arguments = forme
+    if arguments is None:
+        valeurs = []
+    else:
+        # Commande avec arguments : parenthèses obligatoires, arguments valides
+        texte = match.group(2)
+        if texte is None:
+            return None
+        try:
+            valeurs = _convertir_arguments(texte, arguments)
+        except ValueError:
+            return None
+
+    with metriques.chronometrer(metriques.FORMES, commande=match.group(1)):
+        return fonction(*valeurs)
+
+
+def generate_single(ligne, sortie=None):
+    """
+    Génère le code TikZ pour une seule ligne d'entrée.
+
+    Args:
+        ligne: Ligne d'entrée
+        sortie: Budget de sortie (max_octets, max_primitives) de la requête, None :
+                celui du serveur (BUDGET_SORTIE)
+
+    Raises:
+        Exception: La génération de la ligne a échoué
+    """
+    ligne = ligne.strip()
+    if not ligne:
+        return None
+
+    with budget_sortie.imposer(BudgetSortie(*sortie) if sortie else None):
+        # Vérifier si c'est une forme géométrique
+        forme_result = parse_forme_geometrique(ligne)
+        if forme_result:
+            return forme_result
+
+        # Sinon, c'est une fonction mathématique (une erreur remonte à generer_resultat)
+        return get_graph_generator().generer_fonction(ligne)
+
+
+def normaliser_ligne(ligne):
+    """Normalise une ligne pour servir de clé de cache (espaces superflus retirés)."""
+    return ' '.join(ligne.split())
+
+
+def generer_resultat(ligne, sortie=None):
+    """
+    Génère une ligne (budget de sortie `sortie`, voir generate_single) et retourne
+    un résultat structuré.
+
+    Returns:
+        dict avec 'ligne', 'statut' ('ok' ou 'erreur'), 'resultat', 'erreur', 'duree_ms'
+    """
+    debut = time.perf_counter()
+    try:
+        resultat = generate_single(ligne, sortie)
+        statut, erreur = 'ok', None
+    except Exception as e:
+        resultat, statut, erreur = None, 'erreur', str(e)
+
+    return {
+        'ligne': ligne,
+        'statut': statut,
+        'resultat': resultat,
+        'erreur': erreur,
+        'duree_ms': (time.perf_counter() - debut) * 1000
+    }
+
+
+def prechauffer():
+    """
+    Préchauffe le processus courant : imports SymPy, parseur LaTeX ANTLR et
+    quelques expressions représentatives. Sans effet si déjà fait (y compris
+    dans un processus forké depuis un parent préchauffé).
+    Les mesures du préchauffage ne sont pas comptées dans les métriques.
+
+    Returns:
+        Durée du préchauffage en secondes (0 si déjà fait)
+    """
+    global _prechauffe
+    if _prechauffe:
+        return 0.0
+
+    debut = time.perf_counter()
+    with metriques.desactivees():
+        for expression in EXPRESSIONS_PRECHAUFFAGE:
+            try:
+                generate_single(expression)
+            except Exception:
+                pass
+    _prechauffe = True
+    return time.perf_counter() - debut
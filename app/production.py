@@ -0,0 +1,106 @@
+"""
+Serveur de production pour le Générateur de Graphiques TikZ
+Sert la même application Flask depuis des workers pré-forkés (gunicorn),
+chacun préchauffé juste après le fork.
+
+Usage:
+    python app/production.py --workers 4 --threads 2 --max-requests 1000
+
+Nécessite gunicorn (non disponible sous Windows : utiliser app/server.py).
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+
+# Ajouter le dossier parent au path pour importer les modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def options_par_defaut():
+    """Options du serveur, surchargeables par variables d'environnement."""
+    return {
+        'bind': os.environ.get('TIKZ_BIND', '127.0.0.1:5000'),
+        'workers': int(os.environ.get('TIKZ_WORKERS', multiprocessing.cpu_count())),
+        'threads': int(os.environ.get('TIKZ_THREADS', 1)),
+        'max_requests': int(os.environ.get('TIKZ_MAX_REQUESTS', 1000)),
+        'max_requests_jitter': int(os.environ.get('TIKZ_MAX_REQUESTS_JITTER', 50)),
+        'timeout': int(os.environ.get('TIKZ_TIMEOUT', 120)),
+    }
+
+
+def post_fork(server, worker):
+    """Hook gunicorn : préchauffe chaque worker juste après le fork."""
+    from app.generation import prechauffer
+    duree = prechauffer()
+    server.log.info(f"Worker {worker.pid} préchauffé en {duree:.2f} s")
+
+
+def creer_application(options):
+    """Crée l'application gunicorn qui sert l'app Flask avec les options données."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise RuntimeError(
+            "gunicorn n'est pas installé (pip install gunicorn). "
+            "Sous Windows, utilisez le serveur de développement: python app/server.py"
+        )
+
+    from app.server import app
+
+    class ApplicationProduction(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for cle, valeur in self.options.items():
+                self.cfg.set(cle, valeur)
+
+        def load(self):
+            return self.application
+
+    options = dict(options, post_fork=post_fork)
+    return ApplicationProduction(app, options)
+
+
+def main(argv=None):
+    defauts = options_par_defaut()
+
+    parser = argparse.ArgumentParser(description="Serveur de production (workers pré-forkés et préchauffés)")
+    parser.add_argument('--bind', default=defauts['bind'], help="Adresse d'écoute (hôte:port)")
+    parser.add_argument('--workers', type=int, default=defauts['workers'], help="Nombre de processus workers")
+    parser.add_argument('--threads', type=int, default=defauts['threads'], help="Threads par worker")
+    parser.add_argument('--max-requests', type=int, default=defauts['max_requests'],
+                        help="Requêtes servies avant recyclage d'un worker (0: jamais)")
+    parser.add_argument('--max-requests-jitter', type=int, default=defauts['max_requests_jitter'],
+                        help="Variation aléatoire de --max-requests")
+    parser.add_argument('--timeout', type=int, default=defauts['timeout'],
+                        help="Délai (s) avant qu'un worker silencieux soit tué")
+    args = parser.parse_args(argv)
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests_jitter,
+        'timeout': args.timeout,
+    }
+
+    print("=" * 60)
+    print("  GÉNÉRATEUR DE GRAPHIQUES TIKZ")
+    print("  Serveur de production")
+    print("=" * 60)
+    print()
+    print(f"URL: http://{args.bind}")
+    print(f"Workers: {args.workers} x {args.threads} thread(s), recyclage après {args.max_requests} requêtes")
+    print("=" * 60)
+
+    creer_application(options).run()
+
+
+if __name__ == '__main__':
+    main()
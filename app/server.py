@@ -5,146 +5,92 @@ Lance une interface web pour générer des graphiques mathématiques
 
 import sys
 import os
-import re
-import webbrowser
+import json
+import math
 from threading import Timer
 
 # Ajouter le dossier parent au path pour importer les modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 
 # Importer les générateurs
-from generateur_graphiques import TikzGraphGenerator
-from generateur_formes_geometriques import GenerateurFormesGeometriques
+from app.generation import forme_generator, parse_forme_geometrique, generate_single
+from app.generation import MAX_OCTETS_SORTIE, MAX_PRIMITIVES_SORTIE
+from app.execution import ExecuteurLignes
+from cache_lru import CacheLRU
+import metriques
 
 app = Flask(__name__)
 
-# Initialiser les générateurs
-graph_generator = TikzGraphGenerator()
-forme_generator = GenerateurFormesGeometriques()
+# Configuration (surchargeable par variables d'environnement)
+app.config['CACHE_MAX_ENTREES'] = int(os.environ.get('TIKZ_CACHE_MAX_ENTREES', 512))
+app.config['CACHE_MAX_OCTETS'] = int(os.environ.get('TIKZ_CACHE_MAX_OCTETS', 32 * 1024 * 1024))
+app.config['EXECUTION_MODE'] = os.environ.get('TIKZ_EXECUTION_MODE', 'sequentiel')
+app.config['EXECUTION_WORKERS'] = int(os.environ.get('TIKZ_EXECUTION_WORKERS', 0)) or None
+app.config['BUDGET_LIGNE_S'] = float(os.environ.get('TIKZ_BUDGET_LIGNE_S', 0)) or None
 
+# Cache LRU des résultats par ligne
+cache_resultats = CacheLRU(max_entrees=app.config['CACHE_MAX_ENTREES'],
+                           max_octets=app.config['CACHE_MAX_OCTETS'])
 
-def parse_forme_geometrique(ligne):
+# Exécution des lignes (séquentielle ou pool de processus)
+executeur = ExecuteurLignes(mode=app.config['EXECUTION_MODE'],
+                            workers=app.config['EXECUTION_WORKERS'],
+                            cache=cache_resultats,
+                            budget=app.config['BUDGET_LIGNE_S'])
+
+
+def lire_budget(data):
+    """Lit le budget de temps par ligne d'une requête (None: budget du serveur)."""
+    budget = data.get('budget')
+    if budget is None:
+        return None
+    budget = float(budget)
+    # NaN et infini refusés : l'échéance d'une ligne doit être un instant réel
+    if not math.isfinite(budget) or budget <= 0:
+        raise ValueError(f"Budget invalide: {budget} (doit être fini et > 0)")
+    return budget
+
+
+def _lire_entier_positif(data, cle):
+    valeur = data.get(cle)
+    if valeur is None:
+        return None
+    if isinstance(valeur, bool) or isinstance(valeur, float) and not valeur.is_integer():
+        raise ValueError(f"{cle} invalide: {valeur} (entier > 0 attendu)")
+    valeur = int(valeur)
+    if valeur <= 0:
+        raise ValueError(f"{cle} invalide: {valeur} (entier > 0 attendu)")
+    return valeur
+
+
+def lire_sortie(data, defaut=None):
     """
-    Parse une commande de forme géométrique et retourne le code TikZ.
-
-    Formats supportés:
-    - cercle_trigo(angle) ou cercle_trigo(45)
-    - cercle_trigo_complet()
-    - cercle_trigo_multiple(30,45,60,90)
-    - cercle_trigo_angle(30)
-    - triangle_rectangle(angle, formule) ou triangle_rectangle(30, sin)
-    - triangle(a, b, c) ou triangle(3, 4, 5)
-    - polygone(n) ou polygone(6)
-    - cube() ou cube(taille)
-    - pyramide() ou pyramide(base, hauteur)
-    - vecteur(x, y) ou vecteur(2, 3)
-    - addition_vecteurs(ux, uy, vx, vy)
-    - repere_2d() ou repere_3d()
+    Lit le budget de sortie par ligne d'une requête ('max_octets', 'max_primitives').
+
+    Args:
+        data: Objet de la requête (ou options d'un élément de lot)
+        defaut: Budget de sortie du niveau englobant (lot), None : celui du serveur
+
+    Returns:
+        (max_octets, max_primitives), chaque champ absent pris de defaut puis du
+        serveur ; None s'il est égal au budget du serveur (même clé de cache)
     """
-    ligne = ligne.strip().lower()
-
-    # Cercle trigonométrique simple
-    match = re.match(r'cercle_trigo\s*\(\s*(\d+)\s*\)', ligne)
-    if match:
-        angle = int(match.group(1))
-        return forme_generator.cercle_trigonometrique(angle_deg=angle)
-
-    # Cercle trigonométrique complet
-    if 'cercle_trigo_complet' in ligne:
-        return forme_generator.cercle_trigo_complet_valeurs()
-
-    # Cercle trigonométrique avec angle spécifique et valeurs
-    match = re.match(r'cercle_trigo_angle\s*\(\s*(\d+)\s*\)', ligne)
-    if match:
-        angle = int(match.group(1))
-        return forme_generator.cercle_trigo_angle_specifique(angle_deg=angle)
-
-    # Cercle trigonométrique multiple angles
-    match = re.match(r'cercle_trigo_multiple\s*\(\s*([\d,\s]+)\s*\)', ligne)
-    if match:
-        angles_str = match.group(1)
-        angles = [int(a.strip()) for a in angles_str.split(',')]
-        return forme_generator.cercle_trigo_multiple_angles(angles_deg=angles)
-
-    # Triangle rectangle
-    match = re.match(r'triangle_rectangle\s*\(\s*(\d+)\s*(?:,\s*(\w+))?\s*\)', ligne)
-    if match:
-        angle = int(match.group(1))
-        formule = match.group(2) if match.group(2) else 'sin'
-        return forme_generator.triangle_rectangle(angle_deg=angle, type_formule=formule)
-
-    # Triangle quelconque
-    match = re.match(r'triangle\s*\(\s*(\d+(?:\.\d+)?)\s*,\s*(\d+(?:\.\d+)?)\s*,\s*(\d+(?:\.\d+)?)\s*\)', ligne)
-    if match:
-        a = float(match.group(1))
-        b = float(match.group(2))
-        c = float(match.group(3))
-        return forme_generator.triangle_quelconque(a=a, b=b, c=c)
-
-    # Polygone régulier
-    match = re.match(r'polygone\s*\(\s*(\d+)\s*\)', ligne)
-    if match:
-        n = int(match.group(1))
-        return forme_generator.polygone_regulier(n_cotes=n)
-
-    # Cube
-    match = re.match(r'cube\s*\(\s*(\d+(?:\.\d+)?)?\s*\)', ligne)
-    if match:
-        taille = float(match.group(1)) if match.group(1) else 2
-        return forme_generator.cube_3d(taille=taille)
-
-    # Pyramide
-    match = re.match(r'pyramide\s*\(\s*(?:(\d+(?:\.\d+)?)\s*(?:,\s*(\d+(?:\.\d+)?))?)?\s*\)', ligne)
-    if match:
-        base = float(match.group(1)) if match.group(1) else 2
-        hauteur = float(match.group(2)) if match.group(2) else 3
-        return forme_generator.pyramide_3d(base=base, hauteur=hauteur)
-
-    # Vecteur 2D
-    match = re.match(r'vecteur\s*\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\)', ligne)
-    if match:
-        vx = float(match.group(1))
-        vy = float(match.group(2))
-        return forme_generator.vecteur_2d(vecteurs=[(vx, vy, r"\vec{u}")])
-
-    # Addition de vecteurs
-    match = re.match(r'addition_vecteurs\s*\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\)', ligne)
-    if match:
-        ux = float(match.group(1))
-        uy = float(match.group(2))
-        vx = float(match.group(3))
-        vy = float(match.group(4))
-        return forme_generator.addition_vecteurs(u=(ux, uy), v=(vx, vy))
-
-    # Repère 2D
-    if 'repere_2d' in ligne or 'repere2d' in ligne:
-        return forme_generator.repere_2d()
-
-    # Repère 3D
-    if 'repere_3d' in ligne or 'repere3d' in ligne:
-        return forme_generator.repere_3d()
-
-    return None
-
-
-def generate_single(ligne):
-    """Génère le code TikZ pour une seule ligne d'entrée."""
-    ligne = ligne.strip()
-    if not ligne:
-        return None
+    octets_defaut, primitives_defaut = defaut or (MAX_OCTETS_SORTIE, MAX_PRIMITIVES_SORTIE)
+    max_octets = _lire_entier_positif(data, 'max_octets')
+    max_primitives = _lire_entier_positif(data, 'max_primitives')
+    sortie = (octets_defaut if max_octets is None else max_octets,
+              primitives_defaut if max_primitives is None else max_primitives)
+    return None if sortie == (MAX_OCTETS_SORTIE, MAX_PRIMITIVES_SORTIE) else sortie
 
-    # Vérifier si c'est une forme géométrique
-    forme_result = parse_forme_geometrique(ligne)
-    if forme_result:
-        return forme_result
 
-    # Sinon, c'est une fonction mathématique
-    try:
-        return graph_generator.generer_fonction(ligne)
-    except Exception as e:
-        return f"% Erreur pour '{ligne}': {str(e)}"
+def separer_lignes(functions_text):
+    """Découpe le texte saisi en lignes utiles (vides et commentaires ignorés)."""
+    lignes = functions_text.strip().split('\n')
+    lignes = [ligne.strip() for ligne in lignes]
+    return [ligne for ligne in lignes
+            if ligne and not ligne.startswith('#') and not ligne.startswith('//')]
 
 
 @app.route('/')
@@ -165,21 +111,26 @@ def generate():
         if not functions_text:
             return jsonify({'success': False, 'error': 'Aucune fonction fournie'})
 
+        try:
+            budget = lire_budget(data)
+            sortie = lire_sortie(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)})
+
         # Séparer les lignes
-        lignes = functions_text.strip().split('\n')
+        lignes = separer_lignes(functions_text)
 
         # Générer chaque graphique
         results = []
         errors = []
-        for ligne in lignes:
-            ligne = ligne.strip()
-            if ligne and not ligne.startswith('#') and not ligne.startswith('//'):
-                try:
-                    result = generate_single(ligne)
-                    if result:
-                        results.append(f"% === {ligne} ===\n{result}")
-                except Exception as e:
-                    errors.append(f"% Erreur pour '{ligne}': {str(e)}")
+        for ligne, res in zip(lignes, executeur.executer(lignes, budget=budget, sortie=sortie)):
+            if res['statut'] == 'ok':
+                if res['resultat']:
+                    results.append(f"% === {ligne} ===\n{res['resultat']}")
+            elif res['statut'] == 'timeout':
+                errors.append(f"% Temps dépassé pour '{ligne}': {res['erreur']}")
+            else:
+                errors.append(f"% Erreur pour '{ligne}': {res['erreur']}")
 
         if results:
             final_result = '\n\n'.join(results)
@@ -196,8 +147,168 @@ def generate():
         return jsonify({'success': False, 'error': f'{str(e)}\n{traceback.format_exc()}'})
 
 
+@app.route('/generate/stream', methods=['POST'])
+def generate_stream():
+    """
+    Variante de /generate qui diffuse les résultats en NDJSON dès qu'ils sont prêts.
+
+    Chaque ligne de la réponse est un objet JSON:
+    {"index", "ligne", "statut", "resultat", "erreur", "duree_ms", "cache"},
+    suivi d'un objet final {"fin": true, "total": n}.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'Pas de données reçues'})
+
+    functions_text = data.get('functions', '')
+    if not functions_text:
+        return jsonify({'success': False, 'error': 'Aucune fonction fournie'})
+
+    try:
+        budget = lire_budget(data)
+        sortie = lire_sortie(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+    lignes = separer_lignes(functions_text)
+    if not lignes:
+        return jsonify({'success': False, 'error': 'Aucune fonction valide trouvée'})
+
+    def diffuser():
+        for index, res in executeur.iterer(lignes, budget=budget, sortie=sortie):
+            evenement = dict(res, index=index, ligne=lignes[index])
+            yield json.dumps(evenement, ensure_ascii=False) + '\n'
+        yield json.dumps({'fin': True, 'total': len(lignes)}) + '\n'
+
+    return Response(stream_with_context(diffuser()), mimetype='application/x-ndjson')
+
+
+# Options acceptées pour chaque élément de /api/batch
+OPTIONS_BATCH = ('budget', 'max_octets', 'max_primitives')
+
+
+def lire_element_batch(element, sortie=None):
+    """
+    Valide un élément {id, input, options} de /api/batch.
+
+    Args:
+        element: Élément du lot
+        sortie: Budget de sortie du lot, complété champ par champ par les options
+
+    Returns:
+        (id, ligne, budget, sortie)
+
+    Raises:
+        ValueError: élément mal formé ou option inconnue
+    """
+    if not isinstance(element, dict):
+        raise ValueError("Élément invalide (objet attendu)")
+
+    ligne = element.get('input')
+    if not isinstance(ligne, str) or not ligne.strip():
+        raise ValueError("Champ 'input' manquant ou vide")
+
+    options = element.get('options') or {}
+    if not isinstance(options, dict):
+        raise ValueError("Champ 'options' invalide (objet attendu)")
+    inconnues = [cle for cle in options if cle not in OPTIONS_BATCH]
+    if inconnues:
+        raise ValueError(f"Option(s) inconnue(s): {', '.join(inconnues)}")
+
+    return element.get('id'), ligne, lire_budget(options), lire_sortie(options, sortie)
+
+
+def reponse_batch(identifiant, res):
+    """Élément de réponse de /api/batch à partir d'un résultat de l'exécuteur."""
+    return {
+        'id': identifiant,
+        'status': res['statut'],
+        'tikz': res['resultat'],
+        'error': res['erreur'],
+        'elapsed_ms': round(res['duree_ms'], 3),
+        'cache_hit': res.get('cache', False)
+    }
+
+
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    """
+    Génère un lot d'expressions indépendantes.
+
+    Corps: liste de {"id", "input", "options"} (ou {"items": [...], "budget": s,
+    "max_octets": n, "max_primitives": n}).
+    Options par élément: "budget" (secondes), "max_octets" et "max_primitives"
+    (budget de sortie, voir budget_sortie.py).
+    Réponse: {"success": true, "results": [{"id", "status", "tikz", "error",
+    "elapsed_ms", "cache_hit"}, ...]} dans l'ordre des éléments.
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        elements = data.get('items')
+        try:
+            budget = lire_budget(data)
+            sortie = lire_sortie(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)})
+    else:
+        elements, budget, sortie = data, None, None
+
+    if not isinstance(elements, list) or not elements:
+        return jsonify({'success': False, 'error': "Liste d'éléments attendue"})
+
+    # Les éléments invalides reçoivent leur erreur sans bloquer le reste du lot
+    reponses = [None] * len(elements)
+    valides = []  # (position, id, ligne, budget, sortie)
+    for position, element in enumerate(elements):
+        try:
+            valides.append((position, *lire_element_batch(element, sortie)))
+        except (TypeError, ValueError) as e:
+            identifiant = element.get('id') if isinstance(element, dict) else None
+            reponses[position] = {
+                'id': identifiant,
+                'status': 'erreur',
+                'tikz': None,
+                'error': str(e),
+                'elapsed_ms': 0.0,
+                'cache_hit': False
+            }
+
+    lignes = [ligne for _, _, ligne, _, _ in valides]
+    budgets = [budget_element for _, _, _, budget_element, _ in valides]
+    # Budgets de sortie déjà complétés par celui du lot (None : budget du serveur)
+    sorties = [sortie_element for _, _, _, _, sortie_element in valides]
+    for (position, identifiant, *_), res in zip(valides, executeur.executer(lignes, budget=budget, budgets=budgets,
+                                                                            sorties=sorties)):
+        reponses[position] = reponse_batch(identifiant, res)
+
+    return jsonify({'success': True, 'results': reponses})
+
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Statistiques du cache des résultats."""
+    return jsonify(cache_resultats.stats())
+
+
+@app.route('/metrics')
+def metrics():
+    """
+    Métriques au format texte Prometheus : durée par étape du pipeline,
+    appels solve/limit, formes par commande, lignes, cache, timeouts et erreurs.
+
+    Avec plusieurs processus serveur (app/production.py), chaque processus
+    expose ses propres compteurs.
+    """
+    stats = cache_resultats.stats()
+    texte = metriques.REGISTRE.exporter()
+    texte += metriques.formater_jauge('tikz_cache_entrees', "Entrées du cache des résultats", stats['entrees'])
+    texte += metriques.formater_jauge('tikz_cache_octets', "Taille du cache des résultats (octets)", stats['octets'])
+    return Response(texte, mimetype='text/plain; version=0.0.4')
+
+
 def open_browser():
     """Ouvre le navigateur après un court délai."""
+    import webbrowser
     webbrowser.open('http://127.0.0.1:5000')
 
 
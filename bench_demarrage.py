@@ -0,0 +1,129 @@
+"""
+Benchmark du démarrage à froid (imports) du serveur et de la CLI.
+
+Chaque scénario est exécuté dans un processus Python neuf avec `-X importtime`.
+On rapporte le temps cumulé des imports, les modules les plus coûteux et la
+durée totale, puis on vérifie le budget de chaque scénario.
+
+Usage:
+    python bench_demarrage.py [--top 8] [--repetitions 3]
+"""
+
+import sys
+import os
+import re
+import argparse
+import subprocess
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+# (nom, code exécuté, budget en ms, modules qui ne doivent PAS être importés)
+SCENARIOS = [
+    ("Import formes géométriques",
+     "import generateur_formes_geometriques",
+     150, ["sympy", "numpy"]),
+    ("Import serveur (app.server)",
+     "import app.server",
+     600, ["sympy"]),
+    ("Requête forme seule (cercle_trigo, cube)",
+     "from app.generation import generate_single\n"
+     "generate_single('cercle_trigo(45)')\n"
+     "generate_single('cube()')",
+     200, ["sympy", "numpy"]),
+    ("Import générateur de graphiques (CLI)",
+     "import generateur_graphiques",
+     1500, []),
+    ("Requête fonction (x^2)",
+     "from app.generation import generate_single\n"
+     "generate_single('x^2')",
+     3000, []),
+]
+
+RE_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def executer_scenario(code):
+    """
+    Exécute le code dans un processus neuf avec -X importtime.
+
+    Returns:
+        (durée totale en ms, liste de (module, cumulé µs, profondeur), modules chargés)
+    """
+    sonde = (
+        "import sys, time\n"
+        "_debut = time.perf_counter()\n"
+        f"{code}\n"
+        "print('DUREE_MS', (time.perf_counter() - _debut) * 1000)\n"
+        "print('MODULES', ' '.join(sorted(m for m in sys.modules if '.' not in m)))\n"
+    )
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", sonde],
+                          cwd=RACINE, capture_output=True, text=True, encoding='utf-8')
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    imports = []
+    for ligne in proc.stderr.splitlines():
+        match = RE_IMPORTTIME.match(ligne)
+        if match:
+            cumule = int(match.group(2))
+            profondeur = len(match.group(3)) // 2
+            imports.append((match.group(4), cumule, profondeur))
+
+    duree_ms = 0.0
+    modules = set()
+    for ligne in proc.stdout.splitlines():
+        if ligne.startswith('DUREE_MS'):
+            duree_ms = float(ligne.split()[1])
+        elif ligne.startswith('MODULES'):
+            modules = set(ligne.split()[1:])
+
+    return duree_ms, imports, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid")
+    parser.add_argument('--top', type=int, default=8, help="Nombre de modules les plus coûteux affichés")
+    parser.add_argument('--repetitions', type=int, default=3, help="Répétitions par scénario (on garde la meilleure)")
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("BENCHMARK DU DÉMARRAGE À FROID")
+    print("=" * 80)
+
+    # Modules chargés par l'interpréteur lui-même (exclus des rapports)
+    _, imports_base, _ = executer_scenario("pass")
+    demarrage = {module for module, _, _ in imports_base}
+
+    tout_ok = True
+    for nom, code, budget_ms, interdits in SCENARIOS:
+        mesures = [executer_scenario(code) for _ in range(args.repetitions)]
+        duree_ms, imports, modules = min(mesures, key=lambda m: m[0])
+        imports = [i for i in imports if i[0] not in demarrage]
+
+        # Total : imports de premier niveau ; détail : deux premiers niveaux, par coût cumulé
+        total_imports_ms = sum(i[1] for i in imports if i[2] == 0) / 1000
+        premiers = sorted((i for i in imports if i[2] <= 1), key=lambda i: -i[1])
+
+        print(f"\n📦 {nom}")
+        print(f"   Durée totale : {duree_ms:8.1f} ms (budget {budget_ms} ms)")
+        print(f"   Imports      : {total_imports_ms:8.1f} ms")
+        for module, cumule, profondeur in premiers[:args.top]:
+            print(f"     {cumule / 1000:8.1f} ms  {'  ' * profondeur}{module}")
+
+        ok = duree_ms <= budget_ms
+        charges = [m for m in interdits if m in modules]
+        if charges:
+            ok = False
+            print(f"   ❌ Modules importés à tort : {', '.join(charges)}")
+        print(f"   {'✅' if ok else '❌'} {'Dans le budget' if ok else 'Hors budget'}")
+        tout_ok = tout_ok and ok
+
+    print("\n" + "=" * 80)
+    print("✅ TOUS LES BUDGETS SONT RESPECTÉS" if tout_ok else "❌ CERTAINS BUDGETS SONT DÉPASSÉS")
+    print("=" * 80)
+    return 0 if tout_ok else 1
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Budget de temps d'une analyse et palier de calcul de chaque champ du résultat.
+
+L'analyse fait d'abord les heuristiques numériques (échantillonnage, recherche
+numérique de racines, estimation de décroissance), puis les étapes symboliques
+(solveset, solve, limit) tant que le budget n'est pas épuisé. Chaque champ du
+résultat est marqué du palier qui l'a produit dans un dict 'tiers' :
+'numeric', 'symbolic' ou 'skipped' (étape non faite, faute de budget).
+
+Un appel SymPy commencé n'est pas interrompu : le budget décide seulement de
+lancer ou non les étapes suivantes. La limite dure (processus tué) reste le
+budget par ligne de app.execution.
+"""
+
+import math
+import time
+
+# Paliers de calcul
+NUMERIQUE = 'numeric'
+SYMBOLIQUE = 'symbolic'
+IGNORE = 'skipped'
+
+
+class BudgetCalcul:
+    """Temps restant d'une analyse (illimité si delai est None)."""
+
+    def __init__(self, delai=None):
+        """
+        Args:
+            delai: Temps alloué à l'analyse (secondes), None : illimité
+        """
+        self.delai = delai
+        self.debut = time.monotonic()
+
+    @classmethod
+    def depuis(cls, budget):
+        """BudgetCalcul existant (partagé par les étapes d'une analyse) ou nouveau budget de `budget` secondes."""
+        return budget if isinstance(budget, cls) else cls(budget)
+
+    def restant(self):
+        if self.delai is None:
+            return math.inf
+        return self.delai - (time.monotonic() - self.debut)
+
+    def epuise(self):
+        return self.restant() <= 0
+
+    def calculer(self, paliers, champ, palier, calcul, defaut=None):
+        """
+        Exécute calcul() si le budget n'est pas épuisé et note `palier` pour `champ`
+        dans `paliers` ; sinon note 'skipped' et retourne `defaut`.
+        """
+        if self.epuise():
+            paliers[champ] = IGNORE
+            return defaut
+        paliers[champ] = palier
+        return calcul()
+
+
+def palier_global(paliers):
+    """Palier d'un résultat combinant plusieurs étapes : le moins complet l'emporte."""
+    paliers = list(paliers)
+    if IGNORE in paliers:
+        return IGNORE
+    if SYMBOLIQUE in paliers:
+        return SYMBOLIQUE
+    return NUMERIQUE
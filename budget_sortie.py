@@ -0,0 +1,221 @@
+"""
+Budget de taille de la sortie TikZ d'une ligne : octets et primitives.
+
+Le rendu TikZJax (dans le navigateur) croît avec la taille du code et le nombre de
+primitives à tracer : commandes \\draw, \\fill, \\node..., points des \\addplot
+(données en coordinates/table, ou échantillons que pgfplots évalue : samples=N,
+N² pour une surface).
+
+Les générateurs de taille variable décrivent leurs réglages de résolution par
+paliers, du plus fin au plus grossier (échantillons, chiffres, sommets...). Le
+premier palier dont la sortie tient dans le budget est retenu, et les réglages
+dégradés sont signalés par un commentaire TikZ en fin de figure.
+
+Le budget est celui du générateur (self.budget_sortie), sauf pendant un bloc
+imposer(budget) : celui d'une requête, pour les générations du fil d'exécution.
+"""
+
+import functools
+import math
+import re
+import threading
+from contextlib import contextmanager
+
+from metriques import SORTIES_DEGRADEES
+
+# Budget par défaut d'une ligne
+MAX_OCTETS = 64 * 1024
+MAX_PRIMITIVES = 2500
+
+# Échantillons de pgfplots sans option samples
+SAMPLES_PGFPLOTS = 25
+
+# Budget imposé aux générations du fil d'exécution (voir imposer)
+_impose = threading.local()
+
+_RE_COMMANDE = re.compile(r'\\(?:draw|fill|filldraw|shade|shadedraw|node|path|coordinate)\b')
+_RE_ADDPLOT = re.compile(r'\\addplot(3?)\b')
+_RE_SAMPLES = re.compile(r'\bsamples\s*=\s*(\d+)')
+_RE_AXE = re.compile(r'\\begin\{axis\}')
+
+
+def _fermante(texte, debut, ouvrante, fermante):
+    """Indice du délimiteur fermant celui ouvert en texte[debut] (len(texte) si absent)."""
+    profondeur = 0
+    for i in range(debut, len(texte)):
+        if texte[i] == ouvrante:
+            profondeur += 1
+        elif texte[i] == fermante:
+            profondeur -= 1
+            if profondeur == 0:
+                return i
+    return len(texte)
+
+
+def _points_addplot(code, debut, surface):
+    """Points tracés par le \\addplot qui commence en code[debut]."""
+    i = debut
+    options = ""
+    while i < len(code) and code[i].isspace():
+        i += 1
+    if i < len(code) and code[i] == '[':
+        fin = _fermante(code, i, '[', ']')
+        options, i = code[i:fin], fin + 1
+    while i < len(code) and code[i].isspace():
+        i += 1
+
+    if code.startswith('coordinates', i) or code.startswith('table', i):
+        accolade = code.find('{', i)
+        donnees = code[accolade + 1:_fermante(code, accolade, '{', '}')] if accolade >= 0 else ""
+        if code.startswith('coordinates', i):
+            return donnees.count('(')
+        lignes = [ligne for ligne in donnees.splitlines() if ligne.strip()]
+        return max(0, len(lignes) - 1)  # en-tête exclu
+
+    # Expression évaluée par pgfplots : samples du \addplot, sinon de l'axe
+    samples = _RE_SAMPLES.search(options)
+    if samples is None:
+        axe = [m.end() for m in _RE_AXE.finditer(code, 0, debut)]
+        samples = _RE_SAMPLES.search(code, axe[-1] if axe else 0, debut)
+    n = int(samples.group(1)) if samples else SAMPLES_PGFPLOTS
+    return n * n if surface else n
+
+
+def compter_primitives(code):
+    """Nombre de primitives à tracer : commandes TikZ et points des \\addplot."""
+    primitives = len(_RE_COMMANDE.findall(code))
+    for addplot in _RE_ADDPLOT.finditer(code):
+        primitives += _points_addplot(code, addplot.end(), surface=bool(addplot.group(1)))
+    return primitives
+
+
+def annoter(code, commentaire):
+    """Ajoute une ligne de commentaire TikZ en fin de figure (avant la clôture ``` du bloc)."""
+    if code.rstrip().endswith("```"):
+        fin = code.rstrip()
+        return f"{fin[:-3]}{commentaire}\n```"
+    return f"{code}\n{commentaire}"
+
+
+def nombre_tikz(valeur, chiffres):
+    """Nombre d'une donnée \\addplot (coordinates, table) : `chiffres` significatifs, nan si non fini."""
+    if not math.isfinite(valeur):
+        return "nan"
+    return f"{valeur:.{chiffres}g}"
+
+
+def _valeur(valeur):
+    if isinstance(valeur, bool):
+        return "oui" if valeur else "non"
+    return str(valeur)
+
+
+class BudgetSortie:
+    """Taille maximale (octets, primitives) de la sortie TikZ d'une ligne."""
+
+    def __init__(self, max_octets=MAX_OCTETS, max_primitives=MAX_PRIMITIVES):
+        """
+        Args:
+            max_octets: Octets au plus (UTF-8), None : illimité
+            max_primitives: Primitives au plus (voir compter_primitives), None : illimité
+        """
+        self.max_octets = max_octets
+        self.max_primitives = max_primitives
+
+    def mesurer(self, code):
+        """(octets, primitives) du code."""
+        return len(code.encode('utf-8')), compter_primitives(code)
+
+    def respecte(self, code):
+        octets, primitives = self.mesurer(code)
+        return ((self.max_octets is None or octets <= self.max_octets)
+                and (self.max_primitives is None or primitives <= self.max_primitives))
+
+    def _limites(self):
+        limites = []
+        if self.max_octets is not None:
+            limites.append(f"{self.max_octets} octets")
+        if self.max_primitives is not None:
+            limites.append(f"{self.max_primitives} primitives")
+        return ", ".join(limites)
+
+    def ajuster(self, generer, paliers, nom='generateur', reference=None):
+        """
+        Sortie du premier palier qui tient dans le budget.
+
+        Args:
+            generer: Fonction des réglages (arguments nommés) qui retourne le code TikZ
+            paliers: Itérable de dicts de réglages, du plus fin au plus grossier ; le
+                     premier est la référence, les écarts à ses valeurs sont signalés
+            nom: Générateur (label des métriques)
+            reference: Réglages demandés, à fournir quand les paliers trop coûteux pour
+                       être générés sont omis (par défaut le premier palier)
+
+        Returns:
+            Code TikZ, suivi d'un commentaire si des réglages ont été dégradés (ou si
+            même le dernier palier dépasse le budget)
+        """
+        code = None
+        degradations = []
+        for reglages in paliers:
+            if reference is None:
+                reference = reglages
+            code = generer(**reglages)
+            degradations = [f"{cle} {_valeur(reference.get(cle))}→{_valeur(valeur)}"
+                            for cle, valeur in reglages.items() if valeur != reference.get(cle)]
+            if self.respecte(code):
+                break
+        else:
+            if code is None:
+                return generer()
+            octets, primitives = self.mesurer(code)
+            SORTIES_DEGRADEES.incrementer(generateur=nom)
+            return annoter(code, f"% Budget de sortie ({self._limites()}) dépassé : {octets} octets, "
+                                 f"{primitives} primitives" + (f" malgré {', '.join(degradations)}" if degradations else ""))
+
+        if not degradations:
+            return code
+        SORTIES_DEGRADEES.incrementer(generateur=nom)
+        return annoter(code, f"% Budget de sortie ({self._limites()}) : {', '.join(degradations)}")
+
+
+@contextmanager
+def imposer(budget):
+    """
+    Impose `budget` (BudgetSortie) aux générations du fil d'exécution pendant le bloc,
+    à la place de celui des générateurs (None : aucun changement).
+    """
+    precedent = getattr(_impose, 'budget', None)
+    _impose.budget = budget if budget is not None else precedent
+    try:
+        yield
+    finally:
+        _impose.budget = precedent
+
+
+def budget_actif(defaut):
+    """Budget imposé au fil d'exécution (voir imposer), sinon `defaut`."""
+    budget = getattr(_impose, 'budget', None)
+    return budget if budget is not None else defaut
+
+
+def sous_budget(paliers):
+    """
+    Décorateur de méthode de générateur : la sortie respecte le budget imposé (voir
+    imposer), sinon self.budget_sortie (aucun contrôle s'il est None).
+
+    Args:
+        paliers: Liste de dicts de réglages (arguments nommés de la méthode), ou
+                 fonction (self, *args, **kwargs) qui retourne ces paliers
+    """
+    def decorateur(methode):
+        @functools.wraps(methode)
+        def enveloppe(self, *args, **kwargs):
+            budget = budget_actif(getattr(self, 'budget_sortie', None))
+            if budget is None:
+                return methode(self, *args, **kwargs)
+            liste = paliers(self, *args, **kwargs) if callable(paliers) else paliers
+            return budget.ajuster(lambda **reglages: methode(self, *args, **kwargs, **reglages),
+                                  liste, nom=methode.__name__)
+        return enveloppe
+    return decorateur
@@ -0,0 +1,104 @@
+"""
+Cache LRU borné en nombre d'entrées et en octets.
+Utilisé pour mémoriser les résultats coûteux (génération TikZ, calculs SymPy).
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def taille_par_defaut(cle, valeur):
+    """Estime la taille mémoire (en octets) d'une entrée du cache."""
+    taille = 0
+    for objet in (cle, valeur):
+        if isinstance(objet, str):
+            taille += len(objet.encode('utf-8'))
+        else:
+            taille += sys.getsizeof(objet)
+    return taille
+
+
+class CacheLRU:
+    """Cache LRU thread-safe avec limites de taille et compteurs de statistiques."""
+
+    def __init__(self, max_entrees=512, max_octets=32 * 1024 * 1024, mesurer=taille_par_defaut):
+        """
+        Args:
+            max_entrees: Nombre maximal d'entrées conservées
+            max_octets: Taille totale maximale estimée (octets)
+            mesurer: Fonction (cle, valeur) -> taille en octets
+        """
+        self.max_entrees = max_entrees
+        self.max_octets = max_octets
+        self.mesurer = mesurer
+
+        self._entrees = OrderedDict()
+        self._octets = 0
+        self._verrou = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cle, defaut=None):
+        """Retourne la valeur associée à la clé (et la marque comme récente)."""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                self.misses += 1
+                return defaut
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+            return entree[0]
+
+    def put(self, cle, valeur):
+        """Ajoute ou remplace une entrée, puis évince les plus anciennes si nécessaire."""
+        taille = self.mesurer(cle, valeur)
+
+        # Une entrée plus grosse que le cache entier n'est jamais conservée
+        if taille > self.max_octets:
+            return
+
+        with self._verrou:
+            ancienne = self._entrees.pop(cle, None)
+            if ancienne is not None:
+                self._octets -= ancienne[1]
+
+            self._entrees[cle] = (valeur, taille)
+            self._octets += taille
+
+            while self._entrees and (len(self._entrees) > self.max_entrees
+                                     or self._octets > self.max_octets):
+                _, (_, taille_evincee) = self._entrees.popitem(last=False)
+                self._octets -= taille_evincee
+                self.evictions += 1
+
+    def __contains__(self, cle):
+        with self._verrou:
+            return cle in self._entrees
+
+    def __len__(self):
+        with self._verrou:
+            return len(self._entrees)
+
+    def vider(self):
+        """Supprime toutes les entrées (les compteurs sont conservés)."""
+        with self._verrou:
+            self._entrees.clear()
+            self._octets = 0
+
+    def stats(self):
+        """Retourne les statistiques du cache."""
+        with self._verrou:
+            total = self.hits + self.misses
+            return {
+                'entrees': len(self._entrees),
+                'octets': self._octets,
+                'max_entrees': self.max_entrees,
+                'max_octets': self.max_octets,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'taux_hit': self.hits / total if total else 0.0
+            }
@@ -0,0 +1,106 @@
+"""
+Appels symboliques coûteux (limit, series, terme dominant) mémoïsés.
+
+Les résultats sont gardés dans un CacheLRU borné, indexé par
+(opération, srepr(expr), variable, point, direction) : une même intégrale
+réanalysée (à chaque frappe) ou des tests qui se recoupent dans
+_check_convergence ne refont pas le calcul. Les échecs (NotImplementedError,
+limites non calculables) sont mémorisés aussi (type et arguments de l'exception)
+et relancés sous la forme d'une exception neuve.
+
+Chaque processus a son propre cache (les processus de travail ne le partagent pas).
+"""
+
+from sympy import limit, series, srepr, Symbol, oo
+
+from cache_lru import CacheLRU
+from metriques import APPELS_SYMBOLIQUES, mesurer
+
+# Taille du cache (entrées, octets estimés)
+MAX_ENTREES = 2048
+MAX_OCTETS = 8 * 1024 * 1024
+
+
+
+def _taille(cle, entree):
+    """Taille estimée d'une entrée : textes de la clé, srepr du résultat ou arguments de l'exception."""
+    reussi, valeur = entree
+    return (sum(len(partie) if isinstance(partie, str) else 8 for partie in cle)
+            + len(srepr(valeur) if reussi else repr(valeur)))
+
+
+CACHE_SYMBOLIQUE = CacheLRU(max_entrees=MAX_ENTREES, max_octets=MAX_OCTETS, mesurer=_taille)
+
+_limit = mesurer(APPELS_SYMBOLIQUES, appel='limit')(limit)
+_series = mesurer(APPELS_SYMBOLIQUES, appel='series')(series)
+
+_ABSENT = object()
+
+
+def _memoiser(cle, calcul):
+    """
+    Résultat de calcul() mémorisé sous `cle`. Une exception est mémorisée par son type
+    et ses arguments (pas l'objet : sa trace garderait les cadres d'appel en vie) et
+    relancée neuve à chaque lecture.
+    """
+    entree = CACHE_SYMBOLIQUE.get(cle, _ABSENT)
+    if entree is _ABSENT:
+        try:
+            entree = (True, calcul())
+        except Exception as erreur:
+            type_, arguments = type(erreur), erreur.args
+            try:
+                type_(*arguments)
+            except Exception:
+                # Exception non reconstructible à partir de ses arguments : pas mémorisée
+                raise erreur
+            entree = (False, (type_, arguments))
+        CACHE_SYMBOLIQUE.put(cle, entree)
+    reussi, valeur = entree
+    if not reussi:
+        type_, arguments = valeur
+        raise type_(*arguments)
+    return valeur
+
+
+def _cle(operation, expr, var, point, direction, *supplement):
+    return (operation, srepr(expr), srepr(var), srepr(point), direction) + supplement
+
+
+def limite(expr, var, point, direction='+'):
+    """limit(expr, var, point, direction), mémoïsée."""
+    return _memoiser(_cle('limit', expr, var, point, direction),
+                     lambda: _limit(expr, var, point, direction))
+
+
+def developpement(expr, var, point, n=3, direction='+'):
+    """
+    series(expr, var, point, n), mémoïsé. En ±∞, le développement est fait en
+    t = 0 après la substitution x = ±1/t (forme utilisée par _asymptotic_behavior).
+    """
+    def calcul():
+        if point in (oo, -oo):
+            t = Symbol('t')
+            return _series(expr.subs(var, (1 if point == oo else -1) / t), t, 0, n=n)
+        return _series(expr, var, point, n=n, dir=direction)
+    return _memoiser(_cle('series', expr, var, point, direction, n), calcul)
+
+
+def terme_dominant(expr, var, point, direction='+'):
+    """
+    Terme dominant de expr en `point`, exprimé en t = ±1/x en ±∞ et en
+    t = |x - point| (selon la direction) en une borne finie. Mémoïsé.
+    """
+    def calcul():
+        t = Symbol('t')
+        if point in (oo, -oo):
+            decale = expr.subs(var, (1 if point == oo else -1) / t)
+        else:
+            decale = expr.subs(var, point + (t if direction == '+' else -t))
+        return decale.as_leading_term(t)
+    return _memoiser(_cle('terme_dominant', expr, var, point, direction), calcul)
+
+
+def stats():
+    """Statistiques du cache symbolique (voir CacheLRU.stats)."""
+    return CACHE_SYMBOLIQUE.stats()
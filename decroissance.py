@@ -0,0 +1,123 @@
+"""
+Estimation numérique de la décroissance d'une intégrande vers une borne
+infinie ou singulière, pour décider rapidement de la convergence.
+
+L'intégrande est échantillonnée sur une grille géométrique qui s'approche de
+la borne (|x| de 10 à 1e12, ou distance à la borne de 1e-2 à 1e-10). Au voisinage
+de la borne, |f| ~ C·d^s (d : |x| en ±∞, distance à la borne sinon) ; l'ordre s
+est ajusté par régression log-log. L'intégrale converge si s < -1 en ±∞ et si
+s > -1 en une borne finie. Une décroissance exponentielle se traduit par une
+pente log-log qui s'accentue (ou des valeurs qui s'annulent par sous-dépassement),
+une croissance explosive par des valeurs infinies.
+
+Le verdict est accompagné d'un score de confiance ; un ordre proche de -1, des
+oscillations ou trop de points invalides rendent le verdict ambigu (statut None) :
+les tests symboliques restent alors nécessaires.
+"""
+
+import math
+
+import numpy as np
+
+from echantillonnage import evaluer
+
+# Nombre de points de la grille géométrique
+POINTS_GRILLE = 48
+
+# Écart minimal entre l'ordre estimé et le seuil -1 pour conclure
+MARGE_ORDRE = 0.15
+
+# Confiance minimale pour rendre un verdict
+CONFIANCE_MIN = 0.9
+
+
+def _grille(point, cote):
+    """Abscisses et distances d (croissantes en ±∞, décroissantes vers une borne finie)."""
+    if math.isinf(point):
+        distances = np.geomspace(1e1, 1e12, POINTS_GRILLE)
+        return math.copysign(1, point) * distances, distances
+    distances = np.geomspace(1e-2, 1e-10, POINTS_GRILLE) * max(1.0, abs(point))
+    return point + cote * distances, distances
+
+
+def _regression(t, y):
+    """Pente et coefficient de détermination R² de la droite des moindres carrés."""
+    pente, origine = np.polyfit(t, y, 1)
+    residus = y - (pente * t + origine)
+    dispersion = np.sum((y - y.mean()) ** 2)
+    r2 = 1.0 if dispersion == 0 else max(0.0, 1 - np.sum(residus ** 2) / dispersion)
+    return float(pente), float(r2)
+
+
+def estimer_decroissance(f_num, point, cote=1):
+    """
+    Ordre de décroissance de f_num vers `point` et verdict de convergence.
+
+    Args:
+        f_num: Fonction lambdifiée d'une variable
+        point: Borne (±inf ou borne finie singulière)
+        cote: Côté d'approche d'une borne finie (+1 : par la droite, -1 : par la gauche)
+
+    Returns:
+        dict avec 'statut' ('convergent', 'divergent' ou None si ambigu),
+        'modele' ('puissance', 'exponentielle', 'croissance' ou None),
+        'ordre' (s tel que |f| ~ d^s, None si non significatif) et 'confiance' (0 à 1)
+    """
+    infini = math.isinf(point)
+    resultat = {"statut": None, "modele": None, "ordre": None, "confiance": 0.0}
+
+    xs, distances = _grille(point, cote)
+    valeurs, valides = evaluer(f_num, xs)
+    absolues = np.abs(valeurs)
+    queue = slice(POINTS_GRILLE // 2, None)  # moitié la plus proche de la borne
+
+    # Valeurs infinies près de la borne : croissance explosive (e^x, e^{1/x})
+    if np.isinf(valeurs[queue]).sum() > POINTS_GRILLE // 8:
+        resultat.update(statut="divergent", modele="croissance", confiance=0.95)
+        return resultat
+
+    # Trop de points hors du domaine de définition : pas de verdict
+    if valides.mean() < 0.8:
+        return resultat
+
+    # Intégrande nulle près de la borne (sous-dépassement d'une exponentielle, support borné)
+    nulles = valides & (absolues == 0)
+    if nulles[queue].all():
+        resultat.update(statut="convergent", modele="exponentielle", confiance=0.95)
+        return resultat
+
+    positives = valides & (absolues > 0)
+    t, y = np.log(distances[positives]), np.log(absolues[positives])
+    if len(t) < 6:
+        return resultat
+
+    # Pente globale sur la moitié proche de la borne, pentes locales au début et à la fin de cette moitié
+    moitie = len(t) // 2
+    ordre, r2 = _regression(t[moitie:], y[moitie:])
+    quart = max(3, (len(t) - moitie) // 3)
+    ordre_debut, _ = _regression(t[moitie:moitie + quart], y[moitie:moitie + quart])
+    ordre_fin, _ = _regression(t[-quart:], y[-quart:])
+
+    # Exponentielle : la pente log-log s'accentue sans cesse (e^{-x} : pente -x)
+    if infini and ordre_fin < -5 and ordre_fin < 2 * ordre_debut:
+        resultat.update(statut="convergent", modele="exponentielle", confiance=0.95)
+        return resultat
+    if not infini and ordre_fin > 5 and ordre_fin > 2 * ordre_debut:
+        resultat.update(statut="convergent", modele="exponentielle", confiance=0.95)
+        return resultat
+
+    resultat.update(modele="puissance", ordre=ordre)
+
+    # Cas limite exact s = -1 (1/x, 1/(x - a)) : divergent si la pente ne dérive pas
+    if max(abs(ordre + 1), abs(ordre_debut + 1), abs(ordre_fin + 1)) < 1e-3:
+        resultat.update(statut="divergent", confiance=round(r2, 6))
+        return resultat
+
+    # Confiance : qualité de l'ajustement, réduite si l'ordre est proche du seuil ou dérive
+    derive = abs(ordre_fin - ordre_debut)
+    confiance = r2 * min(1.0, abs(ordre + 1) / (2 * MARGE_ORDRE)) * max(0.0, 1 - derive / (4 * MARGE_ORDRE))
+    resultat["confiance"] = round(confiance, 6)
+    if confiance >= CONFIANCE_MIN and abs(ordre + 1) > MARGE_ORDRE:
+        converge = ordre < -1 if infini else ordre > -1
+        resultat["statut"] = "convergent" if converge else "divergent"
+    return resultat
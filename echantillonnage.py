@@ -0,0 +1,220 @@
+"""
+Moteur d'échantillonnage numérique partagé.
+
+Les fonctions lambdifiées sont évaluées sur des tableaux entiers en un seul
+appel NumPy. Les points invalides (division par zéro, domaine, infini,
+valeur complexe) sont signalés par un masque au lieu d'exceptions. L'évaluation
+point par point n'est utilisée que pour les expressions non vectorisables.
+"""
+
+import numpy as np
+
+
+def _en_reels(valeurs, forme):
+    """
+    Convertit le résultat d'une évaluation en tableau réel de la forme attendue
+    (NaN si complexe ou non numérique, par exemple une expression SymPy restée symbolique).
+    """
+    valeurs = np.asarray(valeurs)
+    if valeurs.dtype == object:
+        try:
+            valeurs = valeurs.astype(complex)
+        except (TypeError, ValueError):
+            return np.full(forme, np.nan)
+    if np.iscomplexobj(valeurs):
+        reelles = np.where(np.abs(valeurs.imag) <= 1e-12 * np.maximum(1.0, np.abs(valeurs.real)),
+                           valeurs.real, np.nan)
+        valeurs = reelles
+    valeurs = np.asarray(valeurs, dtype=float)
+    if valeurs.shape != forme:
+        # Expression constante : un scalaire pour tous les points
+        valeurs = np.array(np.broadcast_to(valeurs, forme))
+    return valeurs
+
+
+def _evaluer_point_par_point(f_num, points):
+    """Repli pour les expressions non vectorisables : un appel par point, NaN si erreur."""
+    ys = np.full(len(points[0]), np.nan)
+    for i, coordonnees in enumerate(zip(*points)):
+        try:
+            ys[i] = _en_reels(f_num(*coordonnees), ()).item()
+        except Exception:
+            pass
+    return ys
+
+
+def _resultat_symbolique(f_num, points):
+    """
+    Sonde f_num sur le premier point : vrai si le résultat reste symbolique
+    (variable libre non fournie), auquel cas inutile d'évaluer toute la grille.
+    """
+    try:
+        sonde = np.asarray(f_num(*[p.ravel()[:1] for p in points]))
+    except Exception:
+        return False
+    if sonde.dtype != object:
+        return False
+    try:
+        sonde.astype(complex)
+        return False
+    except (TypeError, ValueError):
+        return True
+
+
+def evaluer(f_num, *points):
+    """
+    Évalue f_num sur des tableaux de coordonnées de même forme.
+
+    Args:
+        f_num: Fonction lambdifiée (une coordonnée par variable)
+        points: Tableaux NumPy de coordonnées (même forme)
+
+    Returns:
+        (valeurs, valides) : tableau réel (NaN aux points invalides) et masque des
+        valeurs finies
+    """
+    points = [np.asarray(p, dtype=float) for p in points]
+    forme = points[0].shape
+    with np.errstate(all='ignore'):
+        if _resultat_symbolique(f_num, points):
+            valeurs = np.full(forme, np.nan)
+            return valeurs, np.isfinite(valeurs)
+        try:
+            brutes = f_num(*points)
+        except Exception:
+            aplatis = [p.ravel() for p in points]
+            valeurs = _evaluer_point_par_point(f_num, aplatis).reshape(forme)
+        else:
+            valeurs = _en_reels(brutes, forme)
+    return valeurs, np.isfinite(valeurs)
+
+
+def echantillonner_1d(f_num, x_min, x_max, n):
+    """
+    Échantillonne une fonction d'une variable sur n points réguliers de [x_min, x_max].
+
+    Returns:
+        (xs, ys, valides) : abscisses, valeurs (NaN si invalides), masque des valeurs finies
+    """
+    xs = np.linspace(x_min, x_max, n)
+    ys, valides = evaluer(f_num, xs)
+    return xs, ys, valides
+
+
+# Résolution des grilles utilisées pour les bornes en z (surfaces, intégrandes 2D)
+RESOLUTION_GRILLE = 200
+
+
+def evaluer_grille(f_num, domaine_x, domaine_y, nx, ny=None):
+    """
+    Évalue f_num(x, y) sur une grille régulière nx × ny en un seul appel (meshgrid).
+
+    L'indexation est 'ij' : X[i, j] = xs[i], Y[i, j] = ys[j] ; une fois aplatie, la
+    grille suit l'ordre des anciennes boucles `for xi: for yi:`.
+
+    Returns:
+        (X, Y, Z, valides) : coordonnées, valeurs (NaN si invalides), masque des valeurs finies
+    """
+    xs = np.linspace(domaine_x[0], domaine_x[1], nx)
+    ys = np.linspace(domaine_y[0], domaine_y[1], ny or nx)
+    X, Y = np.meshgrid(xs, ys, indexing='ij')
+    Z, valides = evaluer(f_num, X, Y)
+    return X, Y, Z, valides
+
+
+# Mémoire maximale (octets) d'un bloc de points évalué d'un coup sur une grille N-D
+MEMOIRE_BLOC_MAX = 16 * 1024 * 1024
+
+
+def parcourir_grille(f_num, domaines, n, memoire_max=None):
+    """
+    Parcourt la grille régulière n^d (produit cartésien) par blocs, sans jamais la
+    matérialiser : chaque bloc est évalué en un appel vectorisé.
+
+    Les points sont produits dans l'ordre des boucles imbriquées (dernière variable
+    la plus rapide).
+
+    Args:
+        f_num: Fonction lambdifiée à d variables
+        domaines: Liste de (min, max), une par variable
+        n: Nombre de points par axe
+        memoire_max: Mémoire maximale d'un bloc en octets (défaut: MEMOIRE_BLOC_MAX)
+
+    Yields:
+        (points, valeurs, valides) : liste de d tableaux de coordonnées, valeurs et masque du bloc
+    """
+    memoire_max = memoire_max or MEMOIRE_BLOC_MAX
+    dimension = len(domaines)
+    axes = [np.linspace(a, b, n) for a, b in domaines]
+    total = n ** dimension
+
+    # Par point : indices et coordonnées (d entiers + d réels), valeur, masque et
+    # temporaires de l'évaluation (estimés à d réels de plus)
+    octets_par_point = 8 * (3 * dimension + 6)
+    taille_bloc = max(1, memoire_max // octets_par_point)
+
+    for debut in range(0, total, taille_bloc):
+        indices = np.unravel_index(np.arange(debut, min(total, debut + taille_bloc)), (n,) * dimension)
+        points = [axe[i] for axe, i in zip(axes, indices)]
+        valeurs, valides = evaluer(f_num, *points)
+        yield points, valeurs, valides
+
+
+class StatistiquesGrille:
+    """
+    Statistiques réduites bloc par bloc sur une grille : nombre de points valides,
+    min/max des valeurs, histogramme optionnel et étendue des coordonnées des
+    points retenus par un critère de sélection.
+    """
+
+    def __init__(self, dimension, classes=None, selection=None):
+        """
+        Args:
+            dimension: Nombre de variables
+            classes: Bornes des classes de l'histogramme (None: pas d'histogramme)
+            selection: Fonction (valeurs, valides) -> masque des points dont on suit
+                       l'étendue des coordonnées (None: pas de suivi)
+        """
+        self.total = 0
+        self.valides = 0
+        self.minimum = None
+        self.maximum = None
+        self.classes = None if classes is None else np.asarray(classes, dtype=float)
+        self.histogramme = None if classes is None else np.zeros(len(classes) - 1, dtype=np.int64)
+        self.selection = selection
+        self.selectionnes = 0
+        self.min_selection = [None] * dimension
+        self.max_selection = [None] * dimension
+
+    def ajouter(self, points, valeurs, valides):
+        """Intègre un bloc (voir parcourir_grille)."""
+        self.total += valeurs.size
+        retenues = valeurs[valides]
+        if retenues.size:
+            self.valides += retenues.size
+            bloc_min, bloc_max = retenues.min(), retenues.max()
+            self.minimum = bloc_min if self.minimum is None else min(self.minimum, bloc_min)
+            self.maximum = bloc_max if self.maximum is None else max(self.maximum, bloc_max)
+            if self.histogramme is not None:
+                self.histogramme += np.histogram(retenues, bins=self.classes)[0]
+
+        if self.selection is not None:
+            masque = self.selection(valeurs, valides)
+            if masque.any():
+                self.selectionnes += int(masque.sum())
+                for i, coordonnees in enumerate(points):
+                    choisies = coordonnees[masque]
+                    bas, haut = choisies.min(), choisies.max()
+                    self.min_selection[i] = bas if self.min_selection[i] is None else min(self.min_selection[i], bas)
+                    self.max_selection[i] = haut if self.max_selection[i] is None else max(self.max_selection[i], haut)
+
+
+def statistiques_grille(f_num, domaines, n, classes=None, selection=None, memoire_max=None):
+    """
+    Évalue f_num sur la grille n^d par blocs (mémoire bornée par memoire_max) et
+    retourne les StatistiquesGrille correspondantes.
+    """
+    stats = StatistiquesGrille(len(domaines), classes=classes, selection=selection)
+    for points, valeurs, valides in parcourir_grille(f_num, domaines, n, memoire_max=memoire_max):
+        stats.ajouter(points, valeurs, valides)
+    return stats
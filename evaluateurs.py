@@ -0,0 +1,63 @@
+"""
+Évaluateurs numériques compilés (lambdify), partagés par toutes les étapes.
+
+lambdify génère puis exécute (exec) du code Python à chaque appel. Ici chaque
+évaluateur est compilé une fois par processus pour un couple (expression canonique
+srepr, variables) et gardé dans un CacheLRU : retracer la même fonction, ou la
+retrouver dans une autre étape (domaine, tracé, intégrale), ne régénère aucun code.
+
+La compilation élimine les sous-expressions communes (cse : sin(x) n'est calculé
+qu'une fois dans sin(x)**2 + sin(x)) et produit des noyaux vectorisés NumPy.
+Les durées de compilation et les hits/misses sont exportés dans les métriques.
+"""
+
+from sympy import lambdify, srepr
+
+from cache_lru import CacheLRU
+from metriques import COMPILATIONS, EVALUATEURS_HITS, EVALUATEURS_MISSES, chronometrer
+
+# Taille du cache (entrées, octets estimés d'après la taille des clés)
+MAX_ENTREES = 512
+MAX_OCTETS = 16 * 1024 * 1024
+
+MODULES = ['numpy', 'math']
+
+
+def _taille(cle, evaluateur):
+    """Taille estimée d'un évaluateur : le code généré croît comme l'expression."""
+    return 2 * sum(len(partie) for partie in cle)
+
+
+CACHE_EVALUATEURS = CacheLRU(max_entrees=MAX_ENTREES, max_octets=MAX_OCTETS, mesurer=_taille)
+
+
+def compiler(variables, expr):
+    """
+    Équivalent de lambdify(variables, expr, modules=['numpy', 'math']), compilé
+    une fois (avec cse) et partagé.
+
+    Args:
+        variables: Symbole ou séquence de symboles (arguments de l'évaluateur, dans l'ordre)
+        expr: Expression SymPy
+
+    Returns:
+        Fonction numérique vectorisée des variables
+    """
+    arguments = tuple(variables) if isinstance(variables, (list, tuple)) else (variables,)
+    cle = (srepr(expr),) + tuple(srepr(argument) for argument in arguments)
+
+    evaluateur = CACHE_EVALUATEURS.get(cle)
+    if evaluateur is not None:
+        EVALUATEURS_HITS.incrementer()
+        return evaluateur
+
+    EVALUATEURS_MISSES.incrementer()
+    with chronometrer(COMPILATIONS):
+        evaluateur = lambdify(list(arguments), expr, modules=MODULES, cse=True)
+    CACHE_EVALUATEURS.put(cle, evaluateur)
+    return evaluateur
+
+
+def stats():
+    """Statistiques du cache des évaluateurs (voir CacheLRU.stats)."""
+    return CACHE_EVALUATEURS.stats()
@@ -0,0 +1,90 @@
+"""
+Expression LaTeX parsée une seule fois et partagée par toutes les étapes
+de génération (détection d'intégrales, variables, domaine, tracé).
+"""
+
+from sympy import Integral, Symbol, preorder_traversal
+from sympy.parsing.latex import parse_latex
+
+from evaluateurs import compiler
+from metriques import ETAPES, chronometrer
+from recherche_racines import AnalyseCaracteristiques
+
+
+class ExpressionAnalysee:
+    """Expression SymPy issue d'une ligne LaTeX, avec ses dérivés calculés à la demande."""
+
+    def __init__(self, fonction_latex, expr=None):
+        """
+        Args:
+            fonction_latex: Expression LaTeX d'origine
+            expr: Expression SymPy déjà parsée (sinon parse_latex est appelé une fois)
+        """
+        self.latex = fonction_latex
+        if expr is None:
+            with chronometrer(ETAPES, etape='parse_latex'):
+                expr = parse_latex(fonction_latex)
+        self.expr = expr
+
+        self._variables = None
+        self._integrales = None
+        self._evaluateurs = {}
+        self._caracteristiques = {}
+
+    @classmethod
+    def depuis(cls, fonction):
+        """Retourne `fonction` si elle est déjà analysée, sinon la parse."""
+        if isinstance(fonction, cls):
+            return fonction
+        return cls(fonction)
+
+    @property
+    def free_symbols(self):
+        return self.expr.free_symbols
+
+    @property
+    def variables(self):
+        """Noms des variables libres, triés."""
+        if self._variables is None:
+            self._variables = sorted(str(var) for var in self.expr.free_symbols)
+        return self._variables
+
+    @property
+    def integrales(self):
+        """Intégrales contenues dans l'expression (parcours préfixe, extérieure d'abord)."""
+        if self._integrales is None:
+            self._integrales = [noeud for noeud in preorder_traversal(self.expr)
+                                if isinstance(noeud, Integral)]
+        return self._integrales
+
+    def evaluateur(self, noms_variables):
+        """
+        Fonction numérique de l'expression pour un tuple de variables (voir
+        evaluateurs.compiler : compilée une fois par processus).
+        """
+        cle = tuple(str(nom) for nom in noms_variables)
+        if cle not in self._evaluateurs:
+            symboles = [self._symbole(nom) for nom in cle]
+            self._evaluateurs[cle] = compiler(symboles, self.expr)
+        return self._evaluateurs[cle]
+
+    def caracteristiques(self, nom_variable, symbolique=False):
+        """
+        Caractéristiques (racines, extrema, asymptotes...) de l'expression vue comme
+        fonction de `nom_variable`, partagées par toutes les étapes qui les demandent.
+        """
+        cle = (str(nom_variable), symbolique)
+        if cle not in self._caracteristiques:
+            self._caracteristiques[cle] = AnalyseCaracteristiques(
+                self.expr, self._symbole(cle[0]), symbolique=symbolique)
+        return self._caracteristiques[cle]
+
+    def _symbole(self, nom):
+        # Réutiliser le symbole de l'expression s'il existe (mêmes hypothèses)
+        for var in self.expr.free_symbols:
+            if str(var) == nom:
+                return var
+        return Symbol(nom)
+
+    def __repr__(self):
+        return f"ExpressionAnalysee({self.latex!r})"
@@ -5,13 +5,36 @@ Compatible avec TikZJax pour Obsidian
 """
 
 import math
-import numpy as np
+
+from budget_sortie import BudgetSortie, budget_actif, sous_budget
+
+# Octets au moins par sommet d'un polygone tracé en un seul chemin : au-delà de
+# max_octets / OCTETS_PAR_SOMMET sommets, le polygone complet n'est même pas généré
+OCTETS_PAR_SOMMET = 16
+
+
+def _paliers_angles(generateur, angles_deg=None, *args, **kwargs):
+    """Étiquettes d'abord, puis la moitié des angles à chaque palier."""
+    n = len(angles_deg) if angles_deg is not None else 4
+    paliers = [dict(etiquettes=True, max_angles=n), dict(etiquettes=False, max_angles=n)]
+    while n > 1:
+        n //= 2
+        paliers.append(dict(etiquettes=False, max_angles=n))
+    return paliers
+
 
 class GenerateurFormesGeometriques:
     """Génère des formes géométriques en TikZ."""
 
-    def __init__(self, scale=3):
+    def __init__(self, scale=3, budget_sortie=None):
+        """
+        Args:
+            scale: Échelle des figures
+            budget_sortie: Taille maximale de la sortie d'une ligne (BudgetSortie, par
+                           défaut celui de budget_sortie.py)
+        """
         self.scale = scale
+        self.budget_sortie = budget_sortie if budget_sortie is not None else BudgetSortie()
 
     # ==================== CERCLE TRIGONOMÉTRIQUE ====================
 
@@ -89,8 +112,19 @@ class GenerateurFormesGeometriques:
 
         return code
 
-    def cercle_trigo_multiple_angles(self, angles_deg=[30, 45, 60, 90]):
-        """Cercle trigonométrique montrant plusieurs angles remarquables."""
+    @sous_budget(_paliers_angles)
+    def cercle_trigo_multiple_angles(self, angles_deg=[30, 45, 60, 90], etiquettes=True, max_angles=None):
+        """
+        Cercle trigonométrique montrant plusieurs angles remarquables.
+
+        Args:
+            angles_deg: Angles en degrés
+            etiquettes: Affiche la valeur de chaque angle
+            max_angles: Angles tracés au plus (répartis dans la liste), None : tous
+        """
+        if max_angles is not None and len(angles_deg) > max_angles:
+            pas = -(-len(angles_deg) // max(max_angles, 1))
+            angles_deg = angles_deg[::pas]
         code = f"""```tikz
 \\begin{{document}}
 \\begin{{tikzpicture}}[scale={self.scale}]
@@ -114,7 +148,9 @@ class GenerateurFormesGeometriques:
 
             code += f"""  \\draw[thick, {couleur}] (0,0) -- ({x:.3f},{y:.3f});
   \\fill[{couleur}] ({x:.3f},{y:.3f}) circle (0.03);
-  \\node[{couleur}, anchor=south west] at ({x:.3f},{y:.3f}) {{${angle}°$}};
+"""
+            if etiquettes:
+                code += f"""  \\node[{couleur}, anchor=south west] at ({x:.3f},{y:.3f}) {{${angle}°$}};
 """
 
         code += f"""
@@ -492,7 +528,35 @@ class GenerateurFormesGeometriques:
     # ==================== FORMES 2D ====================
 
     def polygone_regulier(self, n_cotes=6, rayon=2, afficher_centre=True):
-        """Polygone régulier à n côtés."""
+        """
+        Polygone régulier à n côtés.
+
+        Hors budget de sortie, les étiquettes sont retirées, puis le polygone est tracé
+        en un seul chemin, puis avec de moins en moins de sommets.
+        """
+        generer = lambda **reglages: self._polygone_regulier(n_cotes, rayon, afficher_centre, **reglages)
+        budget = budget_actif(self.budget_sortie)
+        if budget is None:
+            return generer()
+
+        complet = dict(etiquettes=True, chemin_unique=False, sommets=n_cotes)
+        plafond = n_cotes
+        if budget.max_octets is not None:
+            plafond = max(3, budget.max_octets // OCTETS_PAR_SOMMET)
+        paliers = []
+        if n_cotes <= plafond:
+            paliers = [complet, dict(etiquettes=False, chemin_unique=False, sommets=n_cotes),
+                       dict(etiquettes=False, chemin_unique=True, sommets=n_cotes)]
+        sommets = min(n_cotes // 2 if paliers else n_cotes, plafond)
+        while sommets >= 3:
+            paliers.append(dict(etiquettes=False, chemin_unique=True, sommets=sommets))
+            sommets //= 2
+        return budget.ajuster(generer, paliers or [complet], nom='polygone_regulier', reference=complet)
+
+    def _polygone_regulier(self, n_cotes, rayon, afficher_centre, etiquettes=True,
+                           chemin_unique=False, sommets=None):
+        """Code du polygone, `sommets` sommets tracés (n_cotes par défaut)."""
+        n_traces = sommets or n_cotes
         code = f"""```tikz
 \\begin{{document}}
 \\begin{{tikzpicture}}[scale=1.5]
@@ -501,23 +565,31 @@ class GenerateurFormesGeometriques:
 
         # Calculer les sommets
         sommets = []
-        for i in range(n_cotes):
-            angle = 2 * math.pi * i / n_cotes - math.pi/2  # Commence en haut
+        for i in range(n_traces):
+            angle = 2 * math.pi * i / n_traces - math.pi/2  # Commence en haut
             x = rayon * math.cos(angle)
             y = rayon * math.sin(angle)
             sommets.append((x, y))
 
-        # Dessiner les arêtes
-        for i in range(n_cotes):
-            x1, y1 = sommets[i]
-            x2, y2 = sommets[(i+1) % n_cotes]
-            code += f"""  \\draw[very thick] ({x1:.2f},{y1:.2f}) -- ({x2:.2f},{y2:.2f});
+        if chemin_unique:
+            # Un seul chemin fermé, sans marque aux sommets
+            chemin = " -- ".join(f"({x:.2f},{y:.2f})" for x, y in sommets)
+            code += f"""  \\draw[very thick] {chemin} -- cycle;
+"""
+        else:
+            # Dessiner les arêtes
+            for i in range(n_traces):
+                x1, y1 = sommets[i]
+                x2, y2 = sommets[(i+1) % n_traces]
+                code += f"""  \\draw[very thick] ({x1:.2f},{y1:.2f}) -- ({x2:.2f},{y2:.2f});
 """
 
-        # Dessiner les sommets
-        for i, (x, y) in enumerate(sommets):
-            code += f"""  \\fill ({x:.2f},{y:.2f}) circle (0.05);
-  \\node[anchor=center] at ({x*1.2:.2f},{y*1.2:.2f}) {{$S_{{{i+1}}}$}};
+            # Dessiner les sommets
+            for i, (x, y) in enumerate(sommets):
+                code += f"""  \\fill ({x:.2f},{y:.2f}) circle (0.05);
+"""
+                if etiquettes:
+                    code += f"""  \\node[anchor=center] at ({x*1.2:.2f},{y*1.2:.2f}) {{$S_{{{i+1}}}$}};
 """
 
         if afficher_centre:
@@ -1,32 +1,81 @@
 from sympy import symbols, sin, cos, ln, log, lambdify, Integral, Symbol, degree
-from sympy.parsing.latex import parse_latex
 from sympy.core.numbers import Rational
 import sympy as sp
 import math
 import numpy as np
 from analyseur_convergence import FonctionAnalyzer
+from expression_analysee import ExpressionAnalysee
+from metriques import ETAPES, mesurer
+from echantillonnage import evaluer_grille
+from trace_adaptatif import CHIFFRES, echantillonner_adaptatif, coordonnees_tikz, decouper, poles
+from maillage_adaptatif import MAX_SOMMETS, maillage_adaptatif, table_tikz
+from maillage_adaptatif import CHIFFRES as CHIFFRES_SURFACE
+from budget_sortie import BudgetSortie, sous_budget
+
+# Modes de sortie des courbes 1D et des surfaces : expression évaluée par pgfplots
+# (samples=200, samples=13), ou points calculés côté serveur (voir trace_adaptatif.py
+# et maillage_adaptatif.py)
+MODES_SORTIE = ('expression', 'coordonnees')
+
+# Paliers de résolution des tracés, du plus fin au plus grossier (voir budget_sortie.py) :
+# seuls les réglages utilisés par le mode de sortie sont dégradés
+PALIERS_SURFACE_EXPRESSION = [dict(samples=n) for n in (13, 10, 7, 5)]
+
+PALIERS_NUAGE = [dict(points_par_axe=5, decimales=3), dict(points_par_axe=5, decimales=2),
+                 dict(points_par_axe=4, decimales=2), dict(points_par_axe=3, decimales=2)]
+
+
+def _paliers_courbe(generateur, *args, **kwargs):
+    if generateur.mode_sortie == 'coordonnees':
+        return [dict(samples=200, chiffres=CHIFFRES), dict(samples=100, chiffres=CHIFFRES),
+                dict(samples=50, chiffres=4), dict(samples=25, chiffres=3)]
+    return [dict(samples=n) for n in (200, 100, 50, 25)]
+
+
+def _paliers_surface(generateur, *args, **kwargs):
+    if generateur.mode_sortie == 'coordonnees':
+        sommets = generateur.max_sommets
+        return [dict(max_sommets=sommets, chiffres=CHIFFRES_SURFACE),
+                dict(max_sommets=max(9, sommets // 2), chiffres=CHIFFRES_SURFACE),
+                dict(max_sommets=max(9, sommets // 4), chiffres=3),
+                dict(max_sommets=max(9, sommets // 8), chiffres=3)]
+    return PALIERS_SURFACE_EXPRESSION
 
 class TikzGraphGenerator:
-    def __init__(self, scale=0.9):
+    def __init__(self, scale=0.9, budget_analyse=None, mode_sortie='expression', max_sommets=MAX_SOMMETS,
+                 budget_sortie=None):
+        """
+        Args:
+            scale: Échelle des figures
+            budget_analyse: Temps alloué à l'analyse d'une expression (secondes, None :
+                            illimité), voir FonctionAnalyzer
+            mode_sortie: 'expression' (pgfplots évalue la formule) ou 'coordonnees'
+                         (courbe échantillonnée, surface maillée côté serveur)
+            max_sommets: Sommets au plus d'une surface maillée (mode 'coordonnees')
+            budget_sortie: Taille maximale de la sortie d'une ligne (BudgetSortie, par
+                           défaut celui de budget_sortie.py)
+        """
+        if mode_sortie not in MODES_SORTIE:
+            raise ValueError(f"Mode de sortie inconnu : {mode_sortie!r} (attendu : {', '.join(MODES_SORTIE)})")
         self.scale = scale
-        self.analyzer = FonctionAnalyzer()
+        self.mode_sortie = mode_sortie
+        self.max_sommets = max_sommets
+        self.budget_sortie = budget_sortie if budget_sortie is not None else BudgetSortie()
+        self.analyzer = FonctionAnalyzer(budget=budget_analyse)
 
     def _detecter_variables(self, fonction_latex):
-        """Détecte les variables dans une fonction LaTeX."""
+        """Détecte les variables dans une fonction LaTeX (ou une ExpressionAnalysee)."""
         try:
-            x, y, z, t = symbols('x y z t')
-            expr = parse_latex(fonction_latex)
-            variables = expr.free_symbols
-            return sorted([str(var) for var in variables])
+            return ExpressionAnalysee.depuis(fonction_latex).variables
         except:
             return ['x']
 
+    @mesurer(ETAPES, etape='detection_integrales')
     def _est_integrale(self, fonction_latex):
         """Vérifie si l'expression contient une intégrale."""
         try:
-            expr = parse_latex(fonction_latex)
             # Vérifier si l'expression contient des intégrales
-            integrals = self.analyzer._extract_integrals(expr)
+            integrals = ExpressionAnalysee.depuis(fonction_latex).integrales
             return len(integrals) > 0, integrals
         except:
             return False, []
@@ -34,8 +83,7 @@ class TikzGraphGenerator:
     def analyser_integrale(self, fonction_latex):
         """Analyse une intégrale et retourne les informations de convergence."""
         try:
-            expr = parse_latex(fonction_latex)
-            integrals = self.analyzer._extract_integrals(expr)
+            integrals = ExpressionAnalysee.depuis(fonction_latex).integrales
 
             if not integrals:
                 return None
@@ -47,6 +95,7 @@ class TikzGraphGenerator:
         except Exception as e:
             return {"error": str(e)}
 
+    @mesurer(ETAPES, etape='rendu_tikz')
     def formater_analyse_convergence(self, result):
         """Formate l'analyse de convergence en texte lisible."""
         if result is None:
@@ -71,6 +120,12 @@ class TikzGraphGenerator:
         dimension = result.get('dimension', 1)
         lines.append(f"📊 Dimension: {dimension}D")
         lines.append(f"📝 Intégrande: {result.get('integrand', 'N/A')}")
+
+        # Valeur numérique (intégrales convergentes)
+        valeur = result.get('numerical_value')
+        if valeur:
+            precision = "" if valeur.get('converged') else " (précision visée non atteinte)"
+            lines.append(f"🔢 Valeur numérique: {valeur['value']:.10g} ± {valeur['error']:.1e}{precision}")
         lines.append("")
 
         # Informations par variable
@@ -161,11 +216,12 @@ class TikzGraphGenerator:
         except:
             return None
 
+    @mesurer(ETAPES, etape='choix_domaine')
     def calculer_domaine_adaptatif(self, fonction_latex):
         """Calcule un domaine X adaptatif en analysant les contraintes mathématiques."""
         try:
-            # Parser l'expression
-            expr = parse_latex(fonction_latex)
+            # Parser l'expression (une seule fois pour toute la ligne)
+            expr = ExpressionAnalysee.depuis(fonction_latex).expr
             x_sym = sp.Symbol('x', real=True)
             func_str = str(expr)
 
@@ -262,16 +318,16 @@ class TikzGraphGenerator:
             # En cas d'erreur, retourner domaine par défaut
             return (-5, 5)
 
+    @mesurer(ETAPES, etape='choix_domaine')
     def calculer_domaine_3d_adaptatif(self, fonction_latex):
         """Calcule un domaine 3D adaptatif en testant plusieurs plages."""
         try:
-            # Parser l'expression
-            expr = parse_latex(fonction_latex)
-            x_sym, y_sym = sp.Symbol('x'), sp.Symbol('y')
+            # Parser l'expression (une seule fois pour toute la ligne)
+            expression = ExpressionAnalysee.depuis(fonction_latex)
 
             # Convertir en fonction Python évaluable
             try:
-                func_lambda = sp.lambdify((x_sym, y_sym), expr, modules=['numpy', 'math'])
+                func_lambda = expression.evaluateur(('x', 'y'))
             except:
                 return (-3, 3)
 
@@ -289,30 +345,16 @@ class TikzGraphGenerator:
             for dom_min, dom_max in domaines_candidats:
                 try:
                     # Tester une grille 10x10
-                    xs = np.linspace(dom_min, dom_max, 10)
-                    ys_vals = np.linspace(dom_min, dom_max, 10)
-                    zs = []
-                    points_valides = 0
-
-                    for x_val in xs:
-                        for y_val in ys_vals:
-                            try:
-                                z = func_lambda(x_val, y_val)
-                                if isinstance(z, (int, float)) and not math.isnan(z) and not math.isinf(z):
-                                    if abs(z) < 1e10:
-                                        zs.append(z)
-                                        points_valides += 1
-                            except:
-                                pass
+                    _, _, zs, valides = evaluer_grille(func_lambda, (dom_min, dom_max), (dom_min, dom_max), 10)
+                    valides &= np.abs(zs) < 1e10
+                    zs = zs[valides]
+                    points_valides = zs.size
 
                     if points_valides < 50:  # Moins de 50% valides
                         continue
 
-                    if not zs:
-                        continue
-
                     # Calculer score
-                    z_min, z_max = min(zs), max(zs)
+                    z_min, z_max = zs.min(), zs.max()
                     plage_z = z_max - z_min
 
                     if plage_z > 1e6:
@@ -337,6 +379,7 @@ class TikzGraphGenerator:
         except:
             return (-3, 3)
 
+    @mesurer(ETAPES, etape='choix_domaine')
     def calculer_bornes(self, fonction, domaine_min=-8, domaine_max=8):
         """Calcule les bornes de l'axe y pour une fonction 2D."""
         xs = np.linspace(domaine_min, domaine_max, 500)
@@ -447,12 +490,64 @@ class TikzGraphGenerator:
 
     @staticmethod
     def latex_to_tikz(expr_latex):
-        """Convertit une expression LaTeX en syntaxe TikZ."""
-        x, y, z = symbols('x y z')
-        expr = parse_latex(expr_latex)
+        """Convertit une expression LaTeX (ou une ExpressionAnalysee) en syntaxe TikZ."""
+        expr = ExpressionAnalysee.depuis(expr_latex).expr
         return TikzGraphGenerator.expr_to_tikz(expr)
 
-    def _plot_1d_avec_bornes(self, integrand_expr, var, lower, upper):
+    def _courbe_1d(self, f, expr, var, domain_min, domain_max, caracteristiques=None,
+                   samples=200, chiffres=CHIFFRES):
+        """
+        Options de l'axe et commandes \\addplot d'une courbe 1D.
+
+        La courbe est découpée aux pôles en tronçons indépendants, avec une fenêtre en y
+        calculée ici (voir trace_adaptatif.decouper). Chaque tronçon est la formule TikZ f
+        évaluée par pgfplots ou, en mode 'coordonnees', les points de expr échantillonnés
+        ici (au plus `samples` points par tronçon, `chiffres` significatifs). Repli sur
+        la formule seule si expr n'est pas évaluable numériquement.
+        """
+        a, b = float(domain_min), float(domain_max)
+        try:
+            symbole = next((s for s in expr.free_symbols if str(s) == str(var)), Symbol(str(var)))
+            f_num = self.analyzer._integrande_numerique(expr, symbole)
+        except Exception:
+            f_num = None
+
+        troncons, fenetre = [(a, b)], None
+        if f_num is not None:
+            try:
+                # Zéros du dénominateur (candidats) et zéros de 1/f, validés numériquement
+                caracteristiques = caracteristiques or self.analyzer._caracteristiques_1d(expr, symbole)
+                candidats = caracteristiques.asymptotes_verticales(a, b)
+            except Exception:
+                candidats = []
+            try:
+                troncons, fenetre = decouper(f_num, a, b, poles(f_num, a, b, candidats))
+            except Exception:
+                pass
+
+        options, courbes = f"samples={samples},", None
+        if self.mode_sortie == 'coordonnees' and f_num is not None:
+            try:
+                points = [echantillonner_adaptatif(f_num, debut, fin, max_points=samples)
+                          for debut, fin in troncons]
+                if any(np.isfinite(ys).any() for _, ys in points):
+                    options = "unbounded coords=jump,"
+                    courbes = [f"\\addplot[blue, thick] coordinates {{\n{coordonnees_tikz(xs, ys, chiffres)}\n}};"
+                               for xs, ys in points]
+            except Exception:
+                pass
+        if courbes is None:
+            if fenetre is None:
+                courbes = [f"\\addplot[blue, thick] {{{f}}};"]
+            else:
+                courbes = [f"\\addplot[blue, thick, domain={debut:.6g}:{fin:.6g}] {{{f}}};" for debut, fin in troncons]
+        if fenetre is not None:
+            options += f"\n    ymin={fenetre[0]:.4g}, ymax={fenetre[1]:.4g},"
+        return options, "\n".join(courbes)
+
+    @mesurer(ETAPES, etape='rendu_tikz')
+    @sous_budget(_paliers_courbe)
+    def _plot_1d_avec_bornes(self, integrand_expr, var, lower, upper, samples=200, chiffres=CHIFFRES):
         """Génère un graphique 1D avec des bornes spécifiques."""
         try:
             # Convertir l'intégrande (expression SymPy) en syntaxe TikZ
@@ -476,6 +571,9 @@ class TikzGraphGenerator:
             if '/' in f_str or 'sqrt' in f_str or '**-' in f_str or 'Pow' in f_str:
                 lower_display = 0.1
 
+        echantillonnage, courbe = self._courbe_1d(f, integrand_expr, var, lower_display, upper_display,
+                                                  samples=samples, chiffres=chiffres)
+
         return f"""```tikz
 \\usepackage{{pgfplots}}
 \\pgfplotsset{{compat=1.16}}
@@ -486,23 +584,30 @@ class TikzGraphGenerator:
     axis lines=middle,
     grid=both,
     domain={lower_display}:{upper_display},
-    samples=200,
+    {echantillonnage}
     xlabel={{${var}$}},
     ylabel={{$f({var})$}},
     title={{Intégrande sur [{lower}, {upper}]}},
 ]
-\\addplot[blue, thick] {{{f}}};
+{courbe}
 \\end{{axis}}
 \\end{{tikzpicture}}
 \\end{{document}}
 ```"""
 
-    def _plot_1d(self, fonction_latex, variables):
+    @mesurer(ETAPES, etape='rendu_tikz')
+    @sous_budget(_paliers_courbe)
+    def _plot_1d(self, fonction_latex, variables, samples=200, chiffres=CHIFFRES):
         """Génère un graphique 1D."""
         f = self.latex_to_tikz(fonction_latex)
 
         # Calcul du domaine adaptatif
         domain_min, domain_max = self.calculer_domaine_adaptatif(fonction_latex)
+        expression = ExpressionAnalysee.depuis(fonction_latex)
+        echantillonnage, courbe = self._courbe_1d(
+            f, expression.expr, variables[0], domain_min, domain_max,
+            expression.caracteristiques(variables[0], self.analyzer.raffinement_symbolique),
+            samples=samples, chiffres=chiffres)
 
         return f"""```tikz
 \\usepackage{{pgfplots}}
@@ -514,19 +619,51 @@ class TikzGraphGenerator:
     axis lines=middle,
     grid=both,
     domain={domain_min}:{domain_max},
-    samples=200,
+    {echantillonnage}
     xlabel={{${variables[0]}$}},
     ylabel={{$f({variables[0]})$}},
     width=10cm,
     height=8cm
 ]
-\\addplot[blue, thick] {{{f}}};
+{courbe}
 \\end{{axis}}
 \\end{{tikzpicture}}
 \\end{{document}}
 ```"""
 
-    def _plot_2d_surface(self, fonction_latex, variables):
+    def _surface_2d(self, f, fonction_latex, variables, domain_min, domain_max,
+                    samples=13, max_sommets=None, chiffres=CHIFFRES_SURFACE):
+        """
+        Commande \\addplot3 d'une surface : la formule TikZ f évaluée par pgfplots
+        (`samples` par axe) ou, en mode 'coordonnees', le maillage adaptatif calculé
+        ici (au plus max_sommets sommets, self.max_sommets par défaut ; couleur d'après z).
+        """
+        if self.mode_sortie == 'coordonnees':
+            try:
+                f_num = ExpressionAnalysee.depuis(fonction_latex).evaluateur(variables[:2])
+                domaine = (float(domain_min), float(domain_max))
+                xs, ys, Z = maillage_adaptatif(f_num, domaine, domaine, max_sommets or self.max_sommets)
+                if np.isfinite(Z).any():
+                    return f"""\\addplot3[
+    surf,
+    mesh/cols={len(xs)},
+    unbounded coords=jump,
+    point meta=explicit
+] table[meta=z] {{
+{table_tikz(xs, ys, Z, chiffres)}
+}};"""
+            except Exception:
+                pass
+        return f"""\\addplot3[
+    surf,
+    samples={samples},
+    domain={domain_min}:{domain_max},
+    y domain={domain_min}:{domain_max}
+] {{{f}}};"""
+
+    @mesurer(ETAPES, etape='rendu_tikz')
+    @sous_budget(_paliers_surface)
+    def _plot_2d_surface(self, fonction_latex, variables, samples=13, max_sommets=None, chiffres=CHIFFRES_SURFACE):
         """Génère une surface 3D pour 2 variables."""
         f = self.latex_to_tikz(fonction_latex)
 
@@ -535,27 +672,16 @@ class TikzGraphGenerator:
 
         # Calculer les limites Z en évaluant la fonction
         try:
-            expr = parse_latex(fonction_latex)
-            x_sym, y_sym = sp.Symbol('x'), sp.Symbol('y')
-            func_lambda = sp.lambdify((x_sym, y_sym), expr, modules=['numpy', 'math'])
-
-            # Évaluer sur une grille pour trouver zmin, zmax
-            xs = np.linspace(domain_min, domain_max, 20)
-            ys = np.linspace(domain_min, domain_max, 20)
-            zs = []
-
-            for x_val in xs:
-                for y_val in ys:
-                    try:
-                        z = func_lambda(x_val, y_val)
-                        if isinstance(z, (int, float)) and not math.isnan(z) and not math.isinf(z):
-                            zs.append(z)
-                    except:
-                        pass
-
-            if zs:
-                z_min = min(zs)
-                z_max = max(zs)
+            func_lambda = ExpressionAnalysee.depuis(fonction_latex).evaluateur(('x', 'y'))
+
+            # Évaluer sur une grille pour trouver zmin, zmax (grille 20x20 : la surface
+            # n'est tracée qu'en 13x13, une grille plus fine exagérerait les singularités)
+            _, _, zs, valides = evaluer_grille(func_lambda, (domain_min, domain_max), (domain_min, domain_max), 20)
+            zs = zs[valides]
+
+            if zs.size:
+                z_min = float(zs.min())
+                z_max = float(zs.max())
                 # Ajouter une petite marge
                 z_range = z_max - z_min
                 if z_range > 0:
@@ -566,6 +692,9 @@ class TikzGraphGenerator:
         except:
             z_min, z_max = -10, 10
 
+        surface = self._surface_2d(f, fonction_latex, variables, domain_min, domain_max,
+                                   samples=samples, max_sommets=max_sommets, chiffres=chiffres)
+
         return f"""```tikz
 \\usepackage{{pgfplots}}
 \\pgfplotsset{{compat=1.16}}
@@ -584,18 +713,15 @@ class TikzGraphGenerator:
     ymin={domain_min}, ymax={domain_max},
     zmin={z_min}, zmax={z_max}
 ]
-\\addplot3[
-    surf,
-    samples=13,
-    domain={domain_min}:{domain_max},
-    y domain={domain_min}:{domain_max}
-] {{{f}}};
+{surface}
 \\end{{axis}}
 \\end{{tikzpicture}}
 \\end{{document}}
 ```"""
 
-    def _plot_3d_colored(self, fonction_latex, variables):
+    @mesurer(ETAPES, etape='rendu_tikz')
+    @sous_budget(PALIERS_SURFACE_EXPRESSION)
+    def _plot_3d_colored(self, fonction_latex, variables, samples=13):
         """Génère une surface 3D colorée pour 3 variables."""
         f = self.latex_to_tikz(fonction_latex)
 
@@ -604,27 +730,16 @@ class TikzGraphGenerator:
 
         # Calculer les limites Z en évaluant la fonction
         try:
-            expr = parse_latex(fonction_latex)
-            x_sym, y_sym = sp.Symbol('x'), sp.Symbol('y')
-            func_lambda = sp.lambdify((x_sym, y_sym), expr, modules=['numpy', 'math'])
-
-            # Évaluer sur une grille pour trouver zmin, zmax
-            xs = np.linspace(domain_min, domain_max, 20)
-            ys = np.linspace(domain_min, domain_max, 20)
-            zs = []
-
-            for x_val in xs:
-                for y_val in ys:
-                    try:
-                        z = func_lambda(x_val, y_val)
-                        if isinstance(z, (int, float)) and not math.isnan(z) and not math.isinf(z):
-                            zs.append(z)
-                    except:
-                        pass
-
-            if zs:
-                z_min = min(zs)
-                z_max = max(zs)
+            func_lambda = ExpressionAnalysee.depuis(fonction_latex).evaluateur(('x', 'y'))
+
+            # Évaluer sur une grille pour trouver zmin, zmax (grille 20x20 : la surface
+            # n'est tracée qu'en 13x13, une grille plus fine exagérerait les singularités)
+            _, _, zs, valides = evaluer_grille(func_lambda, (domain_min, domain_max), (domain_min, domain_max), 20)
+            zs = zs[valides]
+
+            if zs.size:
+                z_min = float(zs.min())
+                z_max = float(zs.max())
                 # Ajouter une petite marge
                 z_range = z_max - z_min
                 if z_range > 0:
@@ -655,7 +770,7 @@ class TikzGraphGenerator:
 ]
 \\addplot3[
     surf,
-    samples=13,
+    samples={samples},
     domain={domain_min}:{domain_max},
     y domain={domain_min}:{domain_max}
 ] {{{f}}};
@@ -664,20 +779,17 @@ class TikzGraphGenerator:
 \\end{{document}}
 ```"""
 
-    def _plot_scatter_nd(self, fonction_latex, variables):
+    @mesurer(ETAPES, etape='rendu_tikz')
+    @sous_budget(PALIERS_NUAGE)
+    def _plot_scatter_nd(self, fonction_latex, variables, points_par_axe=5, decimales=3):
         """Génère un nuage de points 4D avec couleur pour la 4ème dimension."""
         # Convertir LaTeX en fonction Python
         try:
-            expr = parse_latex(fonction_latex)
-
-            # Créer les symboles pour les variables
-            var_symbols = [sp.Symbol(v) for v in variables[:4]]  # Max 4 variables (x,y,z,w)
-
-            # Créer la fonction lambda
-            func_lambda = sp.lambdify(var_symbols, expr, modules=['numpy', 'math'])
+            # Créer la fonction lambda (max 4 variables x,y,z,w)
+            func_lambda = ExpressionAnalysee.depuis(fonction_latex).evaluateur(variables[:4])
 
             # Générer une grille de points 3D
-            samples_per_axis = 5  # 5×5×5 = 125 points (performant pour TikZJax)
+            samples_per_axis = points_par_axe  # 5×5×5 = 125 points par défaut (performant pour TikZJax)
             domain_min, domain_max = -2, 2
 
             # Créer la grille
@@ -711,7 +823,7 @@ class TikzGraphGenerator:
                 # Formater les données pour TikZ
                 table_data = "x y z w\n"
                 for x, y, z, w in points_data:
-                    table_data += f"{x:.3f} {y:.3f} {z:.3f} {w:.3f}\n"
+                    table_data += f"{x:.{decimales}f} {y:.{decimales}f} {z:.{decimales}f} {w:.{decimales}f}\n"
 
                 return f"""```tikz
 \\usepackage{{pgfplots}}
@@ -790,13 +902,16 @@ x y z w
 
     def generer_fonction(self, fonction_latex):
         """Génère le graphique et/ou l'analyse selon le type d'expression."""
+        # Parser une seule fois : toutes les étapes partagent la même expression
+        expression = ExpressionAnalysee.depuis(fonction_latex)
+
         # Vérifier si c'est une intégrale
-        est_int, integrals = self._est_integrale(fonction_latex)
+        est_int, integrals = self._est_integrale(expression)
 
         if est_int:
             # C'est une intégrale, faire l'analyse de convergence
             print("\n🔍 INTÉGRALE DÉTECTÉE - Analyse de convergence en cours...\n")
-            result = self.analyser_integrale(fonction_latex)
+            result = self.analyser_integrale(expression)
 
             # Extraire l'intégrande et les bornes pour tracer le graphique
             if result and 'integral_info' in result and result['integral_info']:
@@ -861,16 +976,16 @@ x y z w
                 return self.formater_analyse_convergence(result)
         else:
             # C'est une fonction normale, générer le graphique
-            variables = self._detecter_variables(fonction_latex)
+            variables = self._detecter_variables(expression)
             n = len(variables)
 
             if n == 1:
-                return self._plot_1d(fonction_latex, variables)
+                return self._plot_1d(expression, variables)
             elif n == 2:
-                return self._plot_2d_surface(fonction_latex, variables)
+                return self._plot_2d_surface(expression, variables)
             else:
                 # 3+ variables → Nuage de points 4D (points 3D colorés)
-                return self._plot_scatter_nd(fonction_latex, variables)
+                return self._plot_scatter_nd(expression, variables)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+"""
+Maillage adaptatif des surfaces z = f(x, y), calculé côté serveur avec NumPy.
+
+En mode 'coordonnees', les surfaces ne sont plus évaluées par pgfplots (surf,
+samples=13 sur l'expression) : le maillage est calculé ici puis émis en
+\\addplot3 table (x, y, z ; la couleur suit la colonne z).
+
+pgfplots ne trace en surf qu'un maillage structuré : la grille reste un produit
+x × y, mais ses nœuds ne sont pas réguliers. Sur chaque axe, ils se resserrent là
+où le gradient varie vite (courbure mesurée sur une grille fine, en coordonnées
+normalisées par la taille du tracé). Une surface plane ne reçoit que quelques
+nœuds ; au-delà du budget de sommets, ils sont répartis entre les axes selon leurs
+variations.
+"""
+
+import numpy as np
+
+from budget_sortie import nombre_tikz
+from echantillonnage import evaluer, evaluer_grille
+
+# Sommets au plus par surface (169 en mode expression : samples=13)
+MAX_SOMMETS = 400
+
+# Nœuds au moins par axe
+MIN_NOEUDS = 3
+
+# Résolution de la grille fine qui mesure les courbures
+RESOLUTION_COURBURES = 65
+
+# Écart visé de l'interpolation linéaire, en fraction de la hauteur du tracé
+TOLERANCE = 1e-3
+
+# Chiffres significatifs des valeurs émises
+CHIFFRES = 4
+
+
+def _fenetre_z(zs):
+    """
+    Fenêtre des valeurs finies, None si aucune : quantiles élargis de moitié, qui ne
+    coupent que les pics des singularités (pas les bords d'une surface régulière).
+    """
+    finies = zs[np.isfinite(zs)]
+    if finies.size < 2:
+        return None
+    bas, haut = np.percentile(finies, [1, 99])
+    marge = 0.5 * (haut - bas) or 0.5
+    return float(bas - marge), float(haut + marge)
+
+
+def _densites(zs, hauteur):
+    """
+    Densités de nœuds le long de x et de y, une valeur par intervalle de la grille
+    fine : sqrt(|z''|) en coordonnées normalisées (répartition qui minimise l'écart
+    d'une interpolation linéaire), dérivée croisée comprise, maximum sur l'autre axe.
+    """
+    n = zs.shape[0] - 1
+    with np.errstate(invalid='ignore'):
+        croisees = np.abs(np.diff(np.diff(zs, axis=0), axis=1)) * n ** 2 / hauteur
+        courbures = [np.abs(np.diff(zs, 2, axis=axe)) * n ** 2 / hauteur for axe in (0, 1)]
+    densites = []
+    for axe in (0, 1):
+        # NaN (trous) ignorés ; la courbure (n - 1 valeurs) est ramenée aux n intervalles
+        courbure = np.max(np.nan_to_num(courbures[axe], nan=0.0, posinf=0.0), axis=1 - axe)
+        courbure = np.concatenate([courbure[:1], (courbure[:-1] + courbure[1:]) / 2, courbure[-1:]])
+        croisee = np.max(np.nan_to_num(croisees, nan=0.0, posinf=0.0), axis=1 - axe)
+        densites.append(np.sqrt(np.maximum(courbure, croisee)))
+    return densites
+
+
+def _noeuds(bornes, densite, n):
+    """n nœuds de [a, b] équirépartissant la densité (constante par intervalle de la grille fine)."""
+    a, b = bornes
+    fins = np.linspace(a, b, len(densite) + 1)
+    cumul = np.concatenate([[0.0], np.cumsum(densite)])
+    noeuds = np.interp(np.linspace(0, cumul[-1], n), cumul, fins)
+    noeuds[0], noeuds[-1] = a, b
+    return noeuds
+
+
+def maillage_adaptatif(f_num, domaine_x, domaine_y, max_sommets=MAX_SOMMETS):
+    """
+    Maillage de f_num(x, y) sur domaine_x × domaine_y, resserré où le gradient varie vite.
+
+    Args:
+        f_num: Fonction lambdifiée de (x, y)
+        domaine_x, domaine_y: Intervalles (min, max)
+        max_sommets: Nombre maximal de sommets nx * ny (au moins MIN_NOEUDS²)
+
+    Returns:
+        (xs, ys, Z) : nœuds croissants sur chaque axe, Z[i, j] = f(xs[i], ys[j]) (NaN si invalide)
+    """
+    with np.errstate(all='ignore'):
+        _, _, zs, valides = evaluer_grille(f_num, domaine_x, domaine_y, RESOLUTION_COURBURES)
+    fenetre = _fenetre_z(zs[valides])
+    if fenetre is not None:
+        # Singularités écrêtées : elles n'attirent pas tous les nœuds
+        zs = np.clip(zs, *fenetre)
+        hauteur = fenetre[1] - fenetre[0]
+    else:
+        hauteur = 1.0
+    densite_x, densite_y = _densites(zs, hauteur)
+
+    # Nœuds nécessaires par axe : écart d'interpolation ≈ (∫ sqrt|z''|)² / (8 n²)
+    besoins = [MIN_NOEUDS if not densite.any() else
+               max(MIN_NOEUDS, int(np.ceil(densite.mean() / np.sqrt(8 * TOLERANCE))) + 1)
+               for densite in (densite_x, densite_y)]
+    # Plancher : aucune zone sans nœud
+    plancher = 0.1 * max(densite_x.mean(), densite_y.mean()) or 1.0
+    densite_x, densite_y = densite_x + plancher, densite_y + plancher
+
+    # Au-delà du budget, sommets répartis entre les axes selon leurs variations
+    n_x, n_y = besoins
+    if n_x * n_y > max_sommets:
+        n_x = int(np.sqrt(max_sommets * densite_x.mean() / densite_y.mean()))
+        n_x = min(max(n_x, MIN_NOEUDS), besoins[0], max(MIN_NOEUDS, max_sommets // MIN_NOEUDS))
+        n_y = min(besoins[1], max(MIN_NOEUDS, max_sommets // n_x))
+
+    xs = _noeuds(domaine_x, densite_x, n_x)
+    ys = _noeuds(domaine_y, densite_y, n_y)
+    X, Y = np.meshgrid(xs, ys, indexing='ij')
+    with np.errstate(all='ignore'):
+        Z, valides = evaluer(f_num, X, Y)
+    Z[~valides] = np.nan
+    return xs, ys, Z
+
+
+def table_tikz(xs, ys, Z, chiffres=CHIFFRES):
+    """
+    Corps d'un \\addplot3 table : en-tête 'x y z' puis une ligne par sommet, x variant
+    le plus vite (mesh/cols = len(xs)), nan pour les trous (unbounded coords=jump).
+    """
+    colonnes_x = [nombre_tikz(x, chiffres) for x in xs]
+    lignes = ["x y z"]
+    for j, y in enumerate(ys):
+        ligne_y = nombre_tikz(y, chiffres)
+        lignes.extend(f"{x} {ligne_y} {nombre_tikz(Z[i, j], chiffres)}" for i, x in enumerate(colonnes_x))
+    return "\n".join(lignes)
@@ -0,0 +1,256 @@
+"""
+Métriques du pipeline de génération (format texte Prometheus), sans dépendance externe.
+
+Les histogrammes mesurent la durée de chaque étape (parse LaTeX, détection des
+intégrales, convergence, intégration numérique, appels solve/limit, choix du
+domaine, échantillonnage, rendu TikZ, formes géométriques, compilation des
+évaluateurs) ; les compteurs suivent les lignes, les caches (résultats,
+évaluateurs), les timeouts et les erreurs.
+
+Les étapes peuvent s'imbriquer (un échantillonnage contient des appels solve) :
+chaque histogramme mesure sa propre étape, les durées ne s'additionnent pas. Au
+sein d'un même histogramme en revanche, la durée d'une mesure imbriquée est retirée
+de celle qui l'englobe : chaque étape du pipeline ne compte que sa durée propre.
+
+Les processus de travail accumulent leurs mesures localement et les renvoient au
+parent sous forme de delta (extraire / fusionner).
+"""
+
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+
+# Bornes des histogrammes (secondes)
+BORNES_DEFAUT = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _formater_labels(noms, valeurs, supplement=None):
+    paires = list(zip(noms, valeurs))
+    if supplement:
+        paires.append(supplement)
+    if not paires:
+        return ''
+    return '{' + ','.join(f'{nom}="{valeur}"' for nom, valeur in paires) + '}'
+
+
+def _formater_nombre(valeur):
+    if valeur == float('inf'):
+        return '+Inf'
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+class Compteur:
+    """Compteur monotone, éventuellement décliné par labels."""
+
+    type = 'counter'
+
+    def __init__(self, nom, aide, labels=()):
+        self.nom = nom
+        self.aide = aide
+        self.labels = tuple(labels)
+        self.series = {}  # valeurs des labels -> total
+        self._verrou = threading.Lock()
+
+    def _cle(self, labels):
+        return tuple(str(labels.get(nom, '')) for nom in self.labels)
+
+    def incrementer(self, valeur=1, **labels):
+        if not _actif:
+            return
+        cle = self._cle(labels)
+        with self._verrou:
+            self.series[cle] = self.series.get(cle, 0) + valeur
+
+    def _fusionner_serie(self, cle, serie):
+        self.series[cle] = self.series.get(cle, 0) + serie
+
+    def _exporter(self):
+        return [f"{self.nom}{_formater_labels(self.labels, cle)} {_formater_nombre(total)}"
+                for cle, total in sorted(self.series.items())]
+
+
+class Histogramme(Compteur):
+    """Histogramme de durées (secondes), éventuellement décliné par labels."""
+
+    type = 'histogram'
+
+    def __init__(self, nom, aide, labels=(), bornes=BORNES_DEFAUT):
+        super().__init__(nom, aide, labels)
+        self.bornes = tuple(bornes)
+
+    def observer(self, valeur, **labels):
+        if not _actif:
+            return
+        cle = self._cle(labels)
+        with self._verrou:
+            serie = self.series.get(cle)
+            if serie is None:
+                # [effectifs par borne (+Inf en dernier), somme, nombre]
+                serie = self.series[cle] = [[0] * (len(self.bornes) + 1), 0.0, 0]
+            serie[0][bisect.bisect_left(self.bornes, valeur)] += 1
+            serie[1] += valeur
+            serie[2] += 1
+
+    def _fusionner_serie(self, cle, serie):
+        actuelle = self.series.get(cle)
+        if actuelle is None:
+            self.series[cle] = [list(serie[0]), serie[1], serie[2]]
+            return
+        actuelle[0] = [a + b for a, b in zip(actuelle[0], serie[0])]
+        actuelle[1] += serie[1]
+        actuelle[2] += serie[2]
+
+    def _exporter(self):
+        lignes = []
+        for cle, (effectifs, somme, nombre) in sorted(self.series.items()):
+            cumul = 0
+            for borne, effectif in zip(self.bornes + (float('inf'),), effectifs):
+                cumul += effectif
+                labels = _formater_labels(self.labels, cle, ('le', _formater_nombre(borne)))
+                lignes.append(f"{self.nom}_bucket{labels} {cumul}")
+            labels = _formater_labels(self.labels, cle)
+            lignes.append(f"{self.nom}_sum{labels} {_formater_nombre(somme)}")
+            lignes.append(f"{self.nom}_count{labels} {nombre}")
+        return lignes
+
+
+class Registre:
+    """Ensemble des métriques d'un processus."""
+
+    def __init__(self):
+        self._metriques = {}
+        self._verrou = threading.Lock()
+
+    def _obtenir(self, classe, nom, *args, **kwargs):
+        with self._verrou:
+            if nom not in self._metriques:
+                self._metriques[nom] = classe(nom, *args, **kwargs)
+            return self._metriques[nom]
+
+    def compteur(self, nom, aide, labels=()):
+        return self._obtenir(Compteur, nom, aide, labels)
+
+    def histogramme(self, nom, aide, labels=(), bornes=BORNES_DEFAUT):
+        return self._obtenir(Histogramme, nom, aide, labels, bornes)
+
+    def exporter(self):
+        """Texte au format d'exposition Prometheus (version 0.0.4)."""
+        with self._verrou:
+            metriques = sorted(self._metriques.values(), key=lambda m: m.nom)
+        lignes = []
+        for metrique in metriques:
+            with metrique._verrou:
+                lignes.append(f"# HELP {metrique.nom} {metrique.aide}")
+                lignes.append(f"# TYPE {metrique.nom} {metrique.type}")
+                lignes.extend(metrique._exporter())
+        return '\n'.join(lignes) + '\n'
+
+    def extraire(self):
+        """
+        Retourne les mesures accumulées depuis le dernier appel et les remet à zéro.
+
+        Returns:
+            dict nom -> (type, aide, labels, bornes, séries), transmissible entre processus
+        """
+        delta = {}
+        with self._verrou:
+            metriques = list(self._metriques.values())
+        for metrique in metriques:
+            with metrique._verrou:
+                if metrique.series:
+                    delta[metrique.nom] = (metrique.type, metrique.aide, metrique.labels,
+                                           getattr(metrique, 'bornes', None), metrique.series)
+                    metrique.series = {}
+        return delta
+
+    def fusionner(self, delta):
+        """Ajoute un delta (voir extraire) produit par un autre processus."""
+        for nom, (type_metrique, aide, labels, bornes, series) in (delta or {}).items():
+            if type_metrique == Histogramme.type:
+                metrique = self.histogramme(nom, aide, labels, bornes)
+            else:
+                metrique = self.compteur(nom, aide, labels)
+            with metrique._verrou:
+                for cle, serie in series.items():
+                    metrique._fusionner_serie(cle, serie)
+
+
+REGISTRE = Registre()
+_actif = True
+
+ETAPES = REGISTRE.histogramme(
+    'tikz_etape_duree_secondes', "Durée des étapes du pipeline de génération", labels=('etape',))
+APPELS_SYMBOLIQUES = REGISTRE.histogramme(
+    'tikz_appel_symbolique_duree_secondes', "Durée des appels SymPy solve/limit", labels=('appel',))
+FORMES = REGISTRE.histogramme(
+    'tikz_forme_duree_secondes', "Durée de génération des formes géométriques", labels=('commande',))
+LIGNES = REGISTRE.histogramme(
+    'tikz_ligne_duree_secondes', "Durée de génération d'une ligne (hors cache)")
+LIGNES_TOTAL = REGISTRE.compteur(
+    'tikz_lignes_total', "Lignes traitées par statut", labels=('statut',))
+CACHE_HITS = REGISTRE.compteur('tikz_cache_hits_total', "Lignes servies depuis le cache")
+CACHE_MISSES = REGISTRE.compteur('tikz_cache_misses_total', "Lignes absentes du cache")
+TIMEOUTS = REGISTRE.compteur('tikz_timeouts_total', "Lignes interrompues (budget de temps dépassé)")
+ERREURS = REGISTRE.compteur('tikz_erreurs_total', "Erreurs de génération")
+COMPILATIONS = REGISTRE.histogramme(
+    'tikz_compilation_duree_secondes', "Durée de compilation des évaluateurs numériques (lambdify)")
+EVALUATEURS_HITS = REGISTRE.compteur('tikz_evaluateurs_hits_total', "Évaluateurs compilés servis depuis le cache")
+EVALUATEURS_MISSES = REGISTRE.compteur('tikz_evaluateurs_misses_total', "Évaluateurs compilés (absents du cache)")
+SORTIES_DEGRADEES = REGISTRE.compteur(
+    'tikz_sorties_degradees_total', "Sorties TikZ dégradées (ou hors budget) faute de budget de taille",
+    labels=('generateur',))
+
+
+# Mesures en cours du fil d'exécution : [histogramme, durée des mesures imbriquées]
+_en_cours = threading.local()
+
+
+@contextmanager
+def chronometrer(histogramme, **labels):
+    """
+    Mesure la durée propre du bloc dans l'histogramme : les mesures du même
+    histogramme imbriquées dans le bloc en sont retirées.
+    """
+    pile = _en_cours.__dict__.setdefault('pile', [])
+    mesure = [histogramme, 0.0]
+    pile.append(mesure)
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        duree = time.perf_counter() - debut
+        pile.pop()
+        for englobante in reversed(pile):
+            if englobante[0] is histogramme:
+                englobante[1] += duree
+                break
+        histogramme.observer(duree - mesure[1], **labels)
+
+
+def mesurer(histogramme, **labels):
+    """Décorateur : mesure la durée propre de chaque appel de la fonction (voir chronometrer)."""
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            with chronometrer(histogramme, **labels):
+                return fonction(*args, **kwargs)
+        return enveloppe
+    return decorateur
+
+
+@contextmanager
+def desactivees():
+    """Suspend l'enregistrement des mesures (préchauffage)."""
+    global _actif
+    precedent, _actif = _actif, False
+    try:
+        yield
+    finally:
+        _actif = precedent
+
+
+def formater_jauge(nom, aide, valeur):
+    """Jauge ponctuelle au format Prometheus (valeurs lues au moment de l'export)."""
+    return f"# HELP {nom} {aide}\n# TYPE {nom} gauge\n{nom} {_formater_nombre(valeur)}\n"
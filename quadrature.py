@@ -0,0 +1,337 @@
+"""
+Quadrature adaptative de Gauss–Kronrod (G7/K15), vectorisée.
+
+Tous les sous-intervalles à raffiner sont évalués en un seul appel NumPy
+(15 nœuds par sous-intervalle). L'erreur d'un sous-intervalle est l'écart
+entre les règles de Kronrod à 15 points et de Gauss à 7 points ; ceux dont
+l'erreur dépasse leur part de la tolérance sont coupés en deux.
+
+Les bornes infinies sont ramenées à un intervalle fini par changement de
+variable (x = a + t/(1-t), x = t/(1-t²)) ; les singularités connues servent de
+points de coupure. Chaque segment entre deux coupures est parcouru par
+x = p + w·(3u² - 2u³), dont le jacobien s'annule aux extrémités : les
+singularités algébriques aux bornes (1/√x, ln x) deviennent régulières et ne
+demandent plus une bissection jusqu'à la précision machine.
+"""
+
+import math
+
+import numpy as np
+
+from echantillonnage import evaluer
+
+# Nœuds positifs de Kronrod (le dernier est le centre) ; les indices impairs sont les nœuds de Gauss
+_XGK = (0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+        0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+        0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+        0.207784955007898467600689403773245, 0.000000000000000000000000000000000)
+_WGK = (0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+        0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+        0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+        0.204432940075298892414161999234649, 0.209482141084727828012999174891714)
+_WG = (0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+       0.381830050505118944950369775488975, 0.417959183673469387755102040816327)
+
+# Les 15 nœuds sur [-1, 1] et les poids correspondants (Gauss : 0 hors de ses 7 nœuds)
+NOEUDS = np.array([-x for x in _XGK[:-1]] + list(_XGK[::-1]))
+POIDS_KRONROD = np.array(list(_WGK[:-1]) + list(_WGK[::-1]))
+_wg_complets = [0.0] * 8
+for _i, _w in zip((1, 3, 5, 7), _WG):
+    _wg_complets[_i] = _w
+POIDS_GAUSS = np.array(_wg_complets[:-1] + _wg_complets[::-1])
+
+# Tolérances par défaut (la plus grande des deux est visée)
+TOLERANCE = 1e-10
+TOLERANCE_RELATIVE = 1e-10
+
+# Nombre maximal de sous-intervalles (15 évaluations chacun)
+MAX_INTERVALLES = 2000
+
+
+def _kronrod(g, gauches, droites):
+    """Intégrales (Kronrod 15 points) et erreurs estimées |K15 - G7| de g sur chaque sous-intervalle."""
+    centres = (gauches + droites) / 2
+    demi_largeurs = (droites - gauches) / 2
+    points = centres[:, None] + demi_largeurs[:, None] * NOEUDS[None, :]
+    valeurs, valides = evaluer(g, points)
+    valeurs[~valides] = np.nan
+    kronrod = demi_largeurs * (valeurs @ POIDS_KRONROD)
+    gauss = demi_largeurs * (valeurs @ POIDS_GAUSS)
+    return kronrod, np.abs(kronrod - gauss)
+
+
+def _changement_variable(f_num, a, b):
+    """
+    Ramène [a, b] (bornes éventuellement infinies) à un intervalle fini.
+
+    Returns:
+        (g, t_a, t_b, vers_t) : intégrande transformée (jacobien inclus), bornes
+        transformées et image d'un point de ]a, b[
+    """
+    if math.isinf(a) and math.isinf(b):
+        # x = t / (1 - t²), t ∈ ]-1, 1[
+        def g(t):
+            return f_num(t / (1 - t * t)) * (1 + t * t) / (1 - t * t) ** 2
+        return g, -1.0, 1.0, lambda x: 2 * x / (1 + math.sqrt(1 + 4 * x * x))
+    if math.isinf(b):
+        # x = a + t / (1 - t), t ∈ [0, 1[
+        def g(t):
+            return f_num(a + t / (1 - t)) / (1 - t) ** 2
+        return g, 0.0, 1.0, lambda x: (x - a) / (1 + x - a)
+    if math.isinf(a):
+        # x = b - t / (1 - t), t ∈ [0, 1[
+        def g(t):
+            return f_num(b - t / (1 - t)) / (1 - t) ** 2
+        return g, 0.0, 1.0, lambda x: (b - x) / (1 + b - x)
+    return f_num, a, b, lambda x: x
+
+
+def _segments(g, coupures):
+    """
+    Intégrande sur [0, n] (n segments) : le segment k = [p, p + w] est parcouru par
+    s ∈ [k, k + 1], x = p + w·(3u² - 2u³) avec u = s - k.
+    """
+    origines = np.array(coupures[:-1])
+    largeurs = np.diff(coupures)
+
+    def h(s):
+        k = np.clip(np.floor(s), 0, len(origines) - 1).astype(int)
+        u = s - k
+        return g(origines[k] + largeurs[k] * u * u * (3 - 2 * u)) * largeurs[k] * 6 * u * (1 - u)
+    return h
+
+
+def integrer(f_num, a, b, points_singuliers=(), tolerance=TOLERANCE, tolerance_relative=TOLERANCE_RELATIVE,
+             max_intervalles=MAX_INTERVALLES):
+    """
+    Intégrale de f_num sur [a, b] par quadrature adaptative de Gauss–Kronrod.
+
+    Args:
+        f_num: Fonction lambdifiée d'une variable
+        a, b: Bornes (±inf acceptés)
+        points_singuliers: Abscisses de singularités connues, utilisées comme points de coupure
+        tolerance: Erreur absolue visée
+        tolerance_relative: Erreur relative visée
+        max_intervalles: Nombre maximal de sous-intervalles
+
+    Returns:
+        dict avec 'value', 'error' (erreur estimée), 'evaluations', 'intervals' et
+        'converged' (vrai si la tolérance est atteinte avec une valeur finie)
+    """
+    if a == b:
+        return {"value": 0.0, "error": 0.0, "evaluations": 0, "intervals": 0, "converged": True}
+    if a > b:
+        resultat = integrer(f_num, b, a, points_singuliers, tolerance, tolerance_relative, max_intervalles)
+        resultat["value"] = -resultat["value"]
+        return resultat
+
+    g, t_a, t_b, vers_t = _changement_variable(f_num, float(a), float(b))
+    coupures = sorted({t_a, t_b} | {vers_t(float(p)) for p in points_singuliers if a < p < b})
+    g = _segments(g, coupures)
+    gauches = np.arange(len(coupures) - 1, dtype=float)
+    droites = gauches + 1
+    valeurs, erreurs = _kronrod(g, gauches, droites)
+    evaluations = valeurs.size * len(NOEUDS)
+
+    while True:
+        total, erreur = valeurs.sum(), erreurs.sum()
+        cible = max(tolerance, tolerance_relative * abs(total)) if np.isfinite(total) else tolerance
+        if erreur <= cible or len(valeurs) >= max_intervalles:
+            break
+
+        # Couper les sous-intervalles dont l'erreur dépasse leur part de la tolérance (les pires d'abord)
+        ordre = np.argsort(-np.nan_to_num(erreurs, nan=np.inf))
+        a_couper = ordre[~(erreurs[ordre] <= cible / len(erreurs))][:max_intervalles - len(valeurs)]
+        milieux = (gauches[a_couper] + droites[a_couper]) / 2
+        # Sous-intervalles trop étroits pour être coupés (précision machine)
+        divisibles = (milieux > gauches[a_couper]) & (milieux < droites[a_couper])
+        a_couper, milieux = a_couper[divisibles], milieux[divisibles]
+        if not a_couper.size:
+            break
+
+        nouvelles_gauches = np.concatenate([gauches[a_couper], milieux])
+        nouvelles_droites = np.concatenate([milieux, droites[a_couper]])
+        nouvelles_valeurs, nouvelles_erreurs = _kronrod(g, nouvelles_gauches, nouvelles_droites)
+        evaluations += nouvelles_valeurs.size * len(NOEUDS)
+
+        gardes = np.ones(len(valeurs), dtype=bool)
+        gardes[a_couper] = False
+        gauches = np.concatenate([gauches[gardes], nouvelles_gauches])
+        droites = np.concatenate([droites[gardes], nouvelles_droites])
+        valeurs = np.concatenate([valeurs[gardes], nouvelles_valeurs])
+        erreurs = np.concatenate([erreurs[gardes], nouvelles_erreurs])
+
+    return {
+        "value": float(total),
+        "error": float(erreur),
+        "evaluations": int(evaluations),
+        "intervals": int(len(valeurs)),
+        "converged": bool(np.isfinite(total) and erreur <= cible),
+    }
+
+
+# Cubature (2D, 3D) : tolérances par défaut et nombre maximal d'évaluations de l'intégrande
+TOLERANCE_MULTIPLE = 1e-8
+TOLERANCE_RELATIVE_MULTIPLE = 1e-8
+MAX_EVALUATIONS_MULTIPLE = 1_000_000
+
+# Nombre maximal de points évalués en un appel (les boîtes sont traitées par paquets)
+POINTS_PAR_APPEL = 250_000
+
+
+def _borne(borne, coordonnees):
+    """Valeur d'une borne : constante ou fonction des coordonnées déjà placées."""
+    return borne(*coordonnees) if callable(borne) else borne
+
+
+def _placer(a, b, v):
+    """
+    Coordonnée entre a et b (bornes éventuellement infinies) pour v ∈ [0, 1] et
+    sa dérivée dx/dv.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    w = 2 * v - 1
+    cas = [
+        (np.isfinite(a) & np.isfinite(b), lambda: (a + (b - a) * v, b - a)),
+        (np.isfinite(a) & np.isinf(b), lambda: (a + v / (1 - v), 1 / (1 - v) ** 2)),
+        (np.isinf(a) & np.isfinite(b), lambda: (b - (1 - v) / v, 1 / v ** 2)),
+        (np.isinf(a) & np.isinf(b), lambda: (w / (1 - w * w), 2 * (1 + w * w) / (1 - w * w) ** 2)),
+    ]
+    x = np.full(np.broadcast(a, v).shape, np.nan)
+    dx = np.full(x.shape, np.nan)
+    for masque, formule in cas:
+        masque = np.broadcast_to(masque, x.shape)
+        if masque.any():
+            valeur, derivee = formule()
+            x = np.where(masque, valeur, x)
+            dx = np.where(masque, derivee, dx)
+    return x, dx
+
+
+def _vers_cube(f_num, bornes):
+    """
+    Intégrande sur le cube unité : chaque coordonnée u_i est lissée (3u² - 2u³,
+    comme en 1D) puis placée entre ses bornes, qui peuvent dépendre des
+    coordonnées précédentes ; le jacobien est le produit des dérivées.
+    """
+    def g(*u):
+        coordonnees = []
+        jacobien = 1.0
+        for (inf, sup), ui in zip(bornes, u):
+            x, dx = _placer(_borne(inf, coordonnees), _borne(sup, coordonnees), ui * ui * (3 - 2 * ui))
+            coordonnees.append(x)
+            jacobien = jacobien * dx * 6 * ui * (1 - ui)
+        return f_num(*coordonnees) * jacobien
+    return g
+
+
+def _contracter(valeurs, poids_par_axe):
+    """Somme pondérée sur les axes 1..d (un vecteur de poids par axe)."""
+    for poids in reversed(poids_par_axe):
+        valeurs = valeurs @ poids
+    return valeurs
+
+
+def _regle_produit(g, bas, hauts):
+    """
+    Règle produit K15^d sur chaque boîte [bas, hauts] (tableaux (B, d)).
+
+    Returns:
+        (valeurs, erreurs, axes) : intégrales K15^d, erreurs |K15^d - G7^d| et axe
+        dont la règle de Gauss s'écarte le plus (axe à couper)
+    """
+    nombre, dimension = bas.shape
+    centres = (bas + hauts) / 2
+    demi = (hauts - bas) / 2
+    grilles = np.meshgrid(*([NOEUDS] * dimension), indexing='ij')
+    points = [centres[:, i, None] + demi[:, i, None] * grilles[i].ravel()[None, :] for i in range(dimension)]
+    brutes, valides = evaluer(g, *points)
+    brutes[~valides] = np.nan
+    brutes = brutes.reshape((nombre,) + (len(NOEUDS),) * dimension)
+
+    volume = np.prod(demi, axis=1)
+    kronrod = volume * _contracter(brutes, [POIDS_KRONROD] * dimension)
+    gauss = volume * _contracter(brutes, [POIDS_GAUSS] * dimension)
+    ecarts = np.stack([np.abs(kronrod - volume * _contracter(
+        brutes, [POIDS_GAUSS if j == i else POIDS_KRONROD for j in range(dimension)]))
+        for i in range(dimension)], axis=1)
+    axes = np.argmax(np.nan_to_num(ecarts, nan=np.inf), axis=1)
+    return kronrod, np.abs(kronrod - gauss), axes
+
+
+def _regle_par_paquets(g, bas, hauts):
+    """_regle_produit par paquets de boîtes (au plus POINTS_PAR_APPEL points par appel)."""
+    par_paquet = max(1, POINTS_PAR_APPEL // len(NOEUDS) ** bas.shape[1])
+    resultats = [_regle_produit(g, bas[i:i + par_paquet], hauts[i:i + par_paquet])
+                 for i in range(0, len(bas), par_paquet)]
+    return tuple(np.concatenate(parties) for parties in zip(*resultats))
+
+
+def integrer_multiple(f_num, bornes, tolerance=TOLERANCE_MULTIPLE, tolerance_relative=TOLERANCE_RELATIVE_MULTIPLE,
+                      max_evaluations=MAX_EVALUATIONS_MULTIPLE):
+    """
+    Intégrale multiple de f_num par cubature adaptative (règle produit de
+    Gauss–Kronrod sur le cube unité, boîtes coupées en deux selon l'axe le plus
+    mal intégré).
+
+    Args:
+        f_num: Fonction lambdifiée, une coordonnée par variable dans l'ordre de `bornes`
+        bornes: [(inf, sup), ...] de la variable la plus extérieure à la plus intérieure ;
+                chaque borne est un nombre (±inf accepté) ou une fonction des
+                coordonnées précédentes (bornes dépendantes, ex. ∫_0^1 ∫_0^x)
+        tolerance: Erreur absolue visée
+        tolerance_relative: Erreur relative visée
+        max_evaluations: Nombre maximal d'évaluations de l'intégrande
+
+    Returns:
+        dict avec 'value', 'error', 'evaluations', 'intervals' (nombre de boîtes) et 'converged'
+    """
+    dimension = len(bornes)
+    g = _vers_cube(f_num, bornes)
+    par_boite = len(NOEUDS) ** dimension
+
+    bas, hauts = np.zeros((1, dimension)), np.ones((1, dimension))
+    valeurs, erreurs, axes = _regle_par_paquets(g, bas, hauts)
+    evaluations = par_boite
+
+    while True:
+        total, erreur = valeurs.sum(), erreurs.sum()
+        cible = max(tolerance, tolerance_relative * abs(total)) if np.isfinite(total) else tolerance
+        # Chaque boîte coupée coûte deux nouvelles règles produit
+        restantes = (max_evaluations - evaluations) // (2 * par_boite)
+        if erreur <= cible or restantes <= 0:
+            break
+
+        # Couper en deux (selon leur axe le plus mal intégré) les boîtes qui dépassent leur part de la tolérance
+        ordre = np.argsort(-np.nan_to_num(erreurs, nan=np.inf))
+        a_couper = ordre[~(erreurs[ordre] <= cible / len(erreurs))][:restantes]
+        lignes, colonnes = a_couper, axes[a_couper]
+        milieux = (bas[lignes, colonnes] + hauts[lignes, colonnes]) / 2
+        divisibles = (milieux > bas[lignes, colonnes]) & (milieux < hauts[lignes, colonnes])
+        lignes, colonnes, milieux = lignes[divisibles], colonnes[divisibles], milieux[divisibles]
+        if not lignes.size:
+            break
+
+        hauts_gauche, bas_droite = hauts[lignes].copy(), bas[lignes].copy()
+        hauts_gauche[np.arange(len(lignes)), colonnes] = milieux
+        bas_droite[np.arange(len(lignes)), colonnes] = milieux
+        nouveaux_bas = np.concatenate([bas[lignes], bas_droite])
+        nouveaux_hauts = np.concatenate([hauts_gauche, hauts[lignes]])
+        nouvelles_valeurs, nouvelles_erreurs, nouveaux_axes = _regle_par_paquets(g, nouveaux_bas, nouveaux_hauts)
+        evaluations += len(nouveaux_bas) * par_boite
+
+        gardes = np.ones(len(valeurs), dtype=bool)
+        gardes[lignes] = False
+        bas = np.concatenate([bas[gardes], nouveaux_bas])
+        hauts = np.concatenate([hauts[gardes], nouveaux_hauts])
+        valeurs = np.concatenate([valeurs[gardes], nouvelles_valeurs])
+        erreurs = np.concatenate([erreurs[gardes], nouvelles_erreurs])
+        axes = np.concatenate([axes[gardes], nouveaux_axes])
+
+    return {
+        "value": float(total),
+        "error": float(erreur),
+        "evaluations": int(evaluations),
+        "intervals": int(len(valeurs)),
+        "converged": bool(np.isfinite(total) and erreur <= cible),
+    }
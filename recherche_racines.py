@@ -0,0 +1,379 @@
+"""
+Recherche numérique des racines, extrema, points d'inflexion et pôles d'une
+fonction d'une variable, sans dépendance autre que NumPy/SymPy.
+
+Principe : évaluation vectorisée sur une grille dense, détection des changements
+de signe (et des minima de |g| pour les racines de multiplicité paire), puis
+raffinement de chaque encadrement par la méthode de Brent. Le temps de calcul est
+borné ; la résolution symbolique (solve) n'est qu'une option, réservée aux
+fractions rationnelles.
+"""
+
+import math
+import time
+
+import numpy as np
+from sympy import E, cos, diff, log, oo, pi, sin, solve, tan
+
+from calcul_symbolique import limite
+from evaluateurs import compiler
+from echantillonnage import echantillonner_1d
+from metriques import APPELS_SYMBOLIQUES, mesurer
+
+solve = mesurer(APPELS_SYMBOLIQUES, appel='solve')(solve)
+
+# Nombre de points de la grille de détection (impair : le centre d'un intervalle symétrique y figure)
+POINTS_GRILLE = 2001
+
+# Temps maximal (secondes) consacré au raffinement des encadrements d'une fonction
+DELAI_RECHERCHE_S = 0.5
+
+# Nombre maximal de résultats retournés (les plus proches de 0 sont gardés)
+MAX_RESULTATS = 100
+
+
+def _valeur(f_num, x):
+    """f(x) en flottant, NaN si l'évaluation échoue ou n'est pas réelle."""
+    try:
+        with np.errstate(all='ignore'):
+            y = complex(f_num(x))
+    except Exception:
+        return math.nan
+    if abs(y.imag) > 1e-12 * max(1.0, abs(y.real)):
+        return math.nan
+    return y.real
+
+
+def brent(f, a, b, fa, fb, tol=1e-12, max_iter=100):
+    """
+    Racine de f dans [a, b] par la méthode de Brent (f(a) et f(b) de signes opposés).
+
+    Returns:
+        Abscisse de la racine
+    """
+    if fa * fb > 0:
+        raise ValueError("f(a) et f(b) doivent être de signes opposés")
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(max_iter):
+        if fb == 0:
+            return b
+        if fa * fb > 0:
+            a, fa = c, fc
+            d = e = b - c
+        if abs(fa) < abs(fb):
+            c, fc = b, fb
+            b, fb = a, fa
+            a, fa = c, fc
+        tol_iter = 2 * np.finfo(float).eps * abs(b) + 0.5 * tol
+        milieu = 0.5 * (a - b)
+        if abs(milieu) <= tol_iter:
+            return b
+        if abs(e) >= tol_iter and abs(fc) > abs(fb):
+            # Interpolation (sécante ou quadratique inverse)
+            s = fb / fc
+            if c == a:
+                p, q = 2 * milieu * s, 1 - s
+            else:
+                q, r = fc / fa, fb / fa
+                p = s * (2 * milieu * q * (q - r) - (b - c) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * milieu * q - abs(tol_iter * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = milieu
+        else:
+            # Bissection
+            d = e = milieu
+        c, fc = b, fb
+        b += d if abs(d) > tol_iter else math.copysign(tol_iter, milieu)
+        fb = f(b)
+        if math.isnan(fb):
+            return b
+    return b
+
+
+def _minimum_abs(f, a, b, tol=1e-12, max_iter=100):
+    """Minimum de |f| sur [a, b] par section dorée ; retourne (x, |f(x)|)."""
+    ratio = (math.sqrt(5) - 1) / 2
+    x1, x2 = b - ratio * (b - a), a + ratio * (b - a)
+    f1, f2 = abs(f(x1)), abs(f(x2))
+    for _ in range(max_iter):
+        if b - a <= tol * max(1.0, abs(a) + abs(b)):
+            break
+        if f1 <= f2:
+            b, x2, f2 = x2, x1, f1
+            x1 = b - ratio * (b - a)
+            f1 = abs(f(x1))
+        else:
+            a, x1, f1 = x1, x2, f2
+            x2 = a + ratio * (b - a)
+            f2 = abs(f(x2))
+    return (x1, f1) if f1 <= f2 else (x2, f2)
+
+
+def dedupliquer(valeurs, tolerance):
+    """Trie et fusionne les valeurs distantes de moins de `tolerance`."""
+    uniques = []
+    for valeur in sorted(valeurs):
+        if not uniques or valeur - uniques[-1] > tolerance:
+            uniques.append(valeur)
+    return uniques
+
+
+def racines(f_num, a, b, points=POINTS_GRILLE, delai=DELAI_RECHERCHE_S, max_resultats=MAX_RESULTATS):
+    """
+    Racines réelles de f_num dans [a, b].
+
+    Les changements de signe entre points valides consécutifs sont raffinés par Brent ;
+    un encadrement dont la valeur ne s'annule pas (pôle, comme 1/x en 0) est écarté.
+    Les racines de multiplicité paire (x^2) sont cherchées aux minima locaux de |f|.
+
+    Args:
+        f_num: Fonction lambdifiée d'une variable
+        a, b: Intervalle de recherche (fini)
+        points: Nombre de points de la grille de détection
+        delai: Temps maximal de raffinement (secondes) ; les racines déjà trouvées sont retournées
+        max_resultats: Nombre maximal de racines (les plus proches de 0)
+
+    Returns:
+        Liste triée des racines (flottants)
+    """
+    return _rechercher(f_num, a, b, points, delai, max_resultats)[0]
+
+
+def _rechercher(f_num, a, b, points, delai, max_resultats):
+    """Voir racines ; retourne aussi un indicateur vrai si la recherche n'a été ni interrompue ni tronquée."""
+    debut = time.perf_counter()
+    xs, ys, valides = echantillonner_1d(f_num, a, b, points)
+    f = lambda x: _valeur(f_num, x)
+    pas = (b - a) / max(1, points - 1)
+
+    # Zéros exacts sur la grille
+    trouvees = [float(v) for v in xs[valides & (ys == 0)]]
+
+    # Changements de signe stricts entre points valides consécutifs
+    paires = valides[:-1] & valides[1:]
+    signes = np.sign(ys)
+    changements = np.nonzero(paires & (signes[:-1] * signes[1:] < 0))[0]
+
+    # Minima locaux de |f| sans changement de signe (racines doubles)
+    absolues = np.abs(ys)
+    minima = np.nonzero(paires[:-1] & paires[1:]
+                        & (absolues[1:-1] < absolues[:-2]) & (absolues[1:-1] <= absolues[2:])
+                        & (signes[:-2] == signes[1:-1]) & (signes[1:-1] == signes[2:])
+                        & (ys[1:-1] != 0))[0] + 1
+
+    for i in changements:
+        if time.perf_counter() - debut > delai:
+            break
+        racine = brent(f, xs[i], xs[i + 1], ys[i], ys[i + 1], tol=1e-12 * max(1.0, abs(xs[i])))
+        echelle = max(1.0, abs(ys[i]), abs(ys[i + 1]))
+        if abs(f(racine)) <= 1e-6 * echelle:
+            trouvees.append(float(racine))
+
+    for i in minima:
+        if time.perf_counter() - debut > delai:
+            break
+        x_min, f_min = _minimum_abs(f, xs[i - 1], xs[i + 1])
+        echelle = max(1.0, absolues[i - 1], absolues[i + 1])
+        if f_min <= 1e-10 * echelle:
+            trouvees.append(float(x_min))
+
+    trouvees = dedupliquer(trouvees, tolerance=max(1e-9, 1e-3 * pas))
+    complete = time.perf_counter() - debut <= delai and len(trouvees) <= max_resultats
+    if len(trouvees) > max_resultats:
+        trouvees = sorted(sorted(trouvees, key=abs)[:max_resultats])
+    return trouvees, complete
+
+
+def _solutions_reelles(equation, x, a, b):
+    """Solutions réelles de equation = 0 dans [a, b] par solve (fractions rationnelles uniquement)."""
+    solutions = []
+    for solution in solve(equation, x):
+        if solution.is_real:
+            valeur = float(solution.evalf())
+            if a <= valeur <= b:
+                solutions.append(valeur)
+    return sorted(solutions)
+
+
+def logarithmes_naturels(expr):
+    """
+    Réécrit log(u, b) (forme non évaluée produite par parse_latex pour \\ln et \\log_b)
+    en log(u)/log(b) : NumPy interpréterait la base comme tableau de sortie.
+    """
+    return expr.replace(lambda e: isinstance(e, log) and len(e.args) == 2,
+                        lambda e: log(e.args[0]) / log(e.args[1]))
+
+
+def constantes_latex(expr, x):
+    """
+    Remplace les symboles e et pi (parse_latex lit e^{...} et \\pi comme des symboles)
+    par les constantes E et π, sauf s'il s'agit de la variable x.
+    """
+    return expr.subs({symbole: valeur for symbole in expr.free_symbols if symbole != x
+                      for nom, valeur in (('e', E), ('pi', pi)) if symbole.name == nom})
+
+
+class AnalyseCaracteristiques:
+    """
+    Caractéristiques d'une fonction d'une variable (dérivées, racines, points
+    critiques et d'inflexion, asymptotes, périodicité), calculées à la demande et
+    au plus une fois chacune, partagées entre le choix du domaine, les bornes et le tracé.
+
+    Une recherche sur [a, b] incluse dans un intervalle déjà exploré (et dont la
+    recherche n'a été ni interrompue ni tronquée) est extraite du résultat existant.
+    """
+
+    # Équation dont les solutions forment chaque caractéristique
+    EQUATIONS = {
+        'racines': 0,
+        'points_critiques': 1,
+        'points_inflexion': 2,
+        'asymptotes_verticales': 'denominateur',
+    }
+
+    def __init__(self, expr, x, symbolique=False, points=POINTS_GRILLE, delai=DELAI_RECHERCHE_S):
+        """
+        Args:
+            expr: Expression SymPy d'une variable
+            x: Symbole de la variable
+            symbolique: Si vrai et si expr est une fraction rationnelle en x (sans autre
+                        symbole), résoudre exactement avec solve au lieu de la recherche
+                        numérique. Une expression à paramètres libres n'a pas de
+                        caractéristiques numériques : aucune n'est retournée
+            points: Nombre de points de la grille de détection
+            delai: Temps maximal de raffinement par équation (secondes)
+        """
+        self.expr = logarithmes_naturels(constantes_latex(expr, x))
+        self.x = x
+        self.points = points
+        self.delai = delai
+        self.parametree = bool(self.expr.free_symbols - {x})
+        self.exacte = symbolique and not self.parametree and self.expr.is_rational_function(x)
+
+        self._derivees = {0: self.expr}
+        self._denominateur = None
+        self._recherches = {}  # nom -> [(a, b, solutions, complete)]
+        self._asymptotes_horizontales = None
+        self._periode = False  # False : pas encore calculée (None : non périodique)
+
+    def derivee(self, ordre):
+        """Dérivée d'ordre `ordre` (calculée une fois, à partir de la précédente)."""
+        if ordre not in self._derivees:
+            self._derivees[ordre] = diff(self.derivee(ordre - 1), self.x)
+        return self._derivees[ordre]
+
+    @property
+    def denominateur(self):
+        if self._denominateur is None:
+            self._denominateur = self.expr.as_numer_denom()[1]
+        return self._denominateur
+
+    def _equation(self, nom):
+        equation = self.EQUATIONS[nom]
+        return self.denominateur if equation == 'denominateur' else self.derivee(equation)
+
+    def _solutions(self, nom, a, b):
+        recherches = self._recherches.setdefault(nom, [])
+        for debut, fin, solutions, complete in recherches:
+            if complete and debut <= a and b <= fin:
+                return [s for s in solutions if a <= s <= b]
+
+        equation = self._equation(nom)
+        solutions, complete = [], True
+        if equation.has(self.x):
+            solutions, complete = self._resoudre(equation, a, b)
+        # Constante : aucune solution isolée
+        recherches.append((a, b, solutions, complete))
+        return list(solutions)
+
+    def _resoudre(self, equation, a, b):
+        if self.parametree:
+            # Non évaluable numériquement (et solve n'est pas borné en temps)
+            return [], True
+        try:
+            if self.exacte:
+                return _solutions_reelles(equation, self.x, a, b), True
+        except Exception:
+            pass
+        try:
+            f_num = compiler(self.x, equation)
+            return _rechercher(f_num, a, b, self.points, self.delai, MAX_RESULTATS)
+        except Exception:
+            return [], True
+
+    def racines(self, a, b):
+        return self._solutions('racines', a, b)
+
+    def points_critiques(self, a, b):
+        return self._solutions('points_critiques', a, b)
+
+    def points_inflexion(self, a, b):
+        return self._solutions('points_inflexion', a, b)
+
+    def asymptotes_verticales(self, a, b):
+        """Zéros du dénominateur dans [a, b]."""
+        return self._solutions('asymptotes_verticales', a, b)
+
+    def points_interessants(self, a, b):
+        """Points critiques, racines, points d'inflexion et asymptotes verticales dans [a, b]."""
+        return (self.points_critiques(a, b) + self.racines(a, b)
+                + self.points_inflexion(a, b) + self.asymptotes_verticales(a, b))
+
+    @property
+    def asymptotes_horizontales(self):
+        """Limites finies en +∞ puis en -∞."""
+        if self._asymptotes_horizontales is None:
+            asymptotes = []
+            try:
+                limites = [limite(self.expr, self.x, borne) for borne in (oo, -oo)]
+                asymptotes = [float(valeur.evalf()) for valeur in limites if valeur.is_finite]
+            except Exception:
+                pass
+            self._asymptotes_horizontales = asymptotes
+        return self._asymptotes_horizontales
+
+    @property
+    def periode(self):
+        """
+        Plus petite période des termes sin/cos/tan d'argument linéaire en x
+        (2π par défaut), None si l'expression n'est pas trigonométrique.
+        """
+        if self._periode is False:
+            periode = None
+            if self.expr.has(sin, cos, tan):
+                periode = 2 * math.pi
+                for terme in self.expr.atoms(sin, cos, tan):
+                    argument = terme.args[0]
+                    if argument.has(self.x):
+                        coefficient = argument.coeff(self.x)
+                        if coefficient is not None and coefficient != 0 and coefficient.is_number:
+                            periode = min(periode, 2 * math.pi / abs(float(coefficient)))
+            self._periode = periode
+        return self._periode
+
+    @property
+    def periodique(self):
+        return self.periode is not None
+
+    def resume(self, a, b):
+        """dict avec 'racines', 'points_critiques', 'points_inflexion', 'asymptotes_verticales' sur [a, b]."""
+        return {nom: self._solutions(nom, a, b) for nom in self.EQUATIONS}
+
+
+def caracteristiques_1d(expr, x, a, b, symbolique=False, points=POINTS_GRILLE, delai=DELAI_RECHERCHE_S):
+    """
+    Racines, points critiques, points d'inflexion et asymptotes verticales
+    (zéros du dénominateur) de expr sur [a, b] (voir AnalyseCaracteristiques).
+
+    Returns:
+        dict avec 'racines', 'points_critiques', 'points_inflexion', 'asymptotes_verticales'
+    """
+    return AnalyseCaracteristiques(expr, x, symbolique=symbolique, points=points, delai=delai).resume(a, b)
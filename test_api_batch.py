@@ -0,0 +1,116 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+from app.generation import MAX_OCTETS_SORTIE
+from app.server import app
+
+print("=" * 80)
+print("TEST DE L'API /api/batch")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+client = app.test_client()
+
+# Test 1: Un résultat par élément, dans l'ordre, avec son id
+print("\n1. Résultats par élément")
+elements = [
+    {"id": "a", "input": "cercle_trigo(45)"},
+    {"id": 2, "input": "x^2", "options": {}},
+    {"id": "c", "input": "polygone(6)"},
+]
+reponse = client.post('/api/batch', json=elements).get_json()
+resultats = reponse['results']
+verifier(reponse['success'] and len(resultats) == 3, "Trois résultats")
+verifier([r['id'] for r in resultats] == ["a", 2, "c"], "Ids et ordre conservés")
+verifier(all(r['status'] == 'ok' and r['tikz'] for r in resultats), "Statut ok et TikZ présent")
+verifier(all(set(r) == {'id', 'status', 'tikz', 'error', 'elapsed_ms', 'cache_hit'} for r in resultats),
+         "Champs id, status, tikz, error, elapsed_ms, cache_hit")
+
+# Test 2: Cache
+print("\n2. Cache")
+reponse = client.post('/api/batch', json={"items": [{"id": 1, "input": "cercle_trigo(45)"}]}).get_json()
+verifier(reponse['results'][0]['cache_hit'], "Élément déjà calculé servi depuis le cache")
+
+# Test 3: Éléments invalides
+print("\n3. Éléments invalides")
+elements = [
+    {"id": 1, "input": ""},
+    {"id": 2, "input": "cube()", "options": {"inconnue": True}},
+    {"id": 3, "input": "cube()", "options": {"budget": -1}},
+    "pas un objet",
+    {"id": 5, "input": "cube()", "options": {"budget": "nan"}},
+    {"id": 6, "input": "cube()", "options": {"budget": "inf"}},
+    {"id": 7, "input": "cube()"},
+]
+resultats = client.post('/api/batch', json=elements).get_json()['results']
+verifier([r['status'] for r in resultats] == ['erreur'] * 6 + ['ok'],
+         "Erreur par élément, le reste du lot est livré")
+verifier('inconnue' in resultats[1]['error'], "Option inconnue signalée")
+verifier('Budget invalide' in resultats[4]['error'] and 'Budget invalide' in resultats[5]['error'],
+         "Budget NaN ou infini refusé")
+for tentative in range(2):
+    resultat = client.post('/api/batch', json=[{"id": 1, "input": "\\frac{1}{"}]).get_json()['results'][0]
+    verifier(resultat['status'] == 'erreur' and resultat['tikz'] is None and resultat['error']
+             and not resultat['cache_hit'], f"Ligne en échec : statut 'erreur', jamais en cache ({tentative + 1})")
+reponse = client.post('/generate', json={"functions": "cube()\n\\frac{1}{"}).get_json()
+verifier(reponse['success'] and "% Erreur pour '\\frac{1}{'" in reponse['result'], "/generate : ligne d'erreur construite")
+for route in ('/generate', '/generate/stream', '/api/batch'):
+    corps = {"functions": "cube()", "items": [{"input": "cube()"}], "budget": "NaN"}
+    reponse = client.post(route, json=corps).get_json()
+    verifier(reponse['success'] is False and 'Budget invalide' in reponse['error'], f"{route} : budget NaN refusé")
+
+# Test 4: Budget de sortie par requête
+print("\n4. Budget de sortie")
+elements = [
+    {"id": 1, "input": "polygone(30)", "options": {"max_octets": 1500}},
+    {"id": 2, "input": "polygone(30)"},
+    {"id": 3, "input": "\\sin(x)", "options": {"max_primitives": 50}},
+    {"id": 4, "input": "cube()", "options": {"max_octets": 0}},
+    {"id": 5, "input": "cube()", "options": {"max_primitives": "beaucoup"}},
+]
+resultats = client.post('/api/batch', json=elements).get_json()['results']
+verifier("% Budget de sortie (1500 octets" in resultats[0]['tikz'], "Option max_octets appliquée")
+verifier("Budget de sortie" not in resultats[1]['tikz'] and not resultats[1]['cache_hit'],
+         "Sans option : budget du serveur, résultat distinct en cache")
+verifier("samples 200→50" in resultats[2]['tikz'], "Option max_primitives appliquée")
+verifier([r['status'] for r in resultats[3:]] == ['erreur'] * 2 and 'max_octets' in resultats[3]['error'],
+         "Budget de sortie invalide refusé")
+reponse = client.post('/api/batch', json={"items": [{"input": "polygone(30)"}], "max_octets": 1500}).get_json()
+verifier(reponse['results'][0]['cache_hit'] and "Budget de sortie" in reponse['results'][0]['tikz'],
+         "Budget du lot appliqué aux éléments, servi depuis le cache")
+reponse = client.post('/api/batch', json={"items": [{"input": "polygone(30)", "options": {"max_primitives": 10}}],
+                                          "max_octets": 1500}).get_json()
+verifier("% Budget de sortie (1500 octets, 10 primitives)" in reponse['results'][0]['tikz'],
+         "Options de l'élément complétées champ par champ par le lot")
+reponse = client.post('/api/batch', json=[{"input": "polygone(30)", "options": {"max_octets": MAX_OCTETS_SORTIE}}]).get_json()
+verifier(reponse['results'][0]['cache_hit'] and "Budget de sortie" not in reponse['results'][0]['tikz'],
+         "Budget égal à celui du serveur : même entrée de cache que sans option")
+reponse = client.post('/generate', json={"functions": "polygone(31)", "max_octets": 1500}).get_json()
+verifier(reponse['success'] and "% Budget de sortie (1500 octets" in reponse['result'], "/generate : max_octets appliqué")
+reponse = client.post('/generate/stream', json={"functions": "\\sin(x)", "max_primitives": 50})
+verifier("samples 200→50" in reponse.get_data(as_text=True), "/generate/stream : max_primitives appliqué")
+reponse = client.post('/generate', json={"functions": "cube()", "max_octets": 1.5}).get_json()
+verifier(reponse['success'] is False and 'max_octets' in reponse['error'], "/generate : max_octets non entier refusé")
+
+# Test 5: Corps invalide
+print("\n5. Corps invalide")
+reponse = client.post('/api/batch', json={"items": []}).get_json()
+verifier(reponse['success'] is False, "Lot vide refusé")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
@@ -0,0 +1,85 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import time
+
+from budget_calcul import BudgetCalcul, IGNORE, NUMERIQUE, SYMBOLIQUE, palier_global
+from analyseur_convergence import FonctionAnalyzer
+from expression_analysee import ExpressionAnalysee
+
+print("=" * 80)
+print("TEST DE L'ANALYSE PAR PALIERS SOUS BUDGET DE TEMPS")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+def integrale(latex):
+    return ExpressionAnalysee(latex).integrales[0]
+
+
+# Test 1: Budget
+print("\n1. BudgetCalcul")
+paliers = {}
+verifier(BudgetCalcul().calculer(paliers, "a", SYMBOLIQUE, lambda: 42) == 42 and paliers["a"] == SYMBOLIQUE,
+         "Budget illimité : étape exécutée et marquée")
+epuise = BudgetCalcul(0)
+verifier(epuise.calculer(paliers, "b", NUMERIQUE, lambda: 1 / 0, defaut=[]) == [] and paliers["b"] == IGNORE,
+         "Budget épuisé : étape sautée, valeur par défaut")
+verifier(BudgetCalcul.depuis(epuise) is epuise, "Un BudgetCalcul est partagé tel quel")
+verifier(palier_global([NUMERIQUE, SYMBOLIQUE]) == SYMBOLIQUE and palier_global([SYMBOLIQUE, IGNORE]) == IGNORE,
+         "Palier global : le moins complet l'emporte")
+
+# Test 2: Fonctions
+print("\n2. Fonctions")
+analyzer = FonctionAnalyzer()
+complet = analyzer.analyser_fonction(r"\frac{x}{x^2-1}")
+verifier(complet["tiers"]["roots"] == NUMERIQUE and complet["tiers"]["asymptotes"]["horizontal"] == SYMBOLIQUE,
+         "Racines numériques, asymptotes horizontales symboliques (limites)")
+debut = time.perf_counter()
+rapide = analyzer.analyser_fonction(r"\frac{x}{x^2-1}", budget=0)
+duree = time.perf_counter() - debut
+verifier(rapide["tiers"]["roots"] == IGNORE and rapide["roots"] == [] and rapide["tiers"]["bounds"] == NUMERIQUE,
+         "Budget nul : caractéristiques sautées, bornes échantillonnées")
+verifier(duree < 0.2, f"Budget nul : réponse en {duree * 1000:.0f} ms")
+surface = analyzer.analyser_fonction(r"x^2 + y^2", budget=0)
+verifier(surface["tiers"]["critical_points"] == IGNORE and surface["tiers"]["domain"] == NUMERIQUE,
+         "Surface : points critiques (solve) sautés")
+verifier(FonctionAnalyzer(budget=0).analyser_fonction(r"x^2")["tiers"]["critical_points"] == IGNORE,
+         "Budget de l'analyseur utilisé par défaut")
+
+# Test 3: Intégrales sans étape symbolique
+print("\n3. Intégrales (repli numérique)")
+r = analyzer._analyze_integral(integrale(r"\int_1^{\infty} \frac{1}{x^2} dx"))
+verifier(r["overall_status"] == "convergent" and r["tiers"]["overall_status"] == SYMBOLIQUE,
+         "Budget illimité : tests symboliques")
+r = analyzer._analyze_integral(integrale(r"\int_1^{\infty} \frac{1}{x^2} dx"), budget=0)
+verifier(r["overall_status"] == "convergent" and r["tiers"]["overall_status"] == NUMERIQUE
+         and r["tiers"]["numerical_value"] == IGNORE, "1/x^2 sur [1, +∞[ : convergente (numérique), valeur sautée")
+r = analyzer._analyze_integral(integrale(r"\int_0^1 \frac{1}{\sqrt{x}} dx"), budget=0)
+verifier(r["overall_status"] == "convergent", "1/√x sur [0, 1] : borne singulière intégrable")
+r = analyzer._analyze_integral(integrale(r"\int_0^1 \frac{1}{x} dx"), budget=0)
+verifier(r["overall_status"] == "divergent", "1/x sur [0, 1] : divergente")
+r = analyzer._analyze_integral(integrale(r"\int_{-1}^{1} \frac{1}{x} dx"), budget=0)
+verifier(r["overall_status"] == "divergent" and r["integral_info"][0]["convergence"]["tiers"]["singularities"] == NUMERIQUE,
+         "Pôle intérieur trouvé par recherche numérique")
+r = analyzer._analyze_integral(integrale(r"\int_0^1 \int_0^x y \, dy \, dx"), budget=0)
+verifier(r["overall_status"] == "unknown" and r["tiers"]["overall_status"] == IGNORE
+         and "Budget de calcul épuisé : convergence non établie" in r["all_warnings"],
+         "Bornes dépendantes : convergence non établie, signalée")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
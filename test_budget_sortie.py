@@ -0,0 +1,105 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import io
+import contextlib
+
+from budget_sortie import BudgetSortie, annoter, compter_primitives, imposer
+from generateur_formes_geometriques import GenerateurFormesGeometriques
+from generateur_graphiques import TikzGraphGenerator
+from metriques import SORTIES_DEGRADEES
+
+print("=" * 80)
+print("TEST DU BUDGET DE SORTIE")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+def generer(generateur, ligne):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generateur.generer_fonction(ligne)
+
+
+def commentaire(code):
+    return next((ligne for ligne in code.splitlines() if ligne.startswith("% Budget de sortie")), None)
+
+
+# Test 1: Comptage des primitives
+print("\n1. Comptage des primitives")
+verifier(compter_primitives("\\draw (0,0) -- (1,1);\n\\fill (0,0) circle (1);\n\\node at (0,0) {$O$};") == 3,
+         "Commandes \\draw, \\fill, \\node")
+verifier(compter_primitives("\\begin{axis}[samples=200,]\n\\addplot[blue] {x^2};") == 200, "samples de l'axe")
+verifier(compter_primitives("\\addplot[samples=50] {x};") == 50, "samples de l'\\addplot")
+verifier(compter_primitives("\\addplot {x};") == 25, "samples par défaut de pgfplots")
+verifier(compter_primitives("\\addplot3[surf, samples=13] {x*y};") == 169, "Surface : samples²")
+verifier(compter_primitives("\\addplot coordinates {\n(0,1) (1,nan) (2,3)\n};") == 3, "Points en coordinates")
+verifier(compter_primitives("\\addplot3[surf] table[meta=z] {\nx y z\n0 0 1\n1 0 2\n};") == 2,
+         "Lignes d'une table, en-tête exclu")
+
+# Test 2: Ajustement par paliers
+print("\n2. Ajustement par paliers")
+verifier(annoter("```tikz\ncode\n```", "% note") == "```tikz\ncode\n% note\n```", "Commentaire avant la clôture du bloc")
+budget = BudgetSortie(max_octets=None, max_primitives=100)
+courbe = lambda samples: f"```tikz\n\\addplot[samples={samples}] {{x}};\n```"
+paliers = [dict(samples=n) for n in (200, 100, 50)]
+verifier(BudgetSortie().ajuster(courbe, paliers) == courbe(200), "Budget respecté : premier palier, sans commentaire")
+ajustee = budget.ajuster(courbe, paliers)
+verifier("samples=100" in ajustee and commentaire(ajustee) == "% Budget de sortie (100 primitives) : samples 200→100",
+         "Premier palier qui tient, réglage dégradé signalé")
+depasse = BudgetSortie(max_octets=None, max_primitives=10).ajuster(courbe, paliers)
+verifier("samples=50" in depasse and "dépassé : " in commentaire(depasse) and "malgré samples 200→50" in depasse,
+         "Budget dépassé au dernier palier : signalé")
+avant = SORTIES_DEGRADEES.series.get(('test',), 0)
+budget.ajuster(courbe, paliers, nom='test')
+verifier(SORTIES_DEGRADEES.series.get(('test',), 0) == avant + 1, "Sortie dégradée comptée")
+
+# Test 3: Générateurs
+print("\n3. Générateurs")
+petit = BudgetSortie(max_octets=3000, max_primitives=150)
+for mode in ('expression', 'coordonnees'):
+    for ligne in (r"\sin(x)", r"x^2 + y^2", r"x + y + z + w"):
+        code = generer(TikzGraphGenerator(mode_sortie=mode, budget_sortie=petit), ligne)
+        verifier(petit.respecte(code), f"{mode}, {ligne} : {len(code.encode('utf-8'))} octets, "
+                                       f"{compter_primitives(code)} primitives")
+degradee = generer(TikzGraphGenerator(budget_sortie=petit), r"\sin(x)")
+verifier("samples=100" in degradee and "samples 200→100" in commentaire(degradee), "Courbe : samples réduit")
+formes = GenerateurFormesGeometriques(budget_sortie=petit)
+polygone = formes.polygone_regulier(n_cotes=40)
+verifier(petit.respecte(polygone) and "etiquettes oui→non" in commentaire(polygone), "Polygone : étiquettes retirées")
+angles = formes.cercle_trigo_multiple_angles(list(range(0, 360, 5)))
+verifier(petit.respecte(angles) and "max_angles 72→" in commentaire(angles), "Angles multiples : angles réduits")
+with imposer(petit):
+    imposee = GenerateurFormesGeometriques().polygone_regulier(n_cotes=40)
+verifier(imposee == polygone, "Budget imposé (requête) à la place de celui du générateur")
+verifier("Budget de sortie" not in GenerateurFormesGeometriques().polygone_regulier(n_cotes=40),
+         "Budget du générateur rétabli après le bloc")
+geant = GenerateurFormesGeometriques().polygone_regulier(n_cotes=10**7)
+verifier(BudgetSortie().respecte(geant) and "sommets 10000000→" in commentaire(geant),
+         f"Polygone à 10⁷ côtés : {len(geant.encode('utf-8'))} octets, sans générer le polygone complet")
+
+# Test 4: Sorties habituelles inchangées
+print("\n4. Sorties habituelles inchangées")
+sans_budget, avec_budget = TikzGraphGenerator(), TikzGraphGenerator()
+sans_budget.budget_sortie = None
+for ligne in (r"\sin(x)", r"\frac{1}{x}", r"x^2 + y^2", r"x + y + z + w", r"\int_0^1 x^2 \, dx"):
+    verifier(generer(avec_budget, ligne) == generer(sans_budget, ligne), f"{ligne}")
+verifier(GenerateurFormesGeometriques().polygone_regulier(n_cotes=6)
+         == GenerateurFormesGeometriques(budget_sortie=BudgetSortie(None, None)).polygone_regulier(n_cotes=6),
+         "Polygone à 6 côtés")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
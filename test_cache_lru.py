@@ -0,0 +1,65 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+from cache_lru import CacheLRU
+
+print("=" * 80)
+print("TEST DU CACHE LRU")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+# Test 1: Hits et misses
+print("\n1. Hits / misses")
+cache = CacheLRU(max_entrees=3, max_octets=10_000)
+verifier(cache.get("x^2") is None, "Clé absente -> None")
+cache.put("x^2", "```tikz x^2```")
+verifier(cache.get("x^2") == "```tikz x^2```", "Clé présente -> valeur")
+stats = cache.stats()
+verifier(stats['hits'] == 1 and stats['misses'] == 1, "Compteurs hits=1, misses=1")
+
+# Test 2: Éviction par nombre d'entrées (LRU)
+print("\n2. Éviction par nombre d'entrées")
+cache = CacheLRU(max_entrees=2, max_octets=10_000)
+cache.put("a", "1")
+cache.put("b", "2")
+cache.get("a")          # 'a' devient la plus récente
+cache.put("c", "3")     # 'b' doit être évincée
+verifier("a" in cache, "'a' conservée (récemment utilisée)")
+verifier("b" not in cache, "'b' évincée (la moins récente)")
+verifier(cache.stats()['evictions'] == 1, "Compteur evictions=1")
+
+# Test 3: Éviction par taille
+print("\n3. Éviction par taille en octets")
+cache = CacheLRU(max_entrees=100, max_octets=50)
+cache.put("k1", "x" * 30)
+cache.put("k2", "y" * 30)
+verifier(len(cache) == 1, "Une seule entrée tient dans 50 octets")
+verifier(cache.stats()['octets'] <= 50, "Taille totale <= max_octets")
+cache.put("k3", "z" * 100)
+verifier("k3" not in cache, "Entrée plus grande que le cache ignorée")
+
+# Test 4: Remplacement d'une clé existante
+print("\n4. Remplacement d'une clé")
+cache = CacheLRU(max_entrees=5, max_octets=1000)
+cache.put("k", "abc")
+cache.put("k", "abcdef")
+verifier(cache.get("k") == "abcdef", "Nouvelle valeur retournée")
+verifier(len(cache) == 1, "Pas de doublon")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
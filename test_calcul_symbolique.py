@@ -0,0 +1,101 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import traceback
+
+from sympy import symbols, sin, log, exp, oo, S, srepr
+
+import calcul_symbolique
+from calcul_symbolique import CACHE_SYMBOLIQUE, limite, developpement, terme_dominant
+from analyseur_convergence import FonctionAnalyzer
+from recherche_racines import AnalyseCaracteristiques
+from metriques import APPELS_SYMBOLIQUES
+
+print("=" * 80)
+print("TEST DU CACHE DES CALCULS SYMBOLIQUES (limit, series)")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+def appels_limit():
+    return APPELS_SYMBOLIQUES.series.get(('limit',), [None, 0.0, 0])[2]
+
+
+x = symbols('x')
+
+# Test 1: Mémoïsation
+print("\n1. Appels répétés")
+CACHE_SYMBOLIQUE.vider()
+avant = appels_limit()
+verifier(limite(sin(x) / x, x, 0) == 1 and limite(sin(x) / x, x, 0) == 1, "limit(sin(x)/x, x, 0) = 1")
+verifier(appels_limit() - avant == 1 and CACHE_SYMBOLIQUE.hits == 1, "Un seul appel à limit, un hit")
+limite(sin(x) / x, x, 0, '-')
+verifier(appels_limit() - avant == 2, "La direction fait partie de la clé")
+
+# Test 2: Développements et terme dominant
+print("\n2. Développements")
+verifier(str(developpement(1 / x**2 + 1 / x**3, x, oo).removeO()) == "t**2", "Développement en +∞ (x = 1/t) à l'ordre 3")
+verifier(terme_dominant(1 / x**2 + 1 / x**3, x, oo) == symbols('t')**2, "Terme dominant en +∞ : t²")
+verifier(terme_dominant(sin(x) / x, x, 0) == 1, "Terme dominant de sin(x)/x en 0 : 1")
+try:
+    terme_dominant(exp(-x), x, oo)
+    verifier(False, "e^{-x} en +∞ : pas de terme dominant")
+except Exception:
+    hits = CACHE_SYMBOLIQUE.hits
+    try:
+        terme_dominant(exp(-x), x, oo)
+    except Exception:
+        pass
+    verifier(CACHE_SYMBOLIQUE.hits == hits + 1, "Échec mémorisé et relancé")
+    traces = []
+    for _ in range(3):
+        try:
+            terme_dominant(exp(-x), x, oo)
+        except Exception as erreur:
+            traces.append(len(traceback.extract_tb(erreur.__traceback__)))
+    verifier(traces[0] == traces[1] == traces[2], f"Exception neuve à chaque lecture (trace de {traces[0]} cadres)")
+
+# Test 3: Taille bornée
+print("\n3. Éviction")
+max_entrees = CACHE_SYMBOLIQUE.max_entrees
+CACHE_SYMBOLIQUE.max_entrees = 4
+try:
+    for p in range(2, 10):
+        limite(1 / x**p, x, oo)
+    verifier(len(CACHE_SYMBOLIQUE) == 4 and CACHE_SYMBOLIQUE.evictions >= 4, "Au plus 4 entrées, les plus anciennes évincées")
+finally:
+    CACHE_SYMBOLIQUE.max_entrees = max_entrees
+CACHE_SYMBOLIQUE.vider()
+developpement(1 / x**2, x, oo)
+taille_petite = CACHE_SYMBOLIQUE.stats()["octets"]
+grande = developpement(exp(x) * sin(x), x, 0, n=12)
+taille_grande = CACHE_SYMBOLIQUE.stats()["octets"] - taille_petite
+verifier(taille_grande >= len(srepr(grande)) > 2 * taille_petite,
+         f"Taille mesurée sur le contenu ({taille_petite} puis {taille_grande} octets)")
+
+# Test 4: Partage entre l'analyse de convergence et l'analyse de la fonction
+print("\n4. Partage")
+CACHE_SYMBOLIQUE.vider()
+integrande = 1 / (x * log(x)**2)
+FonctionAnalyzer()._check_convergence(integrande, x, S(2), oo)
+avant = appels_limit()
+asymptotes = AnalyseCaracteristiques(integrande, x).asymptotes_horizontales
+verifier(0.0 in asymptotes and appels_limit() - avant == 1, "limit en +∞ reprise du cache, seule la limite en -∞ est calculée")
+verifier(calcul_symbolique.stats()["entrees"] > 0, "Statistiques disponibles")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
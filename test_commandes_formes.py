@@ -0,0 +1,81 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+from app.generation import forme_generator, FORMES, REQUIS, enregistrer_forme, entier, parse_forme_geometrique
+
+print("=" * 80)
+print("TEST DU RÉPARTITEUR DE COMMANDES DE FORMES GÉOMÉTRIQUES")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+# Test 1: Chaque commande documentée produit du TikZ
+print("\n1. Commandes supportées")
+COMMANDES = [
+    "cercle_trigo(45)",
+    "cercle_trigo_complet()",
+    "cercle_trigo_multiple(30, 45, 60, 90)",
+    "cercle_trigo_angle(30)",
+    "triangle_rectangle(30, cos)",
+    "triangle(3, 4, 5)",
+    "polygone(6)",
+    "cube(2.5)",
+    "pyramide(2, 4)",
+    "vecteur(2, -3)",
+    "addition_vecteurs(1, 2, -3, 4)",
+    "repere_2d()",
+    "repere_3d()",
+]
+for commande in COMMANDES:
+    resultat = parse_forme_geometrique(commande)
+    verifier(resultat is not None and '\\begin{tikzpicture}' in resultat, commande)
+
+# Test 2: Valeurs par défaut et alias
+print("\n2. Valeurs par défaut et alias")
+verifier(parse_forme_geometrique("cube()") == forme_generator.cube_3d(taille=2), "cube() -> taille 2")
+verifier(parse_forme_geometrique("pyramide()") == forme_generator.pyramide_3d(base=2, hauteur=3),
+         "pyramide() -> base 2, hauteur 3")
+verifier(parse_forme_geometrique("triangle_rectangle(30)") == parse_forme_geometrique("triangle_rectangle(30, sin)"),
+         "triangle_rectangle(30) == triangle_rectangle(30, sin)")
+verifier(parse_forme_geometrique("repere2d") == parse_forme_geometrique("repere_2d()"), "Alias repere2d")
+verifier(parse_forme_geometrique("  CUBE( 3 ) ") == parse_forme_geometrique("cube(3)"),
+         "Casse et espaces ignorés")
+
+# Test 3: Lignes qui ne sont pas des formes -> None
+print("\n3. Lignes non géométriques")
+for ligne in ["x^2", "\\sin(x)", "\\int_0^1 x^2 \\, dx", "e^{-x}", "cube"]:
+    verifier(parse_forme_geometrique(ligne) is None, f"{ligne!r} -> None")
+
+# Test 4: Arguments invalides -> None (la ligne part vers le générateur de fonctions)
+print("\n4. Arguments invalides")
+for ligne in ["triangle(3, 4)", "cercle_trigo(-5)", "polygone(a)", "cube(1, 2)", "cercle_trigo_multiple(30,,45)"]:
+    verifier(parse_forme_geometrique(ligne) is None, f"{ligne!r} -> None")
+
+# Test 5: Ajout d'une commande
+print("\n5. Enregistrement d'une nouvelle commande")
+try:
+    @enregistrer_forme('test_carre', arguments=((entier, REQUIS),))
+    def _carre(cote):
+        return f"carre {cote}"
+
+    verifier(parse_forme_geometrique("test_carre(4)") == "carre 4", "Commande enregistrée appelée")
+    verifier(parse_forme_geometrique("test_carre()") is None, "Argument obligatoire vérifié")
+finally:
+    FORMES.pop('test_carre', None)
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
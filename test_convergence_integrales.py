@@ -0,0 +1,173 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+from analyseur_convergence import FonctionAnalyzer, parse_latex_fallback
+
+
+# ===============================
+# HARNAIS DE TEST GLOBAL
+# ===============================
+
+def run_integral_test(analyzer, latex_expr, description):
+    print("\n" + "=" * 80)
+    print(f"🧪 TEST : {description}")
+    print(f"LaTeX : {latex_expr}")
+
+    try:
+        expr = parse_latex_fallback(latex_expr)
+        integrals = analyzer._extract_integrals(expr)
+
+        if not integrals:
+            print("❌ Aucune intégrale détectée")
+            return
+
+        for idx, integral in enumerate(integrals, 1):
+            print(f"\n🔍 Intégrale #{idx}")
+            result = analyzer._analyze_integral(integral)
+
+            if result is None:
+                print("❌ Analyse échouée")
+                continue
+
+            # ---- Assertions structurelles ----
+            assert isinstance(result, dict)
+            assert "integrand" in result
+            assert "integral_info" in result
+            assert "dimension" in result
+            assert "overall_status" in result
+            assert isinstance(result["integral_info"], list)
+            assert result["dimension"] == len(result["integral_info"])
+
+            print(f"✅ Analyse réussie")
+            print(f"   Dimension : {result['dimension']}")
+            print(f"   Intégrande : {result['integrand']}")
+            print(f"   Statut global : {result['overall_status']}")
+
+            # Afficher les problèmes globaux
+            if result.get('all_issues'):
+                print(f"   ⚠️  PROBLÈMES ({len(result['all_issues'])}):")
+                for issue in result['all_issues']:
+                    print(f"      - {issue}")
+
+            if result.get('all_warnings'):
+                print(f"   ℹ️  AVERTISSEMENTS ({len(result['all_warnings'])}):")
+                for warning in result['all_warnings']:
+                    print(f"      - {warning}")
+
+            # Détails par variable
+            for info in result["integral_info"]:
+                assert "integration_variable" in info
+                assert "convergence" in info
+                assert "bounds_validation" in info
+
+                var = info['integration_variable']
+                conv = info['convergence']
+                bounds_val = info['bounds_validation']
+
+                print(f"\n   📊 Variable d{var} [{info['lower_limit']}, {info['upper_limit']}]:")
+                print(f"      • Type: {conv.get('type', 'N/A')}")
+                print(f"      • Statut: {conv.get('status', 'N/A')}")
+
+                # Domaine de définition
+                domain_info = conv.get('domain_info', {})
+                if not domain_info.get('is_all_reals', True):
+                    print(f"      • Domaine: {domain_info.get('domain', 'N/A')}")
+                    if domain_info.get('restrictions'):
+                        print(f"      • Restrictions:")
+                        for restriction in domain_info['restrictions']:
+                            print(f"         - {restriction}")
+
+                # Singularités
+                singularities = conv.get('singularities', {})
+                if singularities.get('all'):
+                    print(f"      • Singularités détectées:")
+                    for sing_type, sing_val in singularities['all']:
+                        print(f"         - {sing_type}: {var} = {sing_val:.6f}")
+
+                # Validation des bornes
+                if bounds_val.get('dependencies'):
+                    print(f"      • Bornes dépendantes de: {', '.join(bounds_val['dependencies'])}")
+                if not bounds_val.get('valid', True):
+                    print(f"      • ⚠️  Bornes invalides!")
+
+    except AssertionError as ae:
+        print(f"💥 Assertion échouée : {ae}")
+        import traceback
+        traceback.print_exc()
+    except Exception as e:
+        print(f"💥 Crash total : {e}")
+        import traceback
+        traceback.print_exc()
+
+
+# ===============================
+# BATTERIE DE TESTS COMPLÈTE
+# ===============================
+
+TESTS = [
+
+    # --- Intégrales simples ---
+    (r"\int_0^1 x \, dx", "Polynôme degré 1 (convergent)"),
+    (r"\int_0^1 x^7 \, dx", "Polynôme degré élevé (convergent)"),
+    (r"\int_{-1}^1 x^3 \, dx", "Polynôme impair (convergent)"),
+
+    # --- Fonctions classiques ---
+    (r"\int_0^{\pi} \sin(x)\,dx", "Trigonométrique (convergent)"),
+    (r"\int_0^{\pi/2} \cos(x)\,dx", "Trigonométrique cos (convergent)"),
+    (r"\int_1^{e} \ln(x)\,dx", "Logarithme (convergent)"),
+    (r"\int_0^{\infty} e^{-x}\,dx", "Exponentielle convergente (test décroissance exp)"),
+
+    # --- Intégrales impropres DIVERGENTES ---
+    (r"\int_0^{\infty} x\,dx", "Divergente simple (croissance linéaire)"),
+    (r"\int_1^{\infty} \frac{1}{x}\,dx", "Divergente 1/x (cas limite p=1)"),
+    (r"\int_1^{\infty} \frac{1}{x^{0.5}}\,dx", "Divergente 1/x^(1/2) (p<1)"),
+
+    # --- Intégrales impropres CONVERGENTES ---
+    (r"\int_1^{\infty} \frac{1}{x^2}\,dx", "Convergente 1/x^2 (p>1)"),
+    (r"\int_1^{\infty} \frac{1}{x^3}\,dx", "Convergente 1/x^3 (p>1)"),
+    (r"\int_{-\infty}^{\infty} e^{-x^2}\,dx", "Gaussienne (convergente)"),
+
+    # --- Singularités en bornes ---
+    (r"\int_0^1 \frac{1}{\sqrt{x}}\,dx", "Singularité en x=0 (borne inf)"),
+    (r"\int_0^1 \frac{1}{x}\,dx", "Singularité log en x=0 (divergente)"),
+    (r"\int_0^1 \ln(x)\,dx", "log(x) avec singularité en x=0 (convergente)"),
+
+    # --- Singularités INTERNES (doivent être détectées) ---
+    (r"\int_0^2 \frac{1}{x-1}\,dx", "Pôle INTERNE en x=1 (DIVERGENTE)"),
+    (r"\int_{-1}^1 \frac{1}{x}\,dx", "Pôle INTERNE en x=0 (DIVERGENTE)"),
+    (r"\int_0^2 \ln(x-1)\,dx", "Singularité log INTERNE en x=1 (DIVERGENTE)"),
+
+    # --- Domaines de définition ---
+    (r"\int_{-1}^1 \ln(x)\,dx", "ln(x) hors domaine (x>0) - INVALIDE"),
+    (r"\int_{-2}^{-1} \frac{1}{\sqrt{x}}\,dx", "sqrt(x) hors domaine (x>=0) - INVALIDE"),
+
+    # --- Intégrales imbriquées ---
+    (r"\int_0^1 \int_0^1 x y \, dx \, dy", "Intégrale double imbriquée (convergente)"),
+    (r"\int_0^1 \left( \int_0^x y\,dy \right) dx", "Bornes dépendantes VALIDES"),
+    (r"\int_0^1 \left( \int_y^1 x\,dx \right) dy", "Bornes dépendantes (y intégré après)"),
+
+    # --- Dimension élevée ---
+    (
+        r"\int_0^1 \int_0^1 \int_0^1 \int_0^1 x y z t \, dx\,dy\,dz\,dt",
+        "Intégrale 4D (convergente)"
+    ),
+
+    # --- Fonctions pathologiques ---
+    (r"\int_0^1 \sin\left(\frac{1}{x}\right)\,dx", "Oscillation forte (singularité essentielle)"),
+    (r"\int_1^{\infty} \frac{\sin(x)}{x}\,dx", "Convergence conditionnelle"),
+    (r"\int_0^1 \ln(\ln(\frac{1}{x}))\,dx", "Logarithme composé"),
+
+    # --- Tests de décroissance exponentielle vs algébrique ---
+    (r"\int_0^{\infty} x^2 e^{-x}\,dx", "x^2 * e^(-x) : exponentielle domine"),
+    (r"\int_1^{\infty} \frac{e^{-x}}{x}\,dx", "e^(-x)/x : convergente"),
+    (r"\int_1^{\infty} \frac{1}{x \ln(x)}\,dx", "1/(x*ln(x)) : divergente"),
+]
+
+
+# ===============================
+# LANCEMENT DES TESTS
+# ===============================
+if __name__ == "__main__":
+    analyzer = FonctionAnalyzer()
+    for latex, desc in TESTS:
+        run_integral_test(analyzer, latex, desc)
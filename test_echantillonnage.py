@@ -0,0 +1,102 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import numpy as np
+from sympy import symbols, lambdify, sqrt, log, Integer
+
+from echantillonnage import evaluer, echantillonner_1d, evaluer_grille, parcourir_grille, statistiques_grille
+
+print("=" * 80)
+print("TEST DU MOTEUR D'ÉCHANTILLONNAGE VECTORISÉ")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+x = symbols('x')
+
+
+def compiler(expr):
+    return lambdify([x], expr, modules=['numpy', 'math'])
+
+
+# Test 1: Évaluation vectorisée
+print("\n1. Évaluation vectorisée")
+xs, ys, valides = echantillonner_1d(compiler(x**2), -2, 2, 5)
+verifier(np.allclose(ys, [4, 1, 0, 1, 4]), "x^2 sur [-2, 2]")
+verifier(valides.all(), "Tous les points valides")
+
+# Test 2: Points invalides masqués (pas d'exception)
+print("\n2. Points invalides")
+_, ys, valides = echantillonner_1d(compiler(1 / x), -1, 1, 3)
+verifier(not valides[1] and valides[0] and valides[2], "1/x : x=0 masqué")
+_, ys, valides = echantillonner_1d(compiler(sqrt(x)), -1, 1, 3)
+verifier(list(valides) == [False, True, True], "sqrt(x) : x<0 masqué")
+_, ys, valides = echantillonner_1d(compiler(log(x)), 0, 2, 3)
+verifier(list(valides) == [False, True, True], "ln(x) : x=0 masqué")
+
+# Test 3: Expression constante
+print("\n3. Expression constante")
+ys, valides = evaluer(compiler(Integer(5)), np.linspace(0, 1, 4))
+verifier(ys.shape == (4,) and np.all(ys == 5), "Constante diffusée sur tous les points")
+
+# Test 4: Repli point par point (expression non vectorisable)
+print("\n4. Repli point par point")
+signe = lambda v: 1.0 if v > 0 else (1 / v if v < 0 else 1 / 0)  # 'if' : non vectorisable
+ys, valides = evaluer(signe, np.array([2.0, 0.0, -2.0]))
+verifier(list(valides) == [True, False, True] and ys[2] == -0.5,
+         "Évaluation point par point, erreur -> point invalide")
+
+# Test 5: Deux variables
+print("\n5. Plusieurs variables")
+y = symbols('y')
+f = lambdify([x, y], x * y, modules=['numpy', 'math'])
+ys, valides = evaluer(f, np.array([[1.0, 2.0]]), np.array([[3.0, 4.0]]))
+verifier(ys.shape == (1, 2) and np.allclose(ys, [[3, 8]]), "Forme des tableaux conservée")
+
+# Test 6: Grille 2D
+print("\n6. Grille 2D (meshgrid)")
+X, Y, Z, valides = evaluer_grille(f, (0, 1), (0, 2), 2, 3)
+verifier(Z.shape == (2, 3), "Forme nx × ny")
+verifier(X[1, 0] == 1 and Y[0, 2] == 2 and Z[1, 2] == 2, "Indexation 'ij' (X[i, j] = xs[i])")
+g = lambdify([x, y], 1 / (x**2 + y**2), modules=['numpy', 'math'])
+_, _, Z, valides = evaluer_grille(g, (-1, 1), (-1, 1), 3)
+verifier(not valides[1, 1] and valides.sum() == 8, "Singularité masquée sur la grille")
+
+# Test 7: Résultat resté symbolique (variable non fournie)
+print("\n7. Résultat symbolique")
+z = symbols('z')
+h = lambdify([x, y], x + z, modules=['numpy', 'math'])
+_, _, Z, valides = evaluer_grille(h, (0, 1), (0, 1), 50)
+verifier(not valides.any(), "Aucun point valide, sans évaluation point par point")
+
+# Test 8: Grille N-D par blocs
+print("\n8. Grille N-D par blocs")
+t = symbols('t')
+f4 = lambdify([x, y, z, t], x + y + z + t, modules=['numpy', 'math'])
+stats = statistiques_grille(f4, [(-1, 1)] * 4, 5, classes=[-4, 0, 4], memoire_max=2000)
+verifier(stats.total == 5**4 and stats.valides == 5**4, "Tous les points du produit cartésien")
+verifier(stats.minimum == -4 and stats.maximum == 4, "Min et max réduits bloc par bloc")
+verifier(stats.histogramme.sum() == 5**4, "Histogramme cumulé")
+tailles = [len(valeurs) for _, valeurs, _ in parcourir_grille(f4, [(-1, 1)] * 4, 5, memoire_max=2000)]
+verifier(len(tailles) > 1 and max(tailles) * 8 * (3 * 4 + 6) <= 2000, "Blocs bornés par la mémoire maximale")
+f3 = lambdify([x, y, z], x * y * z, modules=['numpy', 'math'])
+stats = statistiques_grille(f3, [(-2, 2)] * 3, 5, selection=lambda w, v: v & (w > 0) & (w < 2))
+verifier(stats.selectionnes > 0 and stats.min_selection[0] == -1 and stats.max_selection[0] == 1,
+         "Étendue des coordonnées des points sélectionnés")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
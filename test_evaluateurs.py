@@ -0,0 +1,82 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import inspect
+import io
+import contextlib
+
+import numpy as np
+from sympy import symbols, sin, cos, exp, log, E, S
+
+from evaluateurs import CACHE_EVALUATEURS, compiler
+from expression_analysee import ExpressionAnalysee
+from generateur_graphiques import TikzGraphGenerator
+from metriques import COMPILATIONS, EVALUATEURS_HITS, EVALUATEURS_MISSES
+
+print("=" * 80)
+print("TEST DU CACHE DES ÉVALUATEURS COMPILÉS")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+def compte(compteur):
+    return compteur.series.get((), 0)
+
+
+def compilations():
+    return COMPILATIONS.series.get((), [None, 0.0, 0])[2]
+
+
+x, y = symbols('x y')
+
+# Test 1: Compilation et cache
+print("\n1. Compilation")
+CACHE_EVALUATEURS.vider()
+f = compiler(x, sin(x)**2 + sin(x))
+verifier(np.allclose(f(np.array([0.0, 1.0])), [0.0, np.sin(1)**2 + np.sin(1)]), "Évaluation vectorisée")
+verifier(inspect.getsource(f).count("sin(") == 1, "Sous-expression commune sin(x) calculée une fois")
+avant = compilations()
+verifier(compiler([x], sin(x)**2 + sin(x)) is f and compilations() == avant, "Même expression : aucune recompilation")
+g = compiler((y, x), x - y)
+verifier(g(1.0, 3.0) == 2.0 and compiler((x, y), x - y) is not g, "L'ordre des variables fait partie de la clé")
+verifier(compiler(symbols('x', positive=True), x) is not compiler(x, x), "Les hypothèses des symboles aussi")
+verifier(compiler(x, S(2))(np.array([1.0])) == 2, "Expression constante")
+verifier(abs(compiler(x, log(x, E))(np.e) - 1) < 1e-12, "\\ln non évalué (log(x, E)) compilé en logarithme népérien")
+
+# Test 2: Métriques
+print("\n2. Métriques")
+hits, misses = compte(EVALUATEURS_HITS), compte(EVALUATEURS_MISSES)
+compiler(x, cos(x) * exp(x))
+compiler(x, cos(x) * exp(x))
+verifier(compte(EVALUATEURS_MISSES) - misses == 1 and compte(EVALUATEURS_HITS) - hits == 1, "Un miss puis un hit")
+verifier(compilations() > 0 and COMPILATIONS.series[()][1] > 0, "Durée de compilation mesurée")
+verifier(0 < CACHE_EVALUATEURS.stats()["taux_hit"] < 1, "Taux de hit disponible")
+
+# Test 3: Partage entre expressions et étapes
+print("\n3. Partage")
+premiere = ExpressionAnalysee(r"\sin(x) + \cos(y)").evaluateur(('x', 'y'))
+verifier(ExpressionAnalysee(r"\sin(x) + \cos(y)").evaluateur(('x', 'y')) is premiere,
+         "Deux lignes identiques partagent l'évaluateur")
+generateur = TikzGraphGenerator()
+with contextlib.redirect_stdout(io.StringIO()):
+    generateur.generer_fonction(r"x^2 + y^2 + z^2")
+    avant = compilations()
+    generateur.generer_fonction(r"x^2 + y^2 + z^2")
+verifier(compilations() == avant, "Tracé répété : aucune génération de code")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
@@ -0,0 +1,146 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import metriques
+from app.execution import ExecuteurLignes
+from cache_lru import CacheLRU
+
+print("=" * 80)
+print("TEST DE L'EXÉCUTION DES LIGNES (séquentielle / pool de processus)")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+LIGNES = [
+    "cercle_trigo(45)",
+    "x^2",
+    "cube()",
+    "\\sin(x)",
+    "polygone(6)",
+    "triangle(3, 4, 5)",
+]
+
+if __name__ == "__main__":
+    # Test 1: Mode séquentiel
+    print("\n1. Mode séquentiel")
+    sequentiel = ExecuteurLignes(mode='sequentiel')
+    res_seq = sequentiel.executer(LIGNES)
+    verifier(len(res_seq) == len(LIGNES), "Un résultat par ligne")
+    verifier(all(r['statut'] == 'ok' for r in res_seq), "Toutes les lignes réussissent")
+    verifier([r['ligne'] for r in res_seq] == LIGNES, "Ordre d'entrée respecté")
+
+    # Test 2: Mode processus -> mêmes résultats, même ordre
+    print("\n2. Mode processus")
+    processus = ExecuteurLignes(mode='processus', workers=2)
+    try:
+        res_proc = processus.executer(LIGNES)
+        verifier([r['resultat'] for r in res_proc] == [r['resultat'] for r in res_seq],
+                 "Résultats identiques au mode séquentiel")
+        verifier([r['ligne'] for r in res_proc] == LIGNES, "Ordre d'entrée respecté")
+        # Processus de travail tués (mémoire, signal...) : erreurs par ligne, puis pool neuf
+        for travailleur in list(processus._pool._processes.values()):
+            travailleur.kill()
+            travailleur.join()
+        res_casse = processus.executer(LIGNES[:3])
+        verifier(all(r['statut'] == 'erreur' and 'interrompu' in r['erreur'] for r in res_casse),
+                 "Pool cassé : une erreur par ligne, sans exception")
+        res_apres = processus.executer(LIGNES[3:])
+        verifier(all(r['statut'] == 'ok' for r in res_apres), "Requête suivante servie par un pool neuf")
+    finally:
+        processus.arreter()
+
+    # Test 3: Cache
+    print("\n3. Cache des résultats")
+    cache = CacheLRU(max_entrees=16)
+    avec_cache = ExecuteurLignes(mode='sequentiel', cache=cache)
+    avec_cache.executer(LIGNES)
+    res_cache = avec_cache.executer(["  cercle_trigo(45)  ", "cube()"])
+    verifier(all(r['cache'] for r in res_cache), "Lignes inchangées servies depuis le cache")
+    verifier(res_cache[0]['resultat'] == res_seq[0]['resultat'], "Résultat en cache identique")
+
+    # Test 4: Lignes en erreur
+    print("\n4. Lignes en erreur")
+    avant = (metriques.LIGNES_TOTAL.series.get(('ok',), 0), metriques.LIGNES_TOTAL.series.get(('erreur',), 0),
+             metriques.ERREURS.series.get((), 0))
+    for _ in range(2):
+        res_erreur = avec_cache.executer(["\\frac{1}{", "\\frac{1}{"])
+        verifier(all(r['statut'] == 'erreur' and r['resultat'] is None and r['erreur'] for r in res_erreur),
+                 "Statut 'erreur', message d'erreur")
+    apres = (metriques.LIGNES_TOTAL.series.get(('ok',), 0), metriques.LIGNES_TOTAL.series.get(('erreur',), 0),
+             metriques.ERREURS.series.get((), 0))
+    verifier(apres == (avant[0], avant[1] + 4, avant[2] + 4),
+             "Erreurs comptées une fois par ligne, jamais comme 'ok' ni servies depuis le cache")
+
+    # Test 5: Budget de temps par ligne
+    print("\n5. Budget de temps par ligne")
+    budgete = ExecuteurLignes(mode='processus', workers=2)
+    try:
+        lignes = ["cube()", "\\int_1^{\\infty} \\frac{1}{x \\ln(x)}\\,dx", "polygone(5)"]
+        res_budget = budgete.executer(lignes, budget=0.05)
+        verifier(res_budget[1]['statut'] == 'timeout', "Ligne trop lente -> statut 'timeout'")
+        verifier(res_budget[1]['duree_ms'] >= 50 and res_budget[1]['duree_ms'] != 50,
+                 f"Durée mesurée rapportée ({res_budget[1]['duree_ms']:.1f} ms)")
+        verifier(res_budget[0]['statut'] == 'ok' and res_budget[2]['statut'] == 'ok',
+                 "Les autres lignes du lot sont livrées")
+        res_suivant = budgete.executer(["repere_2d()"], budget=5)
+        verifier(res_suivant[0]['statut'] == 'ok', "Le pool reste utilisable après un timeout")
+    finally:
+        budgete.arreter()
+
+    # Test 6: Budgets par ligne et doublons du lot
+    print("\n6. Budgets par ligne et doublons")
+    par_ligne = ExecuteurLignes(mode='processus', workers=2)
+    try:
+        lignes = ["x^2", "\\int_1^{\\infty} \\frac{1}{x \\ln(x)}\\,dx", "x^2"]
+        res_lot = par_ligne.executer(lignes, budgets=[None, 0.05, None])
+        verifier(res_lot[1]['statut'] == 'timeout', "Budget propre à une ligne appliqué")
+        verifier(res_lot[0]['statut'] == 'ok' and res_lot[2]['resultat'] == res_lot[0]['resultat'],
+                 "Lignes sans budget livrées")
+        verifier(res_lot[2]['cache'], "Ligne répétée calculée une seule fois")
+    finally:
+        par_ligne.arreter()
+
+    # Test 7: Budget de sortie par requête
+    print("\n7. Budget de sortie par requête")
+    cache = CacheLRU(max_entrees=16)
+    sorties = ExecuteurLignes(mode='processus', workers=2, cache=cache)
+    try:
+        lignes = ["polygone(40)", "polygone(40)", "\\sin(x)"]
+        res_lot = sorties.executer(lignes, sortie=(1500, 2500), sorties=[None, (None, None), (None, 50)])
+        verifier("% Budget de sortie (1500 octets" in res_lot[0]['resultat'], "Budget de sortie de la requête appliqué")
+        verifier("Budget de sortie" not in res_lot[1]['resultat'], "Budget propre à une ligne (illimité)")
+        verifier("samples 200→50" in res_lot[2]['resultat'], "Budget propre à une ligne (primitives)")
+        res_defaut = sorties.executer(["polygone(40)"])
+        verifier(not res_defaut[0]['cache'] and "Budget de sortie" not in res_defaut[0]['resultat'],
+                 "Cache distinct par budget de sortie")
+        res_budget = sorties.executer(["polygone(40)", "polygone(50)"], budget=5, sortie=(1500, 2500))
+        verifier(res_budget[0]['cache'] and not res_budget[1]['cache']
+                 and "% Budget de sortie (1500 octets" in res_budget[1]['resultat'],
+                 "Budget de sortie transmis aux processus tuables")
+    finally:
+        sorties.arreter()
+
+    # Test 8: Mode inconnu
+    print("\n8. Mode inconnu")
+    try:
+        ExecuteurLignes(mode='inconnu')
+        verifier(False, "ValueError levée")
+    except ValueError:
+        verifier(True, "ValueError levée")
+
+    print("\n" + "=" * 80)
+    if all_passed:
+        print("✅ TOUS LES TESTS SONT PASSÉS!")
+    else:
+        print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+    print("=" * 80)
@@ -0,0 +1,97 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import io
+import contextlib
+
+import numpy as np
+from sympy import symbols, sin, cos, exp, tanh, log, S
+
+from evaluateurs import compiler
+from generateur_graphiques import TikzGraphGenerator
+from maillage_adaptatif import MAX_SOMMETS, maillage_adaptatif, table_tikz
+
+print("=" * 80)
+print("TEST DU MAILLAGE ADAPTATIF DES SURFACES")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+def erreur_relative(f_num, xs, ys, Z, domaine):
+    """Écart maximal entre l'interpolation bilinéaire du maillage et la surface fine, rapporté à sa hauteur."""
+    fins = np.linspace(domaine[0], domaine[1], 301)
+    X, Y = np.meshgrid(fins, fins, indexing='ij')
+    Z_fin = f_num(X, Y) * np.ones_like(X)
+    selon_y = np.array([np.interp(fins, ys, Z[i]) for i in range(len(xs))])
+    interpolee = np.array([np.interp(fins, xs, selon_y[:, j]) for j in range(len(fins))]).T
+    return np.max(np.abs(interpolee - Z_fin)) / np.ptp(Z_fin)
+
+
+def generer(generateur, ligne):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generateur.generer_fonction(ligne)
+
+
+x, y = symbols('x y')
+domaine = (-3.0, 3.0)
+
+# Test 1: Budget de sommets
+print("\n1. Budget de sommets")
+for expr in [x**2 + y**2, sin(3 * x) * cos(y), exp(-4 * (x**2 + y**2))]:
+    for budget in (MAX_SOMMETS, 100, 20):
+        xs, ys, Z = maillage_adaptatif(compiler((x, y), expr), domaine, domaine, budget)
+        verifier(len(xs) * len(ys) <= budget and Z.shape == (len(xs), len(ys)),
+                 f"{expr}, budget {budget} : {len(xs)}×{len(ys)} sommets")
+xs, ys, Z = maillage_adaptatif(compiler((x, y), x + 2 * y), domaine, domaine)
+verifier(len(xs) * len(ys) == 9, "Plan : 3×3 sommets suffisent")
+xs, ys, Z = maillage_adaptatif(compiler((x, y), tanh(5 * x) + 0 * y), domaine, domaine)
+verifier(len(xs) > 3 * len(ys), f"tanh(5x) : sommets sur l'axe qui varie ({len(xs)}×{len(ys)})")
+verifier(xs[0] == domaine[0] and xs[-1] == domaine[1] and np.all(np.diff(xs) > 0), "Nœuds croissants, bornes incluses")
+
+# Test 2: Raffinement
+print("\n2. Raffinement")
+pic = compiler((x, y), exp(-4 * (x**2 + y**2)))
+xs, ys, Z = maillage_adaptatif(pic, domaine, domaine)
+verifier(np.diff(xs)[len(xs) // 2 - 1] < np.diff(xs)[0] / 2, "Gaussienne : nœuds resserrés près du pic")
+reguliers = np.linspace(*domaine, len(xs))
+Z_reguliers = pic(*np.meshgrid(reguliers, reguliers, indexing='ij'))
+erreur, erreur_reguliere = erreur_relative(pic, xs, ys, Z, domaine), erreur_relative(pic, reguliers, reguliers, Z_reguliers, domaine)
+verifier(erreur < erreur_reguliere / 2, f"Gaussienne : écart {erreur:.3f} contre {erreur_reguliere:.3f} (grille régulière)")
+xs, ys, Z = maillage_adaptatif(compiler((x, y), x**2 + y**2), domaine, domaine)
+verifier(np.allclose(np.diff(xs), np.diff(xs)[0], rtol=0.05), "x²+y² : courbure constante, nœuds réguliers")
+
+# Test 3: Trous et table
+print("\n3. Trous et table")
+xs, ys, Z = maillage_adaptatif(compiler((x, y), log(x * y)), domaine, domaine)
+verifier(np.isnan(Z).any() and np.isfinite(Z).any(), "ln(xy) : NaN hors du domaine de définition")
+verifier(maillage_adaptatif(compiler((x, y), S(2)), domaine, domaine)[2].shape == (3, 3), "Surface constante")
+table = table_tikz(np.array([0.0, 1.0]), np.array([0.0, 2.0]), np.array([[1.0, np.nan], [1 / 3, 4.0]]))
+verifier(table == "x y z\n0 0 1\n1 0 0.3333\n0 2 nan\n1 2 4", "Table : x varie le plus vite, 4 chiffres, nan pour les trous")
+
+# Test 4: Générateur
+print("\n4. Générateur")
+expression = generer(TikzGraphGenerator(), r"x^2 + y^2")
+verifier("samples=13" in expression and "table" not in expression, "Mode 'expression' : formule pour pgfplots")
+maillee = generer(TikzGraphGenerator(mode_sortie='coordonnees', max_sommets=100), r"x^2 + y^2")
+lignes = maillee[maillee.index("x y z\n"):maillee.index("};")].strip().split("\n")[1:]
+verifier("table[meta=z]" in maillee and "point meta=explicit" in maillee and "samples=13" not in maillee,
+         "Mode 'coordonnees' : table précalculée, couleur d'après z")
+verifier(0 < len(lignes) <= 100 and f"mesh/cols={len(set(l.split()[0] for l in lignes))}" in maillee,
+         f"Budget respecté ({len(lignes)} sommets), mesh/cols cohérent")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
@@ -0,0 +1,88 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import time
+
+from metriques import Registre, mesurer
+
+print("=" * 80)
+print("TEST DES MÉTRIQUES (format Prometheus)")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+# Test 1: Histogramme
+print("\n1. Histogramme")
+registre = Registre()
+hist = registre.histogramme('test_duree_secondes', "Durée", labels=('etape',), bornes=(0.1, 1))
+hist.observer(0.05, etape='parse')
+hist.observer(0.1, etape='parse')
+hist.observer(5, etape='parse')
+texte = registre.exporter()
+verifier('# TYPE test_duree_secondes histogram' in texte, "Ligne TYPE")
+verifier('test_duree_secondes_bucket{etape="parse",le="0.1"} 2' in texte, "Borne incluse (le)")
+verifier('test_duree_secondes_bucket{etape="parse",le="1"} 2' in texte, "Effectifs cumulés")
+verifier('test_duree_secondes_bucket{etape="parse",le="+Inf"} 3' in texte, "Borne +Inf")
+verifier('test_duree_secondes_count{etape="parse"} 3' in texte, "Nombre d'observations")
+
+# Test 2: Compteur
+print("\n2. Compteur")
+compteur = registre.compteur('test_lignes_total', "Lignes", labels=('statut',))
+compteur.incrementer(statut='ok')
+compteur.incrementer(2, statut='ok')
+compteur.incrementer(statut='timeout')
+texte = registre.exporter()
+verifier('test_lignes_total{statut="ok"} 3' in texte, "Incréments cumulés")
+verifier('test_lignes_total{statut="timeout"} 1' in texte, "Séries par label")
+
+# Test 3: Delta entre processus
+print("\n3. Extraction et fusion d'un delta")
+delta = registre.extraire()
+verifier('test_lignes_total{statut="ok"}' not in registre.exporter(), "Extraction remet à zéro")
+parent = Registre()
+parent.fusionner(delta)
+parent.fusionner(delta)
+texte = parent.exporter()
+verifier('test_lignes_total{statut="ok"} 6' in texte, "Compteurs fusionnés")
+verifier('test_duree_secondes_count{etape="parse"} 6' in texte, "Histogrammes fusionnés (métrique créée)")
+
+# Test 4: Étapes imbriquées
+print("\n4. Étapes imbriquées")
+registre = Registre()
+etapes = registre.histogramme('test_etape_secondes', "Étapes", labels=('etape',))
+autre = registre.histogramme('test_appel_secondes', "Appels")
+
+
+@mesurer(autre)
+@mesurer(etapes, etape='interieure')
+def interieure():
+    time.sleep(0.05)
+
+
+@mesurer(etapes, etape='englobante')
+def englobante():
+    interieure()
+    time.sleep(0.01)
+
+
+englobante()
+verifier(etapes.series[('englobante',)][1] < 0.04, "Durée propre : étape imbriquée retirée de l'englobante")
+verifier(etapes.series[('interieure',)][1] >= 0.05, "Étape imbriquée mesurée entièrement")
+verifier(autre.series[()][1] >= 0.05, "Autre histogramme : durée complète")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
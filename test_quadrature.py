@@ -0,0 +1,110 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import math
+
+from sympy import symbols, lambdify, sqrt, exp, log, sin, cos, Abs, Integral, oo, E
+
+import numpy as np
+
+from quadrature import integrer, integrer_multiple
+from expression_analysee import ExpressionAnalysee
+from generateur_graphiques import TikzGraphGenerator
+from analyseur_convergence import FonctionAnalyzer
+
+print("=" * 80)
+print("TEST DE LA QUADRATURE ADAPTATIVE DE GAUSS–KRONROD")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+x = symbols('x')
+
+
+def compiler(expr):
+    return lambdify(x, expr, modules=['numpy', 'math'])
+
+
+def proche(resultat, attendu, tolerance=1e-8):
+    return resultat["converged"] and abs(resultat["value"] - attendu) < tolerance
+
+
+# Test 1: Intégrales propres
+print("\n1. Intégrales propres")
+r = integrer(compiler(x**2), 0, 1)
+verifier(proche(r, 1 / 3, 1e-14) and r["evaluations"] == 15, "x^2 sur [0, 1] exacte en 15 évaluations")
+verifier(proche(integrer(compiler(sin(x)), 0, math.pi), 2), "sin(x) sur [0, π]")
+verifier(proche(integrer(compiler(x**2), 1, 0), -1 / 3), "Bornes inversées")
+verifier(integrer(compiler(x), 2, 2)["value"] == 0, "Intervalle vide")
+
+# Test 2: Bornes infinies
+print("\n2. Bornes infinies")
+verifier(proche(integrer(compiler(exp(-x**2)), -math.inf, math.inf), math.sqrt(math.pi)), "Gaussienne sur ℝ")
+verifier(proche(integrer(compiler(1 / x**2), 1, math.inf), 1), "1/x^2 sur [1, +∞[")
+verifier(proche(integrer(compiler(exp(x)), -math.inf, 0), 1), "e^x sur ]-∞, 0]")
+
+# Test 3: Singularités intégrables
+print("\n3. Singularités")
+verifier(proche(integrer(compiler(1 / sqrt(x)), 0, 1), 2), "1/√x sur [0, 1] (borne singulière)")
+verifier(proche(integrer(compiler(log(x)), 0, 1), -1), "ln(x) sur [0, 1]")
+r = integrer(compiler(1 / sqrt(Abs(x))), -1, 1, points_singuliers=[0])
+verifier(proche(r, 4), "1/√|x| sur [-1, 1] coupée en 0")
+
+# Test 4: Divergence signalée
+print("\n4. Divergence")
+r = integrer(compiler(1 / x), 0, 1, max_intervalles=200)
+verifier(not r["converged"] and r["intervals"] <= 200, "1/x sur [0, 1] : non convergée, nombre d'intervalles borné")
+
+# Test 5: Intégration dans l'analyseur
+print("\n5. _evaluate_integral")
+analyzer = FonctionAnalyzer()
+r = analyzer._evaluate_integral(Integral(exp(-x), (x, 0, oo)), x, 0, oo)
+verifier(proche(r, 1) and r["error"] < 1e-8 and r["x_range"] == (0.0, math.inf), "e^{-x} sur [0, +∞[ avec erreur estimée")
+r = analyzer._evaluate_integral(Integral(log(x, E), (x, 0, 1)), x, 0, 1)
+verifier(proche(r, -1), "\\ln(x) non évalué (forme de parse_latex)")
+r = analyzer._evaluate_integral(Integral(cos(x) / sqrt(Abs(x - 1)), (x, 0, 2)), x, 0, 2)
+verifier(proche(r, 1.9548661258030496), "Singularité intérieure détectée utilisée comme coupure")
+
+# Test 6: Cubature 2D/3D et bornes dépendantes
+print("\n6. Intégrales multiples")
+r = integrer_multiple(lambda u, v: u * v, [(0, 1), (0, lambda u: u)])
+verifier(proche(r, 1 / 8, 1e-14) and r["evaluations"] == 15**2, "∫_0^1 ∫_0^x xy : exacte en une règle produit")
+r = integrer_multiple(lambda u, v, w: 1 + 0 * u, [(0, 1), (0, lambda u: 1 - u), (0, lambda u, v: 1 - u - v)])
+verifier(proche(r, 1 / 6, 1e-14), "Volume du tétraèdre (bornes dépendantes en 3D)")
+r = integrer_multiple(lambda u, v: np.exp(-u * u - v * v), [(-math.inf, math.inf)] * 2)
+verifier(proche(r, math.pi), "Gaussienne sur ℝ²")
+verifier(proche(integrer_multiple(lambda u, v: np.exp(-u) * v, [(0, math.inf), (0, lambda u: u)]), 1),
+         "Borne extérieure infinie, borne intérieure dépendante")
+verifier(proche(integrer_multiple(lambda u, v: 1 / np.sqrt(u * u + v * v), [(0, 1), (0, 1)]), 2 * math.asinh(1)),
+         "Singularité intégrable au coin")
+r = integrer_multiple(lambda u, v: 1 / (u * v), [(0, 1), (0, 1)], max_evaluations=50_000)
+verifier(not r["converged"] and r["evaluations"] <= 50_000, "1/(xy) : non convergée, évaluations bornées")
+
+# Test 7: Valeur rapportée avec le statut de convergence
+print("\n7. Valeur dans l'analyse de convergence")
+integrale = ExpressionAnalysee(r"\int_0^1 \int_0^x x y \, dy \, dx").integrales[0]
+resultat = analyzer._analyze_integral(integrale)
+valeur = resultat["numerical_value"]
+verifier(resultat["overall_status"] == "convergent" and valeur and abs(valeur["value"] - 1 / 8) < 1e-12,
+         "∫_0^1 ∫_0^x xy : valeur numérique 1/8")
+texte = TikzGraphGenerator().formater_analyse_convergence(resultat)
+verifier("Valeur numérique: 0.125 ±" in texte, "Valeur ± erreur dans le rapport")
+integrale = ExpressionAnalysee(r"\int_1^{\infty} \frac{1}{x} dx").integrales[0]
+verifier(analyzer._analyze_integral(integrale)["numerical_value"] is None, "Pas de valeur pour une intégrale divergente")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
@@ -0,0 +1,117 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import math
+import time
+
+import numpy as np
+from sympy import symbols, lambdify, sin, cos, exp, Symbol
+
+from recherche_racines import racines, brent, caracteristiques_1d, AnalyseCaracteristiques
+from expression_analysee import ExpressionAnalysee
+
+print("=" * 80)
+print("TEST DE LA RECHERCHE NUMÉRIQUE DE RACINES")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+x = symbols('x')
+
+
+def compiler(expr):
+    return lambdify(x, expr, modules=['numpy', 'math'])
+
+
+# Test 1: Brent
+print("\n1. Méthode de Brent")
+r = brent(lambda t: t**2 - 2, 0.0, 2.0, -2.0, 2.0)
+verifier(abs(r - math.sqrt(2)) < 1e-12, "Racine de x^2 - 2 sur [0, 2]")
+try:
+    brent(lambda t: t**2 + 1, 0.0, 1.0, 1.0, 2.0)
+    verifier(False, "Encadrement invalide refusé")
+except ValueError:
+    verifier(True, "Encadrement invalide refusé")
+
+# Test 2: Changements de signe et racines doubles
+print("\n2. Racines")
+trouvees = racines(compiler(x**3 - 3 * x), -10, 10)
+verifier(np.allclose(trouvees, [-math.sqrt(3), 0, math.sqrt(3)]), "x^3 - 3x : -√3, 0, √3")
+verifier(np.allclose(racines(compiler(x**2), -10, 10), [0]), "x^2 : racine double en 0")
+verifier(np.allclose(racines(compiler(cos(x) + 1), -4, 4), [-math.pi, math.pi], atol=1e-6),
+         "cos(x) + 1 : racines doubles en ±π")
+verifier(len(racines(compiler(sin(x)), -100, 100)) == 63, "sin(x) : 63 racines sur [-100, 100]")
+
+# Test 3: Pôles écartés
+print("\n3. Pôles")
+verifier(racines(compiler(1 / x), -10, 10) == [], "1/x : le changement de signe en 0 n'est pas une racine")
+verifier(racines(compiler(1 / (x**2 + 1)), -10, 10) == [], "1/(x^2+1) : aucune racine")
+
+# Test 4: Temps borné et nombre de résultats
+print("\n4. Bornes")
+debut = time.perf_counter()
+trouvees = racines(compiler(sin(1 / x)), -1, 1, delai=0.05)
+verifier(time.perf_counter() - debut < 1, "sin(1/x) : recherche interrompue par le délai")
+verifier(len(racines(compiler(sin(50 * x)), -100, 100, points=20001, max_resultats=10)) == 10,
+         "Nombre de résultats limité")
+
+# Test 5: Caractéristiques
+print("\n5. Caractéristiques")
+c = caracteristiques_1d(x**3 - 3 * x, x, -10, 10)
+verifier(np.allclose(c['points_critiques'], [-1, 1]), "Points critiques de x^3 - 3x")
+verifier(np.allclose(c['points_inflexion'], [0]), "Point d'inflexion de x^3 - 3x")
+c = caracteristiques_1d(1 / (x - 2), x, -10, 10)
+verifier(np.allclose(c['asymptotes_verticales'], [2]) and c['racines'] == [], "Asymptote verticale de 1/(x-2)")
+c = caracteristiques_1d(x * exp(-x), x, -10, 10)
+verifier(np.allclose(c['points_critiques'], [1]) and np.allclose(c['points_inflexion'], [2]),
+         "x e^{-x} : maximum en 1, inflexion en 2")
+c = caracteristiques_1d(ExpressionAnalysee(r"\ln(x)").expr, x, -100, 100)
+verifier(np.allclose(c['racines'], [1]), "\\ln(x) issu de parse_latex : racine en 1")
+
+# Test 6: Résolution symbolique
+print("\n6. Résolution symbolique")
+c = caracteristiques_1d((x**2 - 4) / (x - 1), x, -10, 10, symbolique=True)
+verifier(c['racines'] == [-2.0, 2.0] and c['asymptotes_verticales'] == [1.0], "Fraction rationnelle résolue par solve")
+e, a = Symbol('e'), Symbol('a')
+c = caracteristiques_1d(x * e**(-x), x, -10, 10, symbolique=True)
+verifier(c['racines'] == [0.0] and np.allclose(c['points_critiques'], [1]), "Symbole e lu comme la constante E")
+debut = time.perf_counter()
+analyse = ExpressionAnalysee(r"\cos(x) - x e^{-x^2}").caracteristiques('x', symbolique=True)
+trouvees = analyse.racines(-10, 10)
+verifier(not analyse.exacte and len(trouvees) == 6 and time.perf_counter() - debut < 2,
+         f"\\cos(x) - x e^{{-x^2}} : recherche numérique, {len(trouvees)} racines")
+verifier(len(ExpressionAnalysee(r"e^{x}\sin(x)").caracteristiques('x', symbolique=True).racines(-10, 10)) == 7,
+         "e^{x}\\sin(x) : toutes les racines de [-10, 10]")
+debut = time.perf_counter()
+c = caracteristiques_1d(a * x**2 + cos(x), x, -10, 10, symbolique=True)
+verifier(c['racines'] == [] and time.perf_counter() - debut < 0.5, "Paramètre libre : pas de solve, aucun résultat")
+
+# Test 7: Caractéristiques partagées
+print("\n7. Caractéristiques partagées")
+analyse = AnalyseCaracteristiques(x**3 - 3 * x, x)
+verifier(analyse.derivee(2) is analyse.derivee(2) and analyse.derivee(2) == 6 * x, "Dérivées calculées une fois")
+analyse.racines(-100, 100)
+verifier(np.allclose(analyse.racines(0, 2), [0, math.sqrt(3)]), "Sous-intervalle extrait de la recherche existante")
+verifier(len(analyse._recherches['racines']) == 1, "Aucune nouvelle recherche pour un sous-intervalle")
+verifier(AnalyseCaracteristiques(x * exp(-x), x).asymptotes_horizontales == [0.0], "Asymptote horizontale en +∞")
+verifier(abs(AnalyseCaracteristiques(cos(3 * x), x).periode - 2 * math.pi / 3) < 1e-12, "Période de cos(3x)")
+verifier(AnalyseCaracteristiques(x**2, x).periode is None, "x^2 non périodique")
+expression = ExpressionAnalysee(r"x^2 - 1")
+verifier(expression.caracteristiques('x') is expression.caracteristiques('x'), "Une seule analyse par expression")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
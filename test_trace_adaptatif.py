@@ -0,0 +1,123 @@
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import io
+import contextlib
+
+import numpy as np
+from sympy import symbols, sin, tan, tanh, sqrt, log, exp, Abs
+
+from evaluateurs import compiler
+from generateur_graphiques import TikzGraphGenerator
+from trace_adaptatif import MAX_POINTS, coordonnees_tikz, decouper, echantillonner_adaptatif, poles
+
+print("=" * 80)
+print("TEST DE L'ÉCHANTILLONNAGE ADAPTATIF DES COURBES")
+print("=" * 80)
+
+all_passed = True
+
+
+def verifier(condition, description):
+    global all_passed
+    if condition:
+        print(f"  ✅ {description}")
+    else:
+        print(f"  ❌ {description}")
+        all_passed = False
+
+
+def erreur_relative(f_num, xs, ys, x_min, x_max):
+    """Écart maximal entre l'interpolation linéaire des points et la courbe fine, rapporté à sa hauteur."""
+    x_fin = np.linspace(x_min, x_max, 20001)
+    y_fin = f_num(x_fin) * np.ones_like(x_fin)
+    return np.max(np.abs(np.interp(x_fin, xs, ys) - y_fin)) / np.ptp(y_fin)
+
+
+def generer(generateur, ligne):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generateur.generer_fonction(ligne)
+
+
+x = symbols('x')
+
+# Test 1: Répartition des points
+print("\n1. Répartition des points")
+xs, ys = echantillonner_adaptatif(compiler(x, 2 * x + 1), -5, 5)
+verifier(len(xs) == 2 and np.allclose(ys, [-9, 11]), "Droite : deux points suffisent")
+raide = compiler(x, tanh(20 * x))
+xs, ys = echantillonner_adaptatif(raide, -2, 2)
+centre = np.sum(np.abs(xs) < 0.2)
+verifier(centre > len(xs) / 2, f"tanh(20x) : {centre}/{len(xs)} points dans la transition |x| < 0.2")
+verifier(np.all(np.diff(xs) > 0), "Abscisses croissantes")
+oscillante = compiler(x, exp(-x**2) * sin(10 * x))
+xs, ys = echantillonner_adaptatif(oscillante, -3, 3)
+verifier(len(xs) <= MAX_POINTS, f"Au plus {MAX_POINTS} points ({len(xs)})")
+
+# Test 2: Fidélité
+print("\n2. Fidélité (interpolation linéaire)")
+for expr, a, b in [(sin(x), -6.28, 6.28), (tanh(20 * x), -2, 2), (x**10, -2, 2), (exp(-x**2) * sin(10 * x), -3, 3)]:
+    f_num = compiler(x, expr)
+    xs, ys = echantillonner_adaptatif(f_num, a, b)
+    erreur = erreur_relative(f_num, xs, ys, a, b)
+    verifier(erreur < 5e-3, f"{expr} : écart {erreur:.1e} de la hauteur, {len(xs)} points")
+uniforme = np.linspace(-2, 2, 200)
+erreur_uniforme = erreur_relative(raide, uniforme, raide(uniforme), -2, 2)
+xs, ys = echantillonner_adaptatif(raide, -2, 2)
+verifier(len(xs) < 100 and erreur_relative(raide, xs, ys, -2, 2) < erreur_uniforme,
+         f"tanh(20x) : {len(xs)} points adaptatifs plus fidèles que 200 points réguliers")
+
+# Test 3: Domaine de définition
+print("\n3. Domaine de définition")
+xs, ys = echantillonner_adaptatif(compiler(x, sqrt(x)), -2, 4)
+verifier(np.all(np.isfinite(ys)) and 0 <= xs[0] < 0.01, "√x : points non définis retirés, bord localisé")
+xs, ys = echantillonner_adaptatif(compiler(x, 1 / x), -5, 5)
+verifier(np.sum(~np.isfinite(ys)) == 1, "1/x : un seul point non défini (saut en 0)")
+corps = coordonnees_tikz(np.array([0.0, 1.0, 2.0]), np.array([1.0, np.nan, 1 / 3]))
+verifier(corps == "(0,1) (1,nan) (2,0.33333)", "Coordonnées TikZ : 5 chiffres significatifs, nan pour les sauts")
+
+# Test 4: Générateur
+print("\n4. Générateur")
+verifier(TikzGraphGenerator().mode_sortie == 'expression', "Mode 'expression' par défaut")
+try:
+    TikzGraphGenerator(mode_sortie='png')
+    verifier(False, "Mode inconnu refusé")
+except ValueError:
+    verifier(True, "Mode inconnu refusé")
+expression = generer(TikzGraphGenerator(), r"\sin(x)")
+coordonnees = generer(TikzGraphGenerator(mode_sortie='coordonnees'), r"\sin(x)")
+verifier("samples=200" in expression and "coordinates" not in expression, "Mode 'expression' : formule pour pgfplots")
+verifier("coordinates {" in coordonnees and "samples=200" not in coordonnees
+         and "unbounded coords=jump" in coordonnees, "Mode 'coordonnees' : points précalculés")
+integrale = generer(TikzGraphGenerator(mode_sortie='coordonnees'), r"\int_1^{\infty} e^{-x} dx")
+verifier("coordinates {" in integrale and "(1,0.36788)" in integrale, "Intégrande tracée par points (constante e)")
+verifier("coordinates {" in generer(TikzGraphGenerator(mode_sortie='coordonnees'), r"\ln(x)"), "\\ln tracé par points")
+
+# Test 5: Pôles et tronçons
+print("\n5. Pôles")
+inverse = compiler(x, 1 / x)
+verifier(poles(inverse, -5, 5) == [0.0], "1/x : pôle en 0")
+verifier(np.allclose(poles(compiler(x, tan(x)), -5, 5), [-3 * np.pi / 2, -np.pi / 2, np.pi / 2, 3 * np.pi / 2]),
+         "tan(x) : pôles en ±π/2, ±3π/2 (sans dénominateur)")
+verifier(poles(compiler(x, 1 / x**2), -5, 5) == [0.0], "1/x² : pôle d'ordre pair")
+verifier(poles(compiler(x, sin(x) / x**2), -5, 5, candidats=[0.0]) == [0.0], "sin(x)/x² : candidat du dénominateur validé")
+verifier(poles(compiler(x, sin(x) / x), -5, 5, candidats=[0.0]) == [], "sin(x)/x : discontinuité effaçable écartée")
+verifier(poles(compiler(x, log(Abs(x))), -5, 5) == [], "ln|x| : croissance lente, pas de découpage")
+troncons, (y_min, y_max) = decouper(inverse, -5, 5, [0.0])
+verifier(len(troncons) == 2 and troncons[0][1] < 0 < troncons[1][0], "1/x : deux tronçons disjoints")
+verifier(-5 < y_min < -1 and 1 < y_max < 5, f"Fenêtre en y calculée loin du pôle [{y_min:.2f}, {y_max:.2f}]")
+verifier(abs(1 / troncons[1][0]) > y_max, "Tronçon arrêté à la sortie de la fenêtre")
+verifier(decouper(inverse, 1, 5, []) == ([(1, 5)], None), "Sans pôle : un seul tronçon, pas de fenêtre")
+expression = generer(TikzGraphGenerator(), r"\frac{1}{x^2-1}")
+verifier(expression.count("\\addplot[blue, thick, domain=") == 3 and "ymin=" in expression,
+         "Mode 'expression' : un \\addplot par tronçon, fenêtre en y")
+coordonnees = generer(TikzGraphGenerator(mode_sortie='coordonnees'), r"\frac{1}{x}")
+verifier(coordonnees.count("coordinates {") == 2 and "ymax=" in coordonnees, "Mode 'coordonnees' : un \\addplot par tronçon")
+verifier("ymin=" not in generer(TikzGraphGenerator(), r"x^2"), "Sans pôle : sortie inchangée")
+
+print("\n" + "=" * 80)
+if all_passed:
+    print("✅ TOUS LES TESTS SONT PASSÉS!")
+else:
+    print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
+print("=" * 80)
@@ -0,0 +1,253 @@
+"""
+Échantillonnage adaptatif des courbes, calculé côté serveur avec NumPy.
+
+En mode 'coordonnees', les tracés ne confient plus l'évaluation de l'expression à
+pgfplots (200 évaluations pgfmath par courbe dans le navigateur, TikZJax) : la
+courbe est échantillonnée ici puis émise en \\addplot coordinates.
+
+Échantillonnage 1D : une grille régulière grossière est raffinée là où la courbe
+s'écarte de sa corde (courbure, variation rapide de y), en coordonnées normalisées
+par la taille du tracé ; les points presque alignés des portions plates sont
+ensuite retirés. À nombre de points égal, les régions raides sont mieux rendues.
+
+Pôles : la courbe est découpée en tronçons indépendants aux asymptotes verticales
+(zéros de 1/f, où |f| croît sans borne de chaque côté défini) ; la fenêtre en y est
+calculée ici, loin des pôles, et chaque tronçon s'arrête là où la courbe en sort.
+Rien n'est évalué ni tracé à travers un pôle.
+"""
+
+import numpy as np
+
+from budget_sortie import nombre_tikz
+from echantillonnage import echantillonner_1d, evaluer
+from recherche_racines import dedupliquer, racines
+
+# Points de la grille régulière de départ
+POINTS_INITIAUX = 33
+
+# Nombre maximal de subdivisions successives d'un intervalle
+PROFONDEUR_MAX = 10
+
+# Évaluations maximales de la fonction par courbe
+MAX_EVALUATIONS = 4000
+
+# Points émis au plus par courbe (autant que samples=200 en mode expression)
+MAX_POINTS = 200
+
+# Écart toléré à la corde, en fraction de la hauteur (et de la largeur) du tracé
+TOLERANCE = 1e-3
+
+# Chiffres significatifs des coordonnées émises
+CHIFFRES = 5
+
+# Distances au pôle (fractions de la largeur du tracé) où la croissance de |f| est testée
+ECART_POLE = 1e-7
+ECART_POLE_LOIN = 1e-4
+
+# Rapport |f(proche)| / |f(loin)| au-delà duquel |f| est considérée non bornée
+CROISSANCE_POLE = 10
+
+# Zone exclue autour des pôles pour la fenêtre en y (fraction de la largeur)
+MARGE_POLE = 0.02
+
+# Points de l'échantillonnage régulier qui fixe la fenêtre en y
+POINTS_FENETRE = 400
+
+
+def _hauteur(ys):
+    """Hauteur de référence des valeurs finies (quantiles : robuste aux pics près des pôles)."""
+    finies = ys[np.isfinite(ys)]
+    if finies.size < 2:
+        return 1.0
+    bas, haut = np.percentile(finies, [2, 98])
+    return float(haut - bas) or max(1.0, float(abs(haut)))
+
+
+def _evaluer(f_num, xs):
+    with np.errstate(all='ignore'):
+        ys, valides = evaluer(f_num, xs)
+    ys[~valides] = np.nan
+    return ys
+
+
+def _raffiner(f_num, xs, ys, seuil, echelle):
+    """
+    Subdivise les intervalles dont le milieu s'écarte de la corde de plus de `seuil`
+    (ys et seuil en coordonnées normalisées : valeurs divisées par `echelle`).
+    """
+    evaluations = len(xs)
+    for _ in range(PROFONDEUR_MAX):
+        milieux = (xs[:-1] + xs[1:]) / 2
+        y_milieux = _evaluer(f_num, milieux) / echelle
+        evaluations += len(milieux)
+
+        finis = np.isfinite(ys)
+        with np.errstate(invalid='ignore'):
+            ecarts = np.abs(y_milieux - (ys[:-1] + ys[1:]) / 2)
+        # Trou au milieu d'un intervalle défini, bord du domaine de définition : à localiser
+        ecarts = np.where(finis[:-1] & finis[1:], np.nan_to_num(ecarts, nan=np.inf), 0.0)
+        ecarts[finis[:-1] != finis[1:]] = np.inf
+
+        a_raffiner = np.flatnonzero(ecarts > seuil)
+        if not a_raffiner.size:
+            break
+        disponibles = MAX_EVALUATIONS - evaluations
+        if disponibles <= 0:
+            break
+        if a_raffiner.size > disponibles:
+            # Les plus grands écarts d'abord
+            a_raffiner = np.sort(a_raffiner[np.argsort(ecarts[a_raffiner])[::-1][:disponibles]])
+
+        xs = np.insert(xs, a_raffiner + 1, milieux[a_raffiner])
+        ys = np.insert(ys, a_raffiner + 1, y_milieux[a_raffiner])
+    return xs, ys
+
+
+def _simplifier(xs, ys, seuil):
+    """
+    Retire les points finis dont l'écart à la corde de leurs voisins conservés reste
+    sous `seuil` ; une suite de points non définis est réduite à un seul (saut).
+    """
+    finis = np.isfinite(ys)
+    gardes = [0]
+    for i in range(1, len(xs) - 1):
+        precedent = gardes[-1]
+        if not finis[i]:
+            if finis[precedent]:
+                gardes.append(i)
+            continue
+        if finis[precedent] and finis[i + 1]:
+            t = (xs[i] - xs[precedent]) / (xs[i + 1] - xs[precedent])
+            if abs(ys[i] - (ys[precedent] + t * (ys[i + 1] - ys[precedent]))) <= seuil:
+                continue
+        gardes.append(i)
+    gardes.append(len(xs) - 1)
+
+    # Pas de saut en début ni en fin de courbe
+    gardes = [i for rang, i in enumerate(gardes)
+              if finis[i] or 0 < rang < len(gardes) - 1 and finis[gardes[rang - 1]] and finis[gardes[rang + 1]]]
+    return xs[gardes], ys[gardes]
+
+
+def echantillonner_adaptatif(f_num, x_min, x_max, tolerance=TOLERANCE, max_points=MAX_POINTS):
+    """
+    Échantillonne f_num sur [x_min, x_max], finement là où la courbe se courbe ou varie
+    vite, grossièrement sur les portions plates.
+
+    Args:
+        f_num: Fonction lambdifiée d'une variable
+        x_min, x_max: Intervalle tracé
+        tolerance: Écart maximal à la corde, en fraction de la hauteur du tracé
+        max_points: Nombre maximal de points retournés
+
+    Returns:
+        (xs, ys) : abscisses croissantes et valeurs (NaN hors du domaine de définition)
+    """
+    xs = np.linspace(x_min, x_max, POINTS_INITIAUX)
+    ys = _evaluer(f_num, xs)
+    # Écarts mesurés en coordonnées normalisées : y / hauteur du tracé
+    echelle = _hauteur(ys)
+
+    xs, ys = _raffiner(f_num, xs, ys / echelle, tolerance, echelle)
+    seuil = tolerance
+    xs_simplifies, ys_simplifies = _simplifier(xs, ys, seuil)
+    while len(xs_simplifies) > max_points:
+        seuil *= 2
+        xs_simplifies, ys_simplifies = _simplifier(xs, ys, seuil)
+    return xs_simplifies, ys_simplifies * echelle
+
+
+def _est_pole(f_num, c, largeur):
+    """
+    Vrai si |f| croît sans borne en c de chaque côté où f est définie (au moins un),
+    faux pour une discontinuité effaçable (sin(x)/x) ou une croissance lente (ln|x|).
+    """
+    cote_pole = False
+    for signe in (-1, 1):
+        proche, loin = np.abs(_evaluer(f_num, c + signe * largeur * np.array([ECART_POLE, ECART_POLE_LOIN])))
+        if np.isnan(proche) or np.isnan(loin):
+            continue
+        if not (np.isinf(proche) or proche > CROISSANCE_POLE * loin):
+            return False
+        cote_pole = True
+    return cote_pole
+
+
+def poles(f_num, x_min, x_max, candidats=()):
+    """
+    Pôles de f_num dans ]x_min, x_max[ : zéros de 1/f (recherche numérique) et
+    `candidats` (zéros du dénominateur, par exemple), validés par _est_pole.
+
+    Returns:
+        Liste triée des abscisses des pôles
+    """
+    largeur = x_max - x_min
+
+    def inverse(xs):
+        with np.errstate(all='ignore'):
+            return np.divide(1.0, f_num(xs))
+
+    trouves = racines(inverse, x_min, x_max) + [float(c) for c in candidats]
+    return dedupliquer([c for c in trouves if x_min < c < x_max and _est_pole(f_num, c, largeur)],
+                        tolerance=ECART_POLE_LOIN * largeur)
+
+
+def _fenetre_y(f_num, x_min, x_max, poles_detectes):
+    """Fenêtre (y_min, y_max) des valeurs prises loin des pôles, avec une marge."""
+    xs, ys, valides = echantillonner_1d(f_num, x_min, x_max, POINTS_FENETRE)
+    for pole in poles_detectes:
+        valides &= np.abs(xs - pole) > MARGE_POLE * (x_max - x_min)
+    if valides.sum() < 2:
+        return -4.0, 4.0
+    bas, haut = np.percentile(ys[valides], [2, 98])
+    marge = max(0.5, 0.2 * (haut - bas))
+    return float(bas - marge), float(haut + marge)
+
+
+def _sortie_fenetre(f_num, dedans, dehors, y_min, y_max):
+    """Abscisse (entre dedans et dehors) où la courbe sort de [y_min, y_max], par dichotomie."""
+    hors = lambda x: not (y_min <= _evaluer(f_num, np.array([x]))[0] <= y_max)
+    if hors(dedans):
+        return dedans
+    for _ in range(50):
+        milieu = (dedans + dehors) / 2
+        if hors(milieu):
+            dehors = milieu
+        else:
+            dedans = milieu
+    return dehors
+
+
+def decouper(f_num, x_min, x_max, poles_detectes):
+    """
+    Tronçons de [x_min, x_max] séparés par les pôles, et fenêtre en y du tracé.
+
+    Chaque extrémité de tronçon voisine d'un pôle est placée là où la courbe quitte la
+    fenêtre (légèrement élargie, pour que le trait atteigne le bord du cadre).
+
+    Returns:
+        (troncons, fenetre) : liste de (debut, fin) ; (y_min, y_max), None sans pôle
+    """
+    if not poles_detectes:
+        return [(x_min, x_max)], None
+    y_min, y_max = _fenetre_y(f_num, x_min, x_max, poles_detectes)
+    debord = 0.05 * (y_max - y_min)
+    ecart = ECART_POLE * (x_max - x_min)
+
+    bornes = [x_min] + list(poles_detectes) + [x_max]
+    troncons = []
+    for gauche, droite in zip(bornes[:-1], bornes[1:]):
+        milieu = (gauche + droite) / 2
+        debut = gauche if gauche == x_min else _sortie_fenetre(
+            f_num, milieu, gauche + ecart, y_min - debord, y_max + debord)
+        fin = droite if droite == x_max else _sortie_fenetre(
+            f_num, milieu, droite - ecart, y_min - debord, y_max + debord)
+        if fin > debut:
+            troncons.append((debut, fin))
+    return troncons, (y_min, y_max)
+
+
+def coordonnees_tikz(xs, ys, chiffres=CHIFFRES, par_ligne=8):
+    """Corps d'un \\addplot coordinates : '(x,y)' par paires, NaN pour les trous (unbounded coords=jump)."""
+    paires = [f"({nombre_tikz(x, chiffres)},{nombre_tikz(y, chiffres)})" for x, y in zip(xs, ys)]
+    return "\n".join(" ".join(paires[i:i + par_ligne]) for i in range(0, len(paires), par_ligne))